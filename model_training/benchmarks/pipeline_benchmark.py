@@ -0,0 +1,292 @@
+"""
+Pipeline Benchmark
+Time and peak memory of the feature, sequence, training and inference paths
+across data sizes, with JSON results and regression checks against a baseline
+"""
+
+import gc
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000, 10_000_000)
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Process peak resident set size so far (MB), or None where it cannot be read"""
+    try:
+        import resource  # POSIX only
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        # Windows reports the peak working set; elsewhere only the current RSS is available
+        return getattr(info, 'peak_wset', info.rss) / 1024 ** 2
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return peak / 1024 ** 2 if platform.system() == 'Darwin' else peak / 1024
+
+
+def measure(fn: Callable, repeats: int = 1, trace_memory: bool = True) -> Tuple[object, float, Optional[float]]:
+    """
+    Time a call and measure the memory it allocates
+
+    Timing runs are untraced; when trace_memory is set, one extra run under
+    tracemalloc records the peak Python/NumPy allocation (memory allocated
+    inside TensorFlow's runtime is not visible to tracemalloc).
+
+    Returns:
+        (result of the last call, best time in seconds, peak allocation in MB or None)
+    """
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        result = None
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+
+    peak_mb = None
+    if trace_memory:
+        result = None
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = fn()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        finally:
+            tracemalloc.stop()
+    return result, best, peak_mb
+
+
+def environment() -> Dict:
+    """Versions and hardware the results were recorded on"""
+    import sklearn
+    import tensorflow as tf
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'tensorflow': tf.__version__,
+    }
+
+
+class PipelineBenchmark:
+    """
+    Benchmarks the training pipeline on synthetic random-walk bars
+
+    Feature engineering, scaling and windowing run on the full data size.
+    The training epoch and TFLite inference run on the most recent
+    train_windows / inference_windows windows, so large sizes stay tractable
+    while still exercising the real code paths on real-sized inputs.
+    """
+
+    def __init__(self, sizes: Sequence[int] = DEFAULT_SIZES, model_type: str = 'cnn', sequence_length: int = 60,
+                 batch_size: int = 64, train_windows: int = 20000, inference_windows: int = 10000,
+                 repeats: int = 1, seed: int = 0, trace_memory: bool = True):
+        """
+        Args:
+            sizes: Bar counts to benchmark
+            model_type: 'lstm' or 'cnn'
+            sequence_length: Window length
+            batch_size: Training and scoring batch size
+            train_windows: Windows per timed training epoch
+            inference_windows: Windows scored by the TFLite model
+            repeats: Timing runs per stage for the cheap stages (best is kept)
+            seed: Synthetic data seed
+            trace_memory: Record peak allocations with an extra traced run per stage
+        """
+        self.sizes = list(sizes)
+        self.model_type = model_type
+        self.sequence_length = sequence_length
+        self.batch_size = batch_size
+        self.train_windows = train_windows
+        self.inference_windows = inference_windows
+        self.repeats = repeats
+        self.seed = seed
+        self.trace_memory = trace_memory
+        self.results: List[Dict] = []
+
+    def config(self) -> Dict:
+        return {
+            'sizes': self.sizes,
+            'model_type': self.model_type,
+            'sequence_length': self.sequence_length,
+            'batch_size': self.batch_size,
+            'train_windows': self.train_windows,
+            'inference_windows': self.inference_windows,
+            'repeats': self.repeats,
+            'seed': self.seed,
+        }
+
+    def _record(self, bars: int, stage: str, seconds: float, peak_mb: Optional[float] = None,
+                items: Optional[int] = None):
+        row = {
+            'bars': bars,
+            'stage': stage,
+            'seconds': seconds,
+            'peak_mb': peak_mb,
+            'rss_peak_mb': _peak_rss_mb(),
+            'items': items,
+            'items_per_sec': items / seconds if items and seconds > 0 else None,
+        }
+        self.results.append(row)
+        memory = f", peak {peak_mb:.1f} MB" if peak_mb is not None else ""
+        rate = f", {row['items_per_sec']:,.0f}/s" if row['items_per_sec'] else ""
+        print(f"{bars:>11,} bars  {stage:<18} {seconds:>9.3f}s{memory}{rate}")
+
+    def run_size(self, num_bars: int):
+        """Benchmark every stage at one data size"""
+        from model_development.throughput import EpochThroughput
+        from model_development.train_trading_model import (
+            TradingModelTrainer, WindowBatchSequence, synthetic_ohlcv
+        )
+
+        # Minute bars keep 10M bars inside the pandas timestamp range
+        df = synthetic_ohlcv(num_bars, freq='1min', seed=self.seed)
+        trainer = TradingModelTrainer(model_type=self.model_type)
+
+        (features, targets), seconds, peak = measure(lambda: trainer.prepare_features(df), self.repeats,
+                                                     self.trace_memory)
+        self._record(num_bars, 'prepare_features', seconds, peak, num_bars)
+        del df
+
+        scaled, seconds, peak = measure(lambda: trainer.scaler.fit_transform(features).astype(np.float32),
+                                        self.repeats, self.trace_memory)
+        self._record(num_bars, 'scaler_transform', seconds, peak, len(features))
+        del features
+
+        (X, y), seconds, peak = measure(
+            lambda: trainer.create_sequences((scaled, targets), self.sequence_length), self.repeats,
+            self.trace_memory)
+        self._record(num_bars, 'create_sequences', seconds, peak, len(X))
+
+        # Training: one warm-up epoch (tracing/compilation), then one timed epoch
+        X_train = X[-self.train_windows:]
+        y_train = y[-self.train_windows:]
+        trainer.model = trainer.build_model((X.shape[1], X.shape[2]))
+        throughput = EpochThroughput(len(X_train), verbose=False)
+        trainer.model.fit(WindowBatchSequence(X_train, y_train, self.batch_size, shuffle=True), epochs=2,
+                          verbose=0, callbacks=[throughput])
+        self._record(num_bars, 'train_epoch', throughput.epochs[-1]['seconds'], items=len(X_train))
+
+        self._benchmark_inference(num_bars, trainer, X[-self.inference_windows:])
+
+    def _benchmark_inference(self, num_bars: int, trainer, windows: np.ndarray):
+        from model_conversion.convert_to_tflite import ModelConverter
+        from model_conversion.scoring_engine import TFLiteScoringEngine
+
+        windows = np.ascontiguousarray(windows, dtype=np.float32)
+        with tempfile.TemporaryDirectory() as tmp:
+            tflite_path = os.path.join(tmp, 'benchmark.tflite')
+            # Convert the in-memory model; there is no saved artifact to load. LSTMs are
+            # unrolled to builtin ops, so both model types run on the stock interpreter
+            converter = ModelConverter(model_path=None)
+            converter.model = trainer.model
+            start = time.perf_counter()
+            converter.convert_to_tflite_basic(tflite_path)
+            self._record(num_bars, 'tflite_convert', time.perf_counter() - start)
+
+            engine = TFLiteScoringEngine(tflite_path, num_workers=1, batch_size=self.batch_size)
+            engine.score(windows[:self.batch_size])  # warm-up
+            _, seconds, _ = measure(lambda: engine.score(windows), self.repeats, trace_memory=False)
+            engine.close()
+        self._record(num_bars, 'tflite_inference', seconds, items=len(windows))
+
+    def run(self) -> Dict:
+        """Benchmark every size; returns the JSON-serializable report"""
+        self.results = []
+        started = time.time()
+        for num_bars in self.sizes:
+            self.run_size(num_bars)
+        return {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(started)),
+            'environment': environment(),
+            'config': self.config(),
+            'results': self.results,
+        }
+
+
+def save_results(report: Dict, path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {path}")
+
+
+def load_results(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_results(current: Dict, baseline: Dict, time_tolerance: float = 0.2, memory_tolerance: float = 0.2,
+                    min_seconds: float = 0.01) -> List[Dict]:
+    """
+    Compare a report against a baseline report
+
+    Stages are matched on (bars, stage). A stage regresses when its time
+    exceeds the baseline by more than time_tolerance, or its peak allocation
+    by more than memory_tolerance. Stages faster than min_seconds in both
+    runs are only checked for memory, since their timings are mostly noise.
+
+    Returns:
+        One row per matched stage with ratios and a 'regression' flag
+    """
+    reference = {(row['bars'], row['stage']): row for row in baseline['results']}
+    rows = []
+    for row in current['results']:
+        base = reference.get((row['bars'], row['stage']))
+        if base is None:
+            continue
+        time_ratio = row['seconds'] / base['seconds'] if base['seconds'] > 0 else None
+        memory_ratio = None
+        if row.get('peak_mb') is not None and base.get('peak_mb'):
+            memory_ratio = row['peak_mb'] / base['peak_mb']
+
+        slower = (time_ratio is not None and time_ratio > 1 + time_tolerance
+                  and max(row['seconds'], base['seconds']) >= min_seconds)
+        larger = memory_ratio is not None and memory_ratio > 1 + memory_tolerance
+        rows.append({
+            'bars': row['bars'],
+            'stage': row['stage'],
+            'seconds': row['seconds'],
+            'baseline_seconds': base['seconds'],
+            'time_ratio': time_ratio,
+            'peak_mb': row.get('peak_mb'),
+            'baseline_peak_mb': base.get('peak_mb'),
+            'memory_ratio': memory_ratio,
+            'regression': slower or larger,
+        })
+    return rows
+
+
+def print_comparison(rows: List[Dict], current: Dict = None, baseline: Dict = None):
+    """Print a comparison table; flagged stages are marked REGRESSION"""
+    if current and baseline:
+        for key, value in current['environment'].items():
+            if baseline['environment'].get(key) != value:
+                print(f"note: {key} differs from baseline ({baseline['environment'].get(key)} -> {value})")
+    print(f"{'bars':>11}  {'stage':<18}{'baseline s':>11}{'now s':>10}{'ratio':>8}{'mem ratio':>11}")
+    for row in rows:
+        ratio = f"{row['time_ratio']:>8.2f}" if row['time_ratio'] is not None else f"{'-':>8}"
+        memory = f"{row['memory_ratio']:>11.2f}" if row['memory_ratio'] is not None else f"{'-':>11}"
+        flag = "  REGRESSION" if row['regression'] else ""
+        print(f"{row['bars']:>11,}  {row['stage']:<18}{row['baseline_seconds']:>11.3f}{row['seconds']:>10.3f}"
+              f"{ratio}{memory}{flag}")
+    regressions = sum(row['regression'] for row in rows)
+    print(f"{regressions} regression(s) in {len(rows)} compared stages")
@@ -0,0 +1,294 @@
+"""
+Trading Pipeline CLI
+One entry point for collect/train/convert/score/bench with lazy imports
+
+Usage (from model_training/):
+    python cli.py collect --symbol AAPL --period 1y
+    python cli.py collect --info
+    python cli.py train --model-type lstm --epochs 20
+    python cli.py train --throughput --lstm-layout unrolled
+    python cli.py train --symbol AAPL --symbol MSFT --symbol NVDA --workers 4
+    python cli.py train --incremental --symbol AAPL
+    python cli.py convert --benchmark
+    python cli.py convert --compress --sparsity 0.6 --clusters 16
+    python cli.py score --model ../models/trading_model_quantized.artifact --symbol AAPL
+    python cli.py bench decode
+    python cli.py bench pipeline --sizes 10000 100000 --baseline baseline.json
+"""
+
+import time
+
+_STARTED = time.perf_counter()
+
+import argparse
+import importlib
+import os
+import sys
+from typing import Dict
+
+DEFAULT_MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'models')
+
+# Seconds spent importing each module on first use
+_import_times: Dict[str, float] = {}
+
+
+def _load(module: str):
+    """Import a module on first use and record how long it took"""
+    if module in sys.modules:
+        return sys.modules[module]
+    start = time.perf_counter()
+    loaded = importlib.import_module(module)
+    _import_times[module] = time.perf_counter() - start
+    return loaded
+
+
+def _cache(args):
+    bar_cache = _load('data_collection.bar_cache')
+    if args.cache_dir:
+        return bar_cache.BarCache(args.cache_dir, offline=args.offline)
+    return bar_cache.BarCache(offline=args.offline)
+
+
+def cmd_collect(args):
+    cache = _cache(args)
+
+    if args.info:
+        entries = cache.describe()
+        if not entries:
+            print(f"Cache is empty ({cache.cache_dir})")
+        for entry in entries:
+            print(f"{entry['symbol']:<8} {entry['interval']:<4} {entry['rows']:>8} rows  "
+                  f"{entry['first']} -> {entry['last']}  {entry['size_kb']:.0f} KB  "
+                  f"refreshed {entry['refreshed_at']:%Y-%m-%d %H:%M}")
+        return
+
+    collector_module = _load('data_collection.market_data_collector')
+    for symbol in args.symbols:
+        collector = collector_module.MarketDataCollector(symbol, cache=cache)
+        df = collector.get_historical_data(period=args.period, interval=args.interval)
+        if df.empty:
+            print(f"{symbol}: no data")
+        else:
+            print(f"{symbol}: {len(df)} bars {df.index[0]} -> {df.index[-1]}")
+    print(f"Cache stats: {cache.get_stats()}")
+
+
+def cmd_train(args):
+    if args.incremental:
+        return train_incremental(args)
+    training = _load('model_development.train_trading_model')
+    throughput = None
+    if args.throughput:
+        throughput = _load('model_development.throughput').ThroughputConfig(
+            jit_compile=not args.no_xla, mixed_precision=args.precision, intra_op_threads=args.intra_op_threads,
+            inter_op_threads=args.inter_op_threads, lstm_layout=args.lstm_layout)
+    output = args.output or os.path.join(args.models_dir, 'trading_model.artifact')
+    training.run_training(symbols=args.symbols, period=args.period or '2y', interval=args.interval,
+                          model_type=args.model_type, epochs=args.epochs, batch_size=args.batch_size,
+                          sequence_length=args.sequence_length, output_path=output, throughput=throughput,
+                          num_workers=args.workers)
+
+
+def train_incremental(args):
+    model = args.model or os.path.join(args.models_dir, 'trading_model.artifact')
+    if not os.path.exists(model):
+        print(f"Model not found at {model}; run 'python cli.py train' first")
+        return 1
+    if args.symbols and len(args.symbols) > 1:
+        print("Incremental updates take a single --symbol")
+        return 1
+    incremental = _load('model_development.incremental_training')
+    incremental.run_incremental_update(
+        model, symbol=(args.symbols or ['AAPL'])[0], period=args.period, interval=args.interval,
+        output_path=args.output, window_bars=args.window_bars, half_life_bars=args.half_life_bars,
+        epochs=args.fine_tune_epochs, batch_size=args.batch_size, tolerance=args.tolerance)
+
+
+def cmd_convert(args):
+    model = args.model or os.path.join(args.models_dir, 'trading_model.artifact')
+    if not os.path.exists(model):
+        # Checked before importing TensorFlow
+        print(f"Model not found at {model}; run 'python cli.py train' first")
+        return 1
+    conversion = _load('model_conversion.convert_to_tflite')
+    conversion.convert_model(model, output_dir=args.models_dir, benchmark=args.benchmark,
+                             symbol=args.symbol, period=args.period, compress=args.compress,
+                             target_sparsity=args.sparsity, num_clusters=args.clusters,
+                             fine_tune_epochs=args.fine_tune_epochs)
+
+
+def cmd_score(args):
+    model = args.model or os.path.join(args.models_dir, 'trading_model_quantized.artifact')
+    if not os.path.exists(model):
+        print(f"Model not found at {model}; run 'python cli.py convert' first")
+        return 1
+    cache = _cache(args)
+    live_signals = _load('model_development.live_signals')
+
+    generator = live_signals.LiveSignalGenerator.from_artifact(model)
+    for symbol in args.symbols:
+        df = cache.get(symbol, interval=args.interval, period=args.period)
+        if len(df) < 2:
+            print(f"{symbol}: not enough bars")
+            continue
+        generator.warm_up(symbol, df.iloc[:-1])
+        last = df.iloc[-1]
+        bar = {'symbol': symbol, 'timestamp': df.index[-1],
+               **{column: last[column] for column in ('Open', 'High', 'Low', 'Close', 'Volume')}}
+        signal = generator.on_bar(bar)
+        if signal is None:
+            print(f"{symbol}: not enough history for a full window")
+            continue
+        probabilities = ' '.join(f"{p:.3f}" for p in signal['probabilities'])
+        print(f"{symbol}: {signal['signal']} at {df.index[-1]} (sell/hold/buy {probabilities})")
+    generator.dispatcher.close()
+
+
+def cmd_bench(args):
+    if args.target == 'pipeline':
+        return bench_pipeline(args)
+    if args.target == 'decode':
+        tick_decoder = _load('data_collection.tick_decoder')
+        for name, value in tick_decoder.benchmark_decoding(args.ticks).items():
+            print(f"{name}: {value:,.2f}" if isinstance(value, float) else f"{name}: {value}")
+    else:
+        model = args.model or os.path.join(args.models_dir, 'trading_model.artifact')
+        if not os.path.exists(model):
+            print(f"Model not found at {model}; run 'python cli.py train' first")
+            return 1
+        conversion = _load('model_conversion.convert_to_tflite')
+        converter = conversion.ModelConverter(model)
+        converter.load_model()
+        conversion.run_benchmark(converter, symbol=args.symbol, period=args.period, output_dir=args.models_dir)
+
+
+def bench_pipeline(args):
+    pipeline_benchmark = _load('benchmarks.pipeline_benchmark')
+    benchmark = pipeline_benchmark.PipelineBenchmark(
+        sizes=args.sizes or pipeline_benchmark.DEFAULT_SIZES, model_type=args.model_type,
+        train_windows=args.train_windows, inference_windows=args.inference_windows, repeats=args.repeats,
+        trace_memory=not args.no_memory)
+    report = benchmark.run()
+    output = args.output or os.path.join(args.models_dir, 'benchmarks', f"pipeline_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    pipeline_benchmark.save_results(report, output)
+
+    if args.baseline:
+        baseline = pipeline_benchmark.load_results(args.baseline)
+        rows = pipeline_benchmark.compare_results(report, baseline, time_tolerance=args.tolerance,
+                                                  memory_tolerance=args.tolerance)
+        pipeline_benchmark.print_comparison(rows, report, baseline)
+        if any(row['regression'] for row in rows):
+            return 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Trading model pipeline")
+    parser.add_argument('--models-dir', default=os.environ.get('TRADING_MODELS_DIR', DEFAULT_MODELS_DIR),
+                        help="Directory for model artifacts (default: repo models/)")
+    parser.add_argument('--timing', action='store_true', help="Report startup, import and command time")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    collect = subparsers.add_parser('collect', help="Fetch history into the local bar cache")
+    collect.add_argument('--symbol', dest='symbols', action='append', help="Symbol (repeatable, default AAPL)")
+    collect.add_argument('--period', default='1y')
+    collect.add_argument('--interval', default='1h')
+    collect.add_argument('--cache-dir', help="Bar cache directory (default: repo data/cache/)")
+    collect.add_argument('--offline', action='store_true', help="Only use cached bars")
+    collect.add_argument('--info', action='store_true', help="List cached series instead of fetching")
+    collect.set_defaults(func=cmd_collect)
+
+    train = subparsers.add_parser('train', help="Train a model and save it as an artifact")
+    train.add_argument('--symbol', dest='symbols', action='append',
+                       help="Symbol (repeatable; several train one panel model, default AAPL)")
+    train.add_argument('--workers', type=int, default=1, help="Processes for panel feature computation")
+    train.add_argument('--period', help="History to fetch (default 2y; with --incremental, enough for the update)")
+    train.add_argument('--interval', default='1h')
+    train.add_argument('--model-type', choices=['lstm', 'cnn'], default='lstm')
+    train.add_argument('--epochs', type=int, default=20)
+    train.add_argument('--batch-size', type=int, default=32)
+    train.add_argument('--sequence-length', type=int, default=60)
+    train.add_argument('--output', help="Artifact path (default: <models-dir>/trading_model.artifact)")
+    train.add_argument('--throughput', action='store_true',
+                       help="Throughput mode: XLA train steps, bfloat16 where supported, explicit threads")
+    train.add_argument('--no-xla', action='store_true', help="Throughput mode without XLA compilation")
+    train.add_argument('--precision', choices=['auto', 'bfloat16', 'off'], default='auto',
+                       help="Mixed precision in throughput mode (auto: bfloat16 if the CPU supports it)")
+    train.add_argument('--intra-op-threads', type=int, help="Threads per op (default: core count)")
+    train.add_argument('--inter-op-threads', type=int, default=2, help="Ops run concurrently")
+    train.add_argument('--lstm-layout', choices=['default', 'unrolled'], default='default',
+                       help="LSTM layout in throughput mode")
+    train.add_argument('--incremental', action='store_true',
+                       help="Fine-tune the saved model on bars since it was trained; promote only if validation holds")
+    train.add_argument('--model', help="Model to update (default: <models-dir>/trading_model.artifact)")
+    train.add_argument('--window-bars', type=int, default=2000, help="Older bars replayed in an incremental update")
+    train.add_argument('--half-life-bars', type=int, default=500, help="Recency weight half-life in bars")
+    train.add_argument('--fine-tune-epochs', type=int, default=3, help="Epoch budget of an incremental update")
+    train.add_argument('--tolerance', type=float, default=0.0,
+                       help="Allowed relative validation-loss increase for promotion")
+    train.set_defaults(func=cmd_train)
+
+    convert = subparsers.add_parser('convert', help="Convert a model artifact to TFLite")
+    convert.add_argument('--model', help="Keras model artifact (default: <models-dir>/trading_model.artifact)")
+    convert.add_argument('--benchmark', action='store_true', help="Also benchmark every quantization variant")
+    convert.add_argument('--compress', action='store_true',
+                         help="Also build a pruned/clustered model and compare it with the dense one")
+    convert.add_argument('--sparsity', type=float, default=0.5, help="Pruned fraction of kernel weights (0: no pruning)")
+    convert.add_argument('--clusters', type=int, default=16, help="Shared values per kernel (0: no clustering)")
+    convert.add_argument('--fine-tune-epochs', type=int, default=2, help="Fine-tuning epochs per compression stage")
+    convert.add_argument('--symbol', default='AAPL', help="Symbol for calibration/evaluation data")
+    convert.add_argument('--period', default='6mo')
+    convert.set_defaults(func=cmd_convert)
+
+    score = subparsers.add_parser('score', help="Score the latest bar of each symbol with a TFLite artifact")
+    score.add_argument('--model', help="TFLite artifact (default: <models-dir>/trading_model_quantized.artifact)")
+    score.add_argument('--symbol', dest='symbols', action='append', help="Symbol (repeatable, default AAPL)")
+    score.add_argument('--period', default='1mo')
+    score.add_argument('--interval', default='1h')
+    score.add_argument('--cache-dir', help="Bar cache directory (default: repo data/cache/)")
+    score.add_argument('--offline', action='store_true', help="Only use cached bars")
+    score.set_defaults(func=cmd_score)
+
+    bench = subparsers.add_parser('bench', help="Run a benchmark")
+    bench.add_argument('target', choices=['decode', 'variants', 'pipeline'],
+                       help="decode: tick decoding throughput; variants: TFLite quantization variants; "
+                            "pipeline: features/sequences/training/inference across data sizes")
+    bench.add_argument('--ticks', type=int, default=200000, help="Ticks per decode run")
+    bench.add_argument('--model', help="Keras model artifact for the variants benchmark")
+    bench.add_argument('--symbol', default='AAPL')
+    bench.add_argument('--period', default='6mo')
+    bench.add_argument('--sizes', type=int, nargs='+', help="Bar counts for the pipeline benchmark "
+                                                            "(default: 10k 100k 1M 10M)")
+    bench.add_argument('--model-type', choices=['lstm', 'cnn'], default='cnn')
+    bench.add_argument('--train-windows', type=int, default=20000, help="Windows per timed training epoch")
+    bench.add_argument('--inference-windows', type=int, default=10000, help="Windows scored with TFLite")
+    bench.add_argument('--repeats', type=int, default=1, help="Timing runs per stage (best is kept)")
+    bench.add_argument('--no-memory', action='store_true', help="Skip the traced peak-memory runs")
+    bench.add_argument('--output', help="Results JSON (default: <models-dir>/benchmarks/pipeline_<time>.json)")
+    bench.add_argument('--baseline', help="Baseline results JSON; exit 1 on regressions")
+    bench.add_argument('--tolerance', type=float, default=0.2, help="Allowed slowdown/growth vs baseline")
+    bench.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if getattr(args, 'symbols', None) is None and hasattr(args, 'symbols'):
+        args.symbols = ['AAPL']
+
+    command_started = time.perf_counter()
+    status = args.func(args) or 0
+    finished = time.perf_counter()
+
+    if args.timing:
+        imports = sum(_import_times.values())
+        print(f"\nstartup: {(command_started - _STARTED) * 1000:.0f} ms, "
+              f"imports: {imports * 1000:.0f} ms, "
+              f"command: {(finished - command_started - imports) * 1000:.0f} ms, "
+              f"total: {(finished - _STARTED) * 1000:.0f} ms", file=sys.stderr)
+        for module, seconds in sorted(_import_times.items(), key=lambda item: -item[1]):
+            print(f"  import {module}: {seconds * 1000:.0f} ms", file=sys.stderr)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
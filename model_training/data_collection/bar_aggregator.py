@@ -0,0 +1,235 @@
+"""
+Bar Aggregator
+Builds OHLCV bars from the live tick stream
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from data_collection.dispatch import CallbackDispatcher
+from instrumentation.latency import METRICS
+
+BAR_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+class _OpenBar:
+    """Running OHLCV state of a bar that has not closed yet"""
+
+    __slots__ = ('start', 'end', 'open', 'high', 'low', 'close', 'volume', 'ticks', 'open_ts', 'close_ts')
+
+    def __init__(self, start: int, end: int, timestamp: int, price: float, volume: float):
+        self.start = start
+        self.end = end
+        self.open = self.high = self.low = self.close = price
+        self.volume = volume
+        self.ticks = 1
+        self.open_ts = self.close_ts = timestamp
+
+    def add(self, timestamp: int, price: float, volume: float):
+        # Open/Close follow event time, so out-of-order ticks land where they belong
+        if timestamp < self.open_ts:
+            self.open, self.open_ts = price, timestamp
+        if timestamp >= self.close_ts:
+            self.close, self.close_ts = price, timestamp
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
+        self.volume += volume
+        self.ticks += 1
+
+    def to_dict(self, symbol: str) -> Dict:
+        return {
+            'symbol': symbol,
+            'timestamp': self.start,
+            'end': self.end,
+            'Open': self.open,
+            'High': self.high,
+            'Low': self.low,
+            'Close': self.close,
+            'Volume': self.volume,
+            'ticks': self.ticks,
+        }
+
+
+class BarAggregator:
+    """
+    Aggregates ticks into time or volume bars per symbol
+
+    Time bars cover [start, start + interval) in epoch nanoseconds and stay
+    open until the symbol's watermark (its latest tick time minus
+    allowed_lateness) passes their end, so ticks arriving late or out of
+    order still count while their bar is open. Ticks for a bar that has
+    already closed are dropped and counted. Volume bars close once their
+    volume reaches volume_per_bar; ticks older than the end of the symbol's
+    last closed volume bar are dropped.
+
+    Closed bars are published to subscribers as dicts with symbol,
+    timestamp (bar start, ns), end, Open, High, Low, Close, Volume and ticks,
+    and the latest window_size bars per symbol are kept for scoring.
+    """
+
+    def __init__(self, interval: float = 60.0, mode: str = 'time', volume_per_bar: float = 10000,
+                 allowed_lateness: float = 2.0, window_size: int = 60,
+                 dispatcher: Optional[CallbackDispatcher] = None):
+        """
+        Args:
+            interval: Time bar length in seconds
+            mode: 'time' or 'volume'
+            volume_per_bar: Volume that closes a volume bar
+            allowed_lateness: Seconds a tick may lag the newest tick and still be counted
+            window_size: Closed bars kept per symbol
+            dispatcher: Dispatcher that receives closed bars
+        """
+        if mode not in ('time', 'volume'):
+            raise ValueError(f"Unknown bar mode: {mode}")
+        self.mode = mode
+        self.interval_ns = int(interval * 1e9)
+        self.volume_per_bar = volume_per_bar
+        self.lateness_ns = int(allowed_lateness * 1e9)
+        self.window_size = window_size
+        self.dispatcher = dispatcher or CallbackDispatcher()
+
+        self.open_bars: Dict[str, Dict[int, _OpenBar]] = {}
+        self.windows: Dict[str, deque] = {}
+        self.max_event_time: Dict[str, int] = {}
+        self.watermarks: Dict[str, int] = {}
+        self.closed_through: Dict[str, int] = {}
+        self.bars_emitted = 0
+        self.late_ticks = 0
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable, policy: str = 'block', maxsize: int = 10000, **kwargs):
+        """Call callback with every closed bar (blocking policy by default so no bar is lost)"""
+        return self.dispatcher.subscribe(callback, maxsize=maxsize, policy=policy, **kwargs)
+
+    def on_tick(self, tick):
+        """
+        Consume one tick; usable directly as a MarketDataCollector callback
+
+        Args:
+            tick: Tick or tick dict with symbol, timestamp (epoch ns), price and volume
+        """
+        t = METRICS.start()
+        symbol = tick['symbol']
+        timestamp = tick['timestamp']
+        price = float(tick['price'])
+        volume = float(tick['volume'])
+
+        with self._lock:
+            if self._is_late(symbol, timestamp):
+                self.late_ticks += 1
+                return
+            bars = self.open_bars.setdefault(symbol, {})
+            if self.mode == 'time':
+                start = timestamp - timestamp % self.interval_ns
+                bar = bars.get(start)
+                if bar is None:
+                    bars[start] = _OpenBar(start, start + self.interval_ns, timestamp, price, volume)
+                else:
+                    bar.add(timestamp, price, volume)
+                closed = self._advance(symbol, timestamp)
+            else:
+                bar = bars.get(0)
+                if bar is None:
+                    bar = bars[0] = _OpenBar(timestamp, timestamp, timestamp, price, volume)
+                else:
+                    bar.add(timestamp, price, volume)
+                bar.end = bar.close_ts
+                closed = []
+                if bar.volume >= self.volume_per_bar:
+                    del bars[0]
+                    closed.append(self._close(symbol, bar))
+
+        METRICS.lap('bar_aggregate', t)
+        for closed_bar in closed:
+            self.dispatcher.publish(closed_bar)
+
+    def advance(self, now_ns: Optional[int] = None) -> List[Dict]:
+        """
+        Move every symbol's event time forward without a tick, closing due time bars
+
+        Call periodically (e.g. once a second) so bars of quiet symbols close.
+
+        Args:
+            now_ns: Current epoch nanoseconds (defaults to the wall clock)
+        """
+        now_ns = time.time_ns() if now_ns is None else now_ns
+        with self._lock:
+            closed = [bar for symbol in list(self.open_bars) for bar in self._advance(symbol, now_ns)]
+        closed.sort(key=lambda bar: (bar['timestamp'], bar['symbol']))
+        for closed_bar in closed:
+            self.dispatcher.publish(closed_bar)
+        return closed
+
+    def flush(self) -> List[Dict]:
+        """Close every open bar, e.g. at shutdown"""
+        with self._lock:
+            closed = [
+                self._close(symbol, bar)
+                for symbol, bars in self.open_bars.items()
+                for bar in sorted(bars.values(), key=lambda bar: bar.start)
+            ]
+            for bars in self.open_bars.values():
+                bars.clear()
+        for closed_bar in closed:
+            self.dispatcher.publish(closed_bar)
+        return closed
+
+    def _is_late(self, symbol: str, timestamp: int) -> bool:
+        """Whether the bar a tick belongs to has already closed; caller holds the lock"""
+        if self.mode == 'time':
+            watermark = self.watermarks.get(symbol)
+            end = timestamp - timestamp % self.interval_ns + self.interval_ns
+            return watermark is not None and end <= watermark
+        closed_through = self.closed_through.get(symbol)
+        return closed_through is not None and timestamp < closed_through
+
+    def _advance(self, symbol: str, event_time: int) -> List[Dict]:
+        """Raise a symbol's watermark and close its time bars that ended behind it; caller holds the lock"""
+        latest = self.max_event_time.get(symbol)
+        if latest is not None and event_time <= latest:
+            return []
+        self.max_event_time[symbol] = event_time
+        watermark = self.watermarks[symbol] = event_time - self.lateness_ns
+        if self.mode != 'time':
+            return []
+
+        bars = self.open_bars.get(symbol, {})
+        due = sorted(start for start, bar in bars.items() if bar.end <= watermark)
+        return [self._close(symbol, bars.pop(start)) for start in due]
+
+    def _close(self, symbol: str, bar: _OpenBar) -> Dict:
+        closed = bar.to_dict(symbol)
+        window = self.windows.get(symbol)
+        if window is None:
+            window = self.windows[symbol] = deque(maxlen=self.window_size)
+        window.append(closed)
+        self.closed_through[symbol] = max(bar.end, self.closed_through.get(symbol, bar.end))
+        self.bars_emitted += 1
+        return closed
+
+    def is_ready(self, symbol: str) -> bool:
+        """Whether a full window of closed bars is available"""
+        return len(self.windows.get(symbol, ())) == self.window_size
+
+    def get_window(self, symbol: str) -> pd.DataFrame:
+        """Latest closed bars as an OHLCV DataFrame indexed by bar start, oldest first"""
+        with self._lock:
+            bars = list(self.windows.get(symbol, ()))
+        index = pd.to_datetime([bar['timestamp'] for bar in bars], unit='ns', utc=True)
+        return pd.DataFrame({column: [bar[column] for bar in bars] for column in BAR_COLUMNS}, index=index)
+
+    def get_stats(self) -> Dict:
+        """Per-symbol watermarks and bar/tick counters"""
+        with self._lock:
+            return {
+                'watermarks': dict(self.watermarks),
+                'open_bars': sum(len(bars) for bars in self.open_bars.values()),
+                'bars_emitted': self.bars_emitted,
+                'late_ticks': self.late_ticks,
+            }
@@ -0,0 +1,215 @@
+"""
+Historical Bar Cache
+Local Arrow cache for OHLCV history with incremental tail refresh
+"""
+
+import os
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data', 'cache')
+
+# yfinance period strings mapped to how far back they reach
+PERIOD_OFFSETS = {
+    '1d': pd.DateOffset(days=1),
+    '5d': pd.DateOffset(days=5),
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+}
+
+
+def yfinance_source(symbol: str, interval: str, period: Optional[str] = None,
+                    start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """Fetch OHLCV bars from yfinance, either a whole period or everything since start"""
+    import yfinance as yf
+
+    ticker = yf.Ticker(symbol)
+    if start is not None:
+        return ticker.history(start=start, interval=interval)
+    return ticker.history(period=period, interval=interval)
+
+
+class BarCache:
+    """
+    Caches OHLCV history per symbol/interval as Arrow IPC files
+
+    The first request for a symbol downloads the whole period; later requests
+    only fetch bars from the last cached timestamp onwards. Files are read
+    through a memory map and sliced by timestamp, so range reads only convert
+    the rows they return.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, source: Callable = yfinance_source,
+                 max_age: float = 60.0, offline: bool = False):
+        """
+        Args:
+            cache_dir: Directory holding the cache files
+            source: Callable (symbol, interval, period=None, start=None) -> DataFrame
+            max_age: Seconds a cached series is served without checking for new bars
+            offline: Never call the source; serve whatever is cached
+        """
+        self.cache_dir = cache_dir
+        self.source = source
+        self.max_age = max_age
+        self.offline = offline
+        self.stats = {'hits': 0, 'misses': 0, 'refreshes': 0, 'bars_fetched': 0}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.cache_dir, f"{symbol.upper()}_{interval}.arrow")
+
+    def _read_table(self, symbol: str, interval: str) -> Optional[pa.Table]:
+        path = self._path(symbol, interval)
+        if not os.path.exists(path):
+            return None
+        return pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+
+    def _write(self, symbol: str, interval: str, df: pd.DataFrame, covered_from: Optional[pd.Timestamp]):
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        metadata = dict(table.schema.metadata or {})
+        metadata[b'covered_from'] = b'max' if covered_from is None else str(covered_from).encode()
+        metadata[b'refreshed_at'] = str(time.time()).encode()
+        table = table.replace_schema_metadata(metadata)
+
+        path = self._path(symbol, interval)
+        tmp_path = path + '.tmp'
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+
+    def get(self, symbol: str, interval: str = "1h", period: str = "1y") -> pd.DataFrame:
+        """
+        Return bars for the period, fetching only what the cache is missing
+
+        Args:
+            symbol: Ticker symbol
+            interval: Bar interval, e.g. 1h
+            period: yfinance period string
+
+        Returns:
+            DataFrame with OHLCV data
+        """
+        now = pd.Timestamp(datetime.now(timezone.utc))
+        start = self._period_start(period, now)
+        table = self._read_table(symbol, interval)
+
+        if table is None or not self._covers(table, start):
+            if self.offline:
+                self.stats['misses'] += 1
+                return self._slice(table, start, None) if table is not None else pd.DataFrame()
+            df = self.source(symbol, interval, period=period)
+            self.stats['misses'] += 1
+            self.stats['bars_fetched'] += len(df)
+            if df.empty:
+                return df
+            self._write(symbol, interval, df, start)
+            return df
+
+        refreshed_at = float(table.schema.metadata.get(b'refreshed_at', b'0'))
+        if self.offline or time.time() - refreshed_at < self.max_age:
+            self.stats['hits'] += 1
+            return self._slice(table, start, None)
+
+        # Refetch from the last cached bar, which may have been incomplete
+        cached = table.to_pandas()
+        covered_from = self._covered_from(table)
+        del table
+        tail = self.source(symbol, interval, start=cached.index[-1])
+        self.stats['refreshes'] += 1
+        self.stats['bars_fetched'] += len(tail)
+
+        if not tail.empty:
+            tail = tail.tz_convert(cached.index.tz) if cached.index.tz is not None else tail
+            merged = pd.concat([cached, tail])
+            merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+        else:
+            merged = cached
+        self._write(symbol, interval, merged, covered_from)
+
+        if start is None:
+            return merged
+        return merged[merged.index >= self._align(start, merged.index)]
+
+    def read_range(self, symbol: str, interval: str, start=None, end=None) -> pd.DataFrame:
+        """Read cached bars in [start, end) without contacting the source"""
+        table = self._read_table(symbol, interval)
+        if table is None:
+            self.stats['misses'] += 1
+            return pd.DataFrame()
+        self.stats['hits'] += 1
+        return self._slice(table, start, end)
+
+    def describe(self) -> List[Dict]:
+        """Symbol, interval, row count, time range and refresh time of every cached series"""
+        entries = []
+        for name in sorted(os.listdir(self.cache_dir)):
+            if not name.endswith('.arrow'):
+                continue
+            symbol, interval = name[:-len('.arrow')].rsplit('_', 1)
+            table = self._read_table(symbol, interval)
+            index = table.column(table.schema.pandas_metadata['index_columns'][0])
+            metadata = table.schema.metadata
+            entries.append({
+                'symbol': symbol,
+                'interval': interval,
+                'rows': table.num_rows,
+                'first': index[0].as_py() if table.num_rows else None,
+                'last': index[-1].as_py() if table.num_rows else None,
+                'covered_from': metadata[b'covered_from'].decode(),
+                'refreshed_at': datetime.fromtimestamp(float(metadata.get(b'refreshed_at', b'0')), timezone.utc),
+                'size_kb': os.path.getsize(os.path.join(self.cache_dir, name)) / 1024,
+            })
+        return entries
+
+    def get_stats(self) -> Dict:
+        """Cache hit/miss counters"""
+        stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses'] + stats['refreshes']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def _slice(self, table: pa.Table, start, end) -> pd.DataFrame:
+        index_name = table.schema.pandas_metadata['index_columns'][0]
+        index = pd.DatetimeIndex(table.column(index_name).to_pandas())
+        lo = index.searchsorted(self._align(start, index)) if start is not None else 0
+        hi = index.searchsorted(self._align(end, index)) if end is not None else len(index)
+        return table.slice(lo, hi - lo).to_pandas()
+
+    @staticmethod
+    def _align(timestamp, index: pd.DatetimeIndex) -> pd.Timestamp:
+        timestamp = pd.Timestamp(timestamp)
+        if index.tz is not None:
+            return timestamp.tz_localize('UTC') if timestamp.tz is None else timestamp
+        return timestamp.tz_convert(None) if timestamp.tz is not None else timestamp
+
+    @staticmethod
+    def _covered_from(table: pa.Table) -> Optional[pd.Timestamp]:
+        """Earliest start the cached series was fetched for; None means the full history"""
+        covered_from = table.schema.metadata[b'covered_from'].decode()
+        return None if covered_from == 'max' else pd.Timestamp(covered_from)
+
+    def _covers(self, table: pa.Table, start: Optional[pd.Timestamp]) -> bool:
+        covered_from = self._covered_from(table)
+        if covered_from is None:
+            return True
+        return start is not None and covered_from <= start
+
+    @staticmethod
+    def _period_start(period: str, now: pd.Timestamp) -> Optional[pd.Timestamp]:
+        if period == 'max':
+            return None
+        if period == 'ytd':
+            return pd.Timestamp(year=now.year, month=1, day=1, tz='UTC')
+        if period not in PERIOD_OFFSETS:
+            raise ValueError(f"Unsupported period: {period}")
+        return now - PERIOD_OFFSETS[period]
@@ -0,0 +1,216 @@
+"""
+Callback Dispatch
+Asynchronous fan-out of market data to subscribers with bounded queues
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional
+
+from instrumentation.latency import METRICS
+
+OVERFLOW_POLICIES = ('block', 'drop_oldest', 'coalesce')
+
+
+class Subscriber:
+    """
+    One callback with its own bounded queue and delivery worker
+
+    Overflow policies when the queue is full:
+    - block: publish() waits for space (ingestion slows to this consumer)
+    - drop_oldest: the oldest queued item is discarded
+    - coalesce: only the latest item per key is kept (key defaults to the symbol)
+    """
+
+    def __init__(self, callback: Callable, maxsize: int = 10000, policy: str = 'drop_oldest',
+                 executor: Optional[Executor] = None, coalesce_key: Optional[Callable] = None,
+                 name: Optional[str] = None):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.callback = callback
+        self.maxsize = maxsize
+        self.policy = policy
+        self.executor = executor
+        self.coalesce_key = coalesce_key or (lambda data: data.get('symbol') if hasattr(data, 'get') else None)
+        self.name = name or getattr(callback, '__name__', repr(callback))
+
+        self._queue = OrderedDict() if policy == 'coalesce' else deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._closed = False
+        self._draining = False
+
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.max_queued = 0
+        self.max_latency = 0.0
+
+        self._thread = None
+        if executor is None:
+            self._thread = threading.Thread(target=self._run, name=f"subscriber-{self.name}", daemon=True)
+            self._thread.start()
+
+    def put(self, data):
+        """Enqueue an item according to the overflow policy; never runs the callback inline"""
+        item = (time.perf_counter(), data)
+        with self._lock:
+            if self._closed:
+                return
+            if self.policy == 'coalesce':
+                key = self.coalesce_key(data)
+                if key in self._queue:
+                    # Keep the original enqueue time so lag reflects the oldest pending update
+                    self._queue[key] = (self._queue[key][0], data)
+                    self.coalesced += 1
+                    return
+                if len(self._queue) >= self.maxsize:
+                    self._queue.popitem(last=False)
+                    self.dropped += 1
+                self._queue[key] = item
+            elif self.policy == 'drop_oldest':
+                if len(self._queue) >= self.maxsize:
+                    self._queue.popleft()
+                    self.dropped += 1
+                self._queue.append(item)
+            else:
+                while len(self._queue) >= self.maxsize and not self._closed:
+                    self._not_full.wait()
+                self._queue.append(item)
+
+            self.max_queued = max(self.max_queued, len(self._queue))
+            self._not_empty.notify()
+            schedule = self.executor is not None and not self._draining
+            if schedule:
+                self._draining = True
+
+        if schedule:
+            self.executor.submit(self._drain)
+
+    def _pop(self):
+        """Remove the next item; caller holds the lock"""
+        if self.policy == 'coalesce':
+            _, item = self._queue.popitem(last=False)
+        else:
+            item = self._queue.popleft()
+        self._not_full.notify()
+        return item
+
+    def _deliver(self, item):
+        enqueued, data = item
+        waited = time.perf_counter() - enqueued
+        self.max_latency = max(self.max_latency, waited)
+        t = METRICS.start()
+        if t:
+            METRICS.record(f'callback_wait:{self.name}', int(waited * 1e9))
+        try:
+            self.callback(data)
+            self.delivered += 1
+            METRICS.lap(f'callback:{self.name}', t)
+        except Exception as e:
+            self.errors += 1
+            print(f"Error in callback {self.name}: {e}")
+
+    def _run(self):
+        """Dedicated worker thread loop"""
+        while True:
+            with self._lock:
+                while not self._queue and not self._closed:
+                    self._not_empty.wait()
+                if not self._queue:
+                    return
+                item = self._pop()
+            self._deliver(item)
+
+    def _drain(self):
+        """Executor task: deliver until the queue is empty; one task runs at a time to keep order"""
+        while True:
+            with self._lock:
+                if not self._queue:
+                    self._draining = False
+                    return
+                item = self._pop()
+            self._deliver(item)
+
+    def close(self, timeout: Optional[float] = None):
+        """Stop accepting items and wait for the queue to drain"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            return
+        while self._draining and (deadline is None or time.perf_counter() < deadline):
+            time.sleep(0.001)
+
+    def get_stats(self) -> Dict:
+        """Queue depth, lag and delivery counters"""
+        with self._lock:
+            queued = len(self._queue)
+            pending = self._queue.values() if self.policy == 'coalesce' else self._queue
+            oldest = next(iter(pending))[0] if self._queue else None
+        return {
+            'policy': self.policy,
+            'queued': queued,
+            'max_queued': self.max_queued,
+            'lag_seconds': time.perf_counter() - oldest if oldest is not None else 0.0,
+            'max_latency_seconds': self.max_latency,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+        }
+
+
+class CallbackDispatcher:
+    """Fans published items out to subscribers without blocking the publisher on slow callbacks"""
+
+    def __init__(self):
+        self.subscribers: List[Subscriber] = []
+
+    def subscribe(self, callback: Callable, maxsize: int = 10000, policy: str = 'drop_oldest',
+                  executor: Optional[Executor] = None, coalesce_key: Optional[Callable] = None,
+                  name: Optional[str] = None) -> Subscriber:
+        """
+        Register a callback
+
+        Args:
+            callback: Function called with each published item
+            maxsize: Queue capacity for this subscriber
+            policy: 'block', 'drop_oldest' or 'coalesce'
+            executor: Run deliveries on this executor instead of a dedicated thread
+            coalesce_key: Key function for the coalesce policy
+            name: Name used in stats
+        """
+        subscriber = Subscriber(callback, maxsize=maxsize, policy=policy, executor=executor,
+                                coalesce_key=coalesce_key, name=name)
+        names = {existing.name for existing in self.subscribers}
+        if subscriber.name in names:
+            subscriber.name = f"{subscriber.name}#{len(self.subscribers)}"
+        self.subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        """Remove a subscriber after delivering what it has queued"""
+        self.subscribers.remove(subscriber)
+        subscriber.close()
+
+    def publish(self, data):
+        """Queue data for every subscriber"""
+        for subscriber in self.subscribers:
+            subscriber.put(data)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Per-subscriber stats keyed by subscriber name"""
+        return {subscriber.name: subscriber.get_stats() for subscriber in self.subscribers}
+
+    def close(self, timeout: Optional[float] = None):
+        """Drain and stop every subscriber"""
+        for subscriber in self.subscribers:
+            subscriber.close(timeout)
@@ -4,34 +4,70 @@ Collects real-time and historical market data from various sources
 """
 
 import json
-import time
-import websocket
 import threading
-from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Callable
-import yfinance as yf
+import numpy as np
 import pandas as pd
-import requests
+
+# yfinance and websocket-client are imported where they are used, so
+# importing this module (e.g. for cache inspection) stays fast
+
+from data_collection.dispatch import CallbackDispatcher
+from data_collection.sentiment import SentimentPipeline, YFinanceNewsSource
+from data_collection.tick_buffer import TickRingBuffer, tick_dict
+from data_collection.tick_decoder import TickDecoder
+from instrumentation.latency import METRICS
 
 
 class MarketDataCollector:
     """Collects market data from multiple sources"""
     
-    def __init__(self, symbol: str = "AAPL"):
+    def __init__(self, symbol: str = "AAPL", cache=None, buffer_capacity: int = 100000):
+        """
+        Args:
+            symbol: Ticker symbol
+            cache: Optional BarCache used by get_historical_data
+            buffer_capacity: Number of recent ticks kept in data_buffer
+        """
         self.symbol = symbol
+        self.cache = cache
         self.ws = None
         self.is_running = False
-        self.data_buffer = []
+        self.data_buffer = TickRingBuffer(buffer_capacity)
         self.callbacks = []
+        self.dispatcher = CallbackDispatcher()
+        self.journal_subscribers = []
+        
+    def add_callback(self, callback: Callable, policy: str = "drop_oldest", maxsize: int = 10000,
+                     executor=None):
+        """
+        Add callback function for real-time data updates
+        
+        Callbacks run on their own worker (a dedicated thread, or the given
+        executor) so a slow consumer never stalls the WebSocket thread. They
+        receive Tick records, which support dict-style access; the timestamp
+        is integer epoch nanoseconds (tick.to_dict() gives the ISO form).
         
-    def add_callback(self, callback: Callable):
-        """Add callback function for real-time data updates"""
+        Args:
+            callback: Function called with each market data update
+            policy: Overflow policy when the queue is full: 'block', 'drop_oldest' or 'coalesce'
+            maxsize: Queue capacity for this callback
+            executor: Optional concurrent.futures executor to run the callback on
+        """
         self.callbacks.append(callback)
+        return self.dispatcher.subscribe(callback, maxsize=maxsize, policy=policy, executor=executor)
     
     def notify_callbacks(self, data: Dict):
-        """Notify all registered callbacks"""
-        for callback in self.callbacks:
-            callback(data)
+        """Queue data for all registered callbacks"""
+        self.dispatcher.publish(data)
+    
+    def get_callback_stats(self) -> Dict[str, Dict]:
+        """Per-callback queue depth, lag, drop and delivery counters"""
+        return self.dispatcher.get_stats()
+    
+    def get_latency_stats(self) -> Dict:
+        """Per-stage latency histograms and counters (enable with METRICS.enable() or TRADING_METRICS=1)"""
+        return METRICS.snapshot()
     
     def get_historical_data(self, period: str = "1y", interval: str = "1h") -> pd.DataFrame:
         """
@@ -45,6 +81,10 @@ class MarketDataCollector:
             DataFrame with OHLCV data
         """
         try:
+            if self.cache is not None:
+                return self.cache.get(self.symbol, interval=interval, period=period)
+            import yfinance as yf
+            
             ticker = yf.Ticker(self.symbol)
             data = ticker.history(period=period, interval=interval)
             return data
@@ -57,19 +97,22 @@ class MarketDataCollector:
         Start WebSocket stream for real-time data
         Uses Alpha Vantage or similar API format
         """
+        decoder = TickDecoder(default_symbol=symbol)
+        
         def on_message(ws, message):
             try:
-                data = json.loads(message)
-                market_data = {
-                    'symbol': data.get('symbol', symbol),
-                    'price': float(data.get('price', 0)),
-                    'volume': int(data.get('volume', 0)),
-                    'timestamp': datetime.now().isoformat(),
-                    'change': float(data.get('change', 0)),
-                    'change_percent': float(data.get('change_percent', 0))
-                }
-                self.data_buffer.append(market_data)
-                self.notify_callbacks(market_data)
+                t = METRICS.start()
+                ticks = decoder.decode(message)
+                t = METRICS.lap('decode', t)
+                if len(ticks) == 1:
+                    self.data_buffer.append_tick(ticks[0])
+                else:
+                    self.data_buffer.extend(ticks)
+                t = METRICS.lap('buffer_append', t)
+                for tick in ticks:
+                    self.notify_callbacks(tick)
+                METRICS.lap('dispatch_publish', t)
+                METRICS.increment('ticks', len(ticks))
             except Exception as e:
                 print(f"Error processing WebSocket message: {e}")
         
@@ -93,6 +136,8 @@ class MarketDataCollector:
         # WebSocket URL (placeholder - replace with actual API)
         ws_url = "wss://api.example.com/stream"  # Replace with actual WebSocket endpoint
         
+        import websocket
+        
         self.ws = websocket.WebSocketApp(
             ws_url,
             on_open=on_open,
@@ -109,6 +154,77 @@ class MarketDataCollector:
         thread.start()
         return thread
     
+    def start_multi_symbol_stream(self, symbols: List[str], ws_url: Optional[str] = None,
+                                  connections: int = 1, buffer_capacity: int = 10000):
+        """
+        Stream many symbols over a few asyncio WebSocket connections
+        
+        Ticks go to per-symbol ring buffers on the returned stream and are
+        published to this collector's callbacks.
+        
+        Args:
+            symbols: Ticker symbols
+            ws_url: WebSocket endpoint (defaults to DEFAULT_STREAM_URL)
+            connections: Number of connections to spread the symbols over
+            buffer_capacity: Ticks kept per symbol
+        
+        Returns:
+            Running MultiSymbolStream
+        """
+        from data_collection.stream_multiplexer import DEFAULT_STREAM_URL, MultiSymbolStream
+        
+        stream = MultiSymbolStream(symbols, url=ws_url or DEFAULT_STREAM_URL, connections=connections,
+                                   buffer_capacity=buffer_capacity, dispatcher=self.dispatcher)
+        stream.start()
+        self.is_running = True
+        return stream
+    
+    def record_ticks(self, journal, maxsize: int = 100000):
+        """
+        Journal every tick this collector publishes
+        
+        The journal is fed from its own callback worker with the 'block'
+        policy, so disk writes never run on the WebSocket thread and no
+        tick is dropped.
+        
+        Args:
+            journal: TickJournal, or a directory to open one in
+            maxsize: Queue capacity between the stream and the journal
+        
+        Returns:
+            The TickJournal (close() it after stop_stream to write the last batch)
+        """
+        from data_collection.tick_journal import TickJournal
+        
+        if not isinstance(journal, TickJournal):
+            journal = TickJournal(journal)
+        subscriber = self.dispatcher.subscribe(journal.append, maxsize=maxsize, policy="block", name="tick_journal")
+        self.journal_subscribers.append(subscriber)
+        return journal
+    
+    def replay(self, journal, speed: Optional[float] = None, start: Optional[int] = None,
+               end: Optional[int] = None, symbols: Optional[List[str]] = None):
+        """
+        Replay a tick journal into data_buffer and the registered callbacks
+        
+        Journals attached with record_ticks do not receive the replayed
+        ticks, so replaying never appends them to a journal again.
+        
+        Args:
+            journal: Journal directory or TickJournalReader
+            speed: 1.0 for the recorded pace, N for N times faster, None for as fast as possible
+            start: First timestamp to replay (epoch ns)
+            end: Timestamp to stop at (epoch ns, exclusive)
+            symbols: Only replay these symbols
+        
+        Returns:
+            TickReplay; call run() to replay on this thread or start() for a background thread
+        """
+        from data_collection.tick_journal import TickReplay
+        
+        return TickReplay(journal, buffer=self.data_buffer, dispatcher=self.dispatcher, speed=speed,
+                          start=start, end=end, symbols=symbols, exclude=self.journal_subscribers)
+    
     def stop_stream(self):
         """Stop WebSocket stream"""
         if self.ws:
@@ -117,30 +233,42 @@ class MarketDataCollector:
     
     def get_latest_data(self) -> Optional[Dict]:
         """Get the latest market data from buffer"""
-        if self.data_buffer:
-            return self.data_buffer[-1]
+        latest = self.data_buffer.latest()
+        if latest is not None:
+            return tick_dict(latest, self.symbol)
         return None
     
     def get_cached_data(self, count: int = 100) -> List[Dict]:
-        """Get cached data from buffer"""
-        return self.data_buffer[-count:] if len(self.data_buffer) >= count else self.data_buffer
+        """Get cached data from buffer (use get_recent_ticks for zero-copy column views)"""
+        return self.data_buffer.to_records(count, self.symbol)
+    
+    def get_recent_ticks(self, count: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Read-only column views (timestamp, price, volume, change, change_percent) of the last count ticks"""
+        return self.data_buffer.last(count)
 
 
 class SentimentDataCollector:
     """Collects sentiment data from news and social media"""
     
-    def __init__(self, symbol: str):
+    def __init__(self, symbol: str, pipeline: Optional[SentimentPipeline] = None):
+        """
+        Args:
+            symbol: Ticker symbol
+            pipeline: Shared SentimentPipeline (defaults to Yahoo Finance headlines)
+        """
         self.symbol = symbol
         self.sentiment_scores = []
+        self.pipeline = pipeline or SentimentPipeline(YFinanceNewsSource())
     
     def get_news_sentiment(self) -> float:
         """
         Get sentiment score from news articles
-        Returns: Sentiment score between -1 (negative) and 1 (positive)
+        Returns: Mean sentiment of the pipeline's rolling window, between -1 (negative)
+            and 1 (positive); 0.0 without recent news
         """
-        # Placeholder implementation
-        # In production, integrate with news API like NewsAPI, Alpha Vantage, etc.
-        return 0.0
+        score = self.pipeline.latest(self.symbol)['sentiment_mean']
+        self.sentiment_scores.append(score)
+        return score
     
     def calculate_sentiment_score(self, articles: List[Dict]) -> float:
         """
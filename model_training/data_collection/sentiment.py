@@ -0,0 +1,434 @@
+"""
+Sentiment Ingestion
+Concurrent news fetching, TTL-deduplicated articles and time-bucketed
+sentiment features aligned to bar timestamps
+"""
+
+import hashlib
+import math
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Columns added to a bar DataFrame by SentimentPipeline.join
+SENTIMENT_COLUMNS = ['sentiment_mean', 'sentiment_count', 'sentiment_decay']
+
+_POSITIVE_WORDS = {
+    'beat', 'beats', 'bullish', 'surge', 'surges', 'soar', 'soars', 'rally', 'rallies', 'gain', 'gains',
+    'growth', 'record', 'upgrade', 'upgrades', 'outperform', 'strong', 'profit', 'profits', 'rise', 'rises',
+    'jump', 'jumps', 'boost', 'boosts', 'buy', 'positive', 'raises', 'exceeds', 'higher', 'optimistic',
+}
+_NEGATIVE_WORDS = {
+    'miss', 'misses', 'bearish', 'plunge', 'plunges', 'slump', 'slumps', 'fall', 'falls', 'drop', 'drops',
+    'loss', 'losses', 'downgrade', 'downgrades', 'underperform', 'weak', 'lawsuit', 'probe', 'recall',
+    'cut', 'cuts', 'sell', 'negative', 'lower', 'warns', 'warning', 'decline', 'declines', 'fraud', 'layoffs',
+}
+_WORD = re.compile(r"[a-z']+")
+
+
+def score_text(text: str) -> float:
+    """Lexicon sentiment between -1 (negative) and 1 (positive); 0 when no scored words"""
+    words = _WORD.findall(text.lower())
+    positive = sum(word in _POSITIVE_WORDS for word in words)
+    negative = sum(word in _NEGATIVE_WORDS for word in words)
+    if positive + negative == 0:
+        return 0.0
+    return (positive - negative) / (positive + negative)
+
+
+def article_key(article: Dict) -> str:
+    """Stable identity of an article: its source ID, else a hash of its content"""
+    if article.get('id'):
+        return str(article['id'])
+    content = '|'.join(str(article.get(field, '')) for field in ('symbol', 'url', 'title', 'published'))
+    return hashlib.sha1(content.encode()).hexdigest()
+
+
+def _to_ns(timestamp) -> int:
+    """Epoch nanoseconds from an int (s or ns), datetime or timestamp string"""
+    if isinstance(timestamp, (int, np.integer)):
+        # Seconds are below 1e11 for the foreseeable future
+        return int(timestamp) * 1_000_000_000 if timestamp < 100_000_000_000 else int(timestamp)
+    if isinstance(timestamp, float):
+        return int(timestamp * 1e9)
+    stamp = pd.Timestamp(timestamp)
+    if stamp.tzinfo is None:
+        stamp = stamp.tz_localize('UTC')
+    return stamp.value
+
+
+class TTLCache:
+    """
+    Dict-like cache whose entries expire ttl seconds after they were set
+
+    Bounded by maxsize; the oldest entries are evicted first.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1_000_000, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            ttl: Seconds an entry stays valid
+            maxsize: Maximum number of entries
+            clock: Time source in seconds
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.clock = clock
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self.clock():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value=True, ttl: Optional[float] = None):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (self.clock() + (self.ttl if ttl is None else ttl), value)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def add(self, key) -> bool:
+        """Insert key if it is not present; True when it was new"""
+        with self._lock:
+            now = self.clock()
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return False
+            self.misses += 1
+            self._entries.pop(key, None)
+            self._entries[key] = (now + self.ttl, True)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return True
+
+    def __contains__(self, key) -> bool:
+        return self.get(key) is not None
+
+    def purge(self) -> int:
+        """Drop expired entries; returns how many were removed"""
+        with self._lock:
+            now = self.clock()
+            expired = [key for key, (expires, _) in self._entries.items() if expires <= now]
+            for key in expired:
+                del self._entries[key]
+            return len(expired)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SentimentSource:
+    """
+    Fetches news articles for a symbol
+
+    Subclasses return dicts with at least 'published' (epoch s/ns, datetime
+    or ISO string) and 'sentiment' (-1 to 1) or 'title'/'summary' text to
+    score; 'id' is used for deduplication when present. fetch() is called
+    from worker threads, so it may block on I/O.
+    """
+
+    def fetch(self, symbol: str) -> List[Dict]:
+        raise NotImplementedError
+
+
+class YFinanceNewsSource(SentimentSource):
+    """Recent Yahoo Finance headlines for a symbol, scored with score_text"""
+
+    def fetch(self, symbol: str) -> List[Dict]:
+        import yfinance as yf
+
+        articles = []
+        for item in yf.Ticker(symbol).news or []:
+            # Newer yfinance versions nest the story under 'content'
+            content = item.get('content') or item
+            published = content.get('pubDate') or content.get('providerPublishTime')
+            if published is None:
+                continue
+            title = content.get('title', '')
+            summary = content.get('summary', '')
+            articles.append({
+                'id': item.get('id') or item.get('uuid'),
+                'symbol': symbol,
+                'title': title,
+                'published': published,
+                'sentiment': score_text(f"{title} {summary}"),
+            })
+        return articles
+
+
+class FakeSentimentSource(SentimentSource):
+    """
+    Deterministic synthetic articles for offline runs and tests
+
+    Each fetch returns a few new articles published within the last
+    lookback seconds plus a share of previously returned ones, so
+    deduplication is exercised; latency simulates a network round trip.
+    """
+
+    def __init__(self, articles_per_fetch: int = 5, duplicate_rate: float = 0.3, lookback: float = 3600.0,
+                 latency: float = 0.0, seed: int = 0, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            articles_per_fetch: New articles per call
+            duplicate_rate: Fraction of previously seen articles repeated per call
+            lookback: Seconds before now that new articles are published in
+            latency: Seconds each fetch sleeps
+            seed: Seed for reproducible articles
+            clock: Time source in epoch seconds
+        """
+        self.articles_per_fetch = articles_per_fetch
+        self.duplicate_rate = duplicate_rate
+        self.lookback = lookback
+        self.latency = latency
+        self.seed = seed
+        self.clock = clock
+        self.fetches = 0
+        self._history: Dict[str, List[Dict]] = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, symbol: str) -> List[Dict]:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.fetches += 1
+            history = self._history.setdefault(symbol, [])
+            rng = random.Random(f"{self.seed}:{symbol}:{len(history)}")
+            now = self.clock()
+            new = [{
+                'id': f"{symbol}-{len(history) + i}",
+                'symbol': symbol,
+                'title': f"{symbol} headline {len(history) + i}",
+                'published': now - rng.uniform(0, self.lookback),
+                'sentiment': rng.uniform(-1, 1),
+            } for i in range(self.articles_per_fetch)]
+            repeats = [article for article in history if rng.random() < self.duplicate_rate]
+            history.extend(new)
+        return new + repeats
+
+
+class SentimentAggregator:
+    """
+    Incremental per-symbol sentiment buckets
+
+    Each article adds its score to a fixed-width time bucket (sum and
+    count), so ingestion is O(1). Features at a bar timestamp t only use
+    buckets that ended at or before t (no lookahead):
+
+    - sentiment_mean / sentiment_count: over the window_buckets buckets before t
+    - sentiment_decay: every score so far, exponentially decayed by age
+      with the given half-life (a sum, so it also reflects news volume,
+      and fades to 0 when news stops)
+    """
+
+    def __init__(self, bucket_seconds: float = 3600.0, window_buckets: int = 24,
+                 half_life_seconds: float = 6 * 3600.0, retention_buckets: int = 24 * 90):
+        """
+        Args:
+            bucket_seconds: Bucket width
+            window_buckets: Buckets in the rolling mean/count window
+            half_life_seconds: Half-life of the decay-weighted score
+            retention_buckets: Buckets kept per symbol before the oldest are dropped
+        """
+        self.bucket_ns = int(bucket_seconds * 1e9)
+        self.window_ns = self.bucket_ns * window_buckets
+        self.decay_rate = math.log(2) / (half_life_seconds * 1e9)
+        self.retention_buckets = retention_buckets
+        self._buckets: Dict[str, Dict[int, List[float]]] = {}
+        self._arrays: Dict[str, tuple] = {}
+
+    def add(self, symbol: str, published_ns: int, score: float):
+        """Add one article score"""
+        start = published_ns - published_ns % self.bucket_ns
+        buckets = self._buckets.setdefault(symbol, {})
+        bucket = buckets.get(start)
+        if bucket is None:
+            bucket = buckets[start] = [0.0, 0]
+            if len(buckets) > self.retention_buckets:
+                del buckets[min(buckets)]
+        bucket[0] += score
+        bucket[1] += 1
+        self._arrays.pop(symbol, None)
+
+    def symbols(self) -> List[str]:
+        return list(self._buckets)
+
+    def _compiled(self, symbol: str) -> tuple:
+        """Bucket end times, cumulative sums/counts and decayed sums, rebuilt after adds"""
+        arrays = self._arrays.get(symbol)
+        if arrays is not None:
+            return arrays
+        buckets = self._buckets.get(symbol, {})
+        starts = np.array(sorted(buckets), dtype=np.int64)
+        sums = np.array([buckets[start][0] for start in starts], dtype=np.float64)
+        counts = np.array([buckets[start][1] for start in starts], dtype=np.float64)
+        ends = starts + self.bucket_ns
+
+        # Decayed sum at each bucket end: S_j = S_(j-1) * exp(-rate * gap) + sum_j
+        decayed = np.empty(len(sums))
+        total = 0.0
+        for j in range(len(sums)):
+            if j:
+                total *= math.exp(-self.decay_rate * (ends[j] - ends[j - 1]))
+            total += sums[j]
+            decayed[j] = total
+
+        arrays = (ends, np.concatenate([[0.0], np.cumsum(sums)]), np.concatenate([[0.0], np.cumsum(counts)]),
+                  decayed)
+        self._arrays[symbol] = arrays
+        return arrays
+
+    def features_at(self, symbol: str, timestamps_ns: np.ndarray) -> np.ndarray:
+        """
+        Sentiment features at each timestamp
+
+        Returns:
+            Array (len(timestamps_ns), 3) ordered as SENTIMENT_COLUMNS
+        """
+        timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+        ends, cum_sums, cum_counts, decayed = self._compiled(symbol)
+        result = np.zeros((len(timestamps_ns), len(SENTIMENT_COLUMNS)))
+        if not len(ends):
+            return result
+
+        upper = np.searchsorted(ends, timestamps_ns, side='right')
+        lower = np.searchsorted(ends, timestamps_ns - self.window_ns, side='right')
+        window_sum = cum_sums[upper] - cum_sums[lower]
+        window_count = cum_counts[upper] - cum_counts[lower]
+        np.divide(window_sum, window_count, out=result[:, 0], where=window_count > 0)
+        result[:, 1] = window_count
+
+        has_news = upper > 0
+        last = upper[has_news] - 1
+        age = timestamps_ns[has_news] - ends[last]
+        result[has_news, 2] = decayed[last] * np.exp(-self.decay_rate * age)
+        return result
+
+
+class SentimentPipeline:
+    """
+    Keeps sentiment features current for many symbols
+
+    refresh() fetches symbols whose last fetch is older than
+    refresh_interval, concurrently on a thread pool; articles are
+    deduplicated through a TTL cache of article keys before reaching the
+    aggregator. Feature lookups for recently refreshed symbols never fetch.
+    """
+
+    def __init__(self, source: SentimentSource, aggregator: Optional[SentimentAggregator] = None,
+                 refresh_interval: float = 300.0, article_ttl: float = 7 * 86400.0, max_workers: int = 16,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            source: Article source
+            aggregator: Bucket aggregator (defaults to hourly buckets, 24h window)
+            refresh_interval: Seconds before a symbol is fetched again
+            article_ttl: Seconds an article key is remembered for deduplication
+            max_workers: Concurrent fetches
+            clock: Time source for the caches
+        """
+        self.source = source
+        self.aggregator = aggregator or SentimentAggregator()
+        self.seen = TTLCache(article_ttl, clock=clock)
+        self.fresh = TTLCache(refresh_interval, clock=clock)
+        self.max_workers = max_workers
+        self._executor = None
+        self.stats = {'fetches': 0, 'fetch_errors': 0, 'articles': 0, 'duplicates': 0}
+
+    def _fetch(self, symbol: str) -> List[Dict]:
+        try:
+            return self.source.fetch(symbol)
+        except Exception as e:
+            print(f"Sentiment fetch failed for {symbol}: {e}")
+            self.stats['fetch_errors'] += 1
+            return []
+
+    def ingest(self, symbol: str, articles: Iterable[Dict]) -> int:
+        """Add articles for a symbol, skipping ones already seen; returns how many were new"""
+        new = 0
+        for article in articles:
+            if not self.seen.add((symbol, article_key(article))):
+                self.stats['duplicates'] += 1
+                continue
+            score = article.get('sentiment')
+            if score is None:
+                score = score_text(f"{article.get('title', '')} {article.get('summary', '')}")
+            self.aggregator.add(symbol, _to_ns(article['published']), float(score))
+            new += 1
+        self.stats['articles'] += new
+        return new
+
+    def refresh(self, symbols: Iterable[str], force: bool = False) -> int:
+        """
+        Fetch stale symbols concurrently
+
+        Returns:
+            Number of symbols fetched
+        """
+        stale = [symbol for symbol in dict.fromkeys(symbols) if force or symbol not in self.fresh]
+        if not stale:
+            return 0
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='sentiment')
+        # Results are merged on this thread, so the aggregator needs no locking
+        for symbol, articles in zip(stale, self._executor.map(self._fetch, stale)):
+            self.stats['fetches'] += 1
+            self.ingest(symbol, articles)
+            self.fresh.set(symbol)
+        return len(stale)
+
+    def features(self, symbol: str, index: pd.DatetimeIndex, refresh: bool = True) -> pd.DataFrame:
+        """
+        Sentiment features aligned to a bar index
+
+        Args:
+            symbol: Ticker symbol
+            index: Bar timestamps (naive timestamps are taken as UTC)
+            refresh: Fetch first if the symbol is stale
+        """
+        if refresh:
+            self.refresh([symbol])
+        index = pd.DatetimeIndex(index)
+        timestamps = index if index.tz is not None else index.tz_localize('UTC')
+        values = self.aggregator.features_at(symbol, timestamps.as_unit('ns').asi8)
+        return pd.DataFrame(values, index=index, columns=SENTIMENT_COLUMNS)
+
+    def join(self, df: pd.DataFrame, symbol: str, refresh: bool = True) -> pd.DataFrame:
+        """Copy of an OHLCV DataFrame with SENTIMENT_COLUMNS added (0 where there is no news)"""
+        return df.join(self.features(symbol, df.index, refresh=refresh))
+
+    def latest(self, symbol: str) -> Dict:
+        """Features as of now for one symbol"""
+        self.refresh([symbol])
+        row = self.aggregator.features_at(symbol, np.array([time.time_ns()]))[0]
+        return dict(zip(SENTIMENT_COLUMNS, row))
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'symbols': len(self.aggregator.symbols()),
+            'cached_articles': len(self.seen),
+            'refresh_cache_hits': self.fresh.hits,
+        }
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,167 @@
+"""
+Stream Multiplexer
+asyncio collector for many symbols over a few WebSocket connections
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from data_collection.dispatch import CallbackDispatcher
+from data_collection.tick_buffer import TickRingBuffer
+from data_collection.tick_decoder import TickDecoder
+from instrumentation.latency import METRICS
+
+DEFAULT_STREAM_URL = "wss://api.example.com/stream"  # Replace with actual WebSocket endpoint
+
+
+class MultiSymbolStream:
+    """
+    Streams many symbols over a small number of WebSocket connections
+
+    Symbols are split across connections; each connection subscribes to its
+    share, routes incoming ticks to per-symbol ring buffers and publishes
+    them to the dispatcher. Dropped connections are re-established with
+    exponential backoff and resubscribed.
+    """
+
+    def __init__(self, symbols: Iterable[str], url: str = DEFAULT_STREAM_URL, connections: int = 1,
+                 buffer_capacity: int = 10000, dispatcher: Optional[CallbackDispatcher] = None,
+                 reconnect_delay: float = 0.5, max_reconnect_delay: float = 30.0):
+        """
+        Args:
+            symbols: Symbols to subscribe to
+            url: WebSocket endpoint
+            connections: Number of connections to spread the symbols over
+            buffer_capacity: Ticks kept per symbol
+            dispatcher: Dispatcher that receives every decoded Tick
+            reconnect_delay: First reconnect delay in seconds
+            max_reconnect_delay: Upper bound for the reconnect backoff
+        """
+        self.symbols = list(dict.fromkeys(symbols))
+        self.url = url
+        self.connections = max(1, min(connections, len(self.symbols)))
+        self.buffers = {symbol: TickRingBuffer(buffer_capacity) for symbol in self.symbols}
+        self.dispatcher = dispatcher or CallbackDispatcher()
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.decoder = TickDecoder()
+
+        self.message_counts = dict.fromkeys(self.symbols, 0)
+        self.unrouted = 0
+        self.reconnects = 0
+        self.connected = [False] * self.connections
+        self._rate_snapshot = (time.perf_counter(), dict(self.message_counts))
+
+        self._loop = None
+        self._tasks = []
+        self._thread = None
+        self._stopping = False
+
+    def symbol_groups(self) -> List[List[str]]:
+        """Symbols assigned to each connection"""
+        return [self.symbols[i::self.connections] for i in range(self.connections)]
+
+    async def run(self):
+        """Run every connection until stop() is called (returns at once if it already was; see reset())"""
+        self._loop = asyncio.get_running_loop()
+        if self._stopping:
+            return
+        self._tasks = [
+            asyncio.ensure_future(self._connection(index, group))
+            for index, group in enumerate(self.symbol_groups())
+        ]
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _connection(self, index: int, symbols: List[str]):
+        import websockets
+
+        delay = self.reconnect_delay
+        while not self._stopping:
+            try:
+                async with websockets.connect(self.url, ping_interval=20) as ws:
+                    await ws.send(json.dumps({"action": "subscribe", "symbols": ",".join(symbols)}))
+                    self.connected[index] = True
+                    delay = self.reconnect_delay
+                    async for message in ws:
+                        self.handle_message(message)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                if not self._stopping:
+                    print(f"Stream connection {index} lost: {e}")
+            finally:
+                self.connected[index] = False
+
+            if self._stopping:
+                break
+            self.reconnects += 1
+            # Full jitter keeps many clients from reconnecting in lockstep
+            await asyncio.sleep(random.uniform(0, delay))
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def handle_message(self, message):
+        """Decode a message (a tick object or an array of them) and route each tick"""
+        buffers = self.buffers
+        counts = self.message_counts
+        publish = self.dispatcher.publish
+        lap = METRICS.lap
+        t = METRICS.start()
+        ticks = self.decoder.decode(message)
+        t = lap('decode', t)
+        for tick in ticks:
+            buffer = buffers.get(tick.symbol)
+            if buffer is None:
+                self.unrouted += 1
+                continue
+            buffer.append_tick(tick)
+            counts[tick.symbol] += 1
+            t = lap('buffer_append', t)
+            publish(tick)
+            t = lap('dispatch_publish', t)
+        METRICS.increment('ticks', len(ticks))
+
+    def get_message_rates(self) -> Dict[str, float]:
+        """Messages per second for each symbol since the previous call"""
+        now = time.perf_counter()
+        counts = dict(self.message_counts)
+        then, previous = self._rate_snapshot
+        self._rate_snapshot = (now, counts)
+        elapsed = max(now - then, 1e-9)
+        return {symbol: (counts[symbol] - previous.get(symbol, 0)) / elapsed for symbol in counts}
+
+    def get_stats(self) -> Dict:
+        """Connection state and message counters"""
+        return {
+            'connections': self.connections,
+            'connected': sum(self.connected),
+            'reconnects': self.reconnects,
+            'messages': sum(self.message_counts.values()),
+            'unrouted': self.unrouted,
+        }
+
+    def start(self) -> threading.Thread:
+        """Run the stream on its own event loop in a background thread"""
+        self._thread = threading.Thread(target=lambda: asyncio.run(self.run()), daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def reset(self):
+        """Let a stopped stream run again"""
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError("The stream is still running; stop() it first")
+        self._stopping = False
+        self._tasks = []
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        """Close every connection and stop reconnecting"""
+        self._stopping = True
+        if self._loop is not None and not self._loop.is_closed():
+            for task in self._tasks:
+                self._loop.call_soon_threadsafe(task.cancel)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,176 @@
+"""
+Tick Ring Buffer
+Fixed-capacity columnar storage for the most recent ticks
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+TICK_COLUMNS = {
+    'timestamp': np.int64,       # epoch nanoseconds
+    'price': np.float64,
+    'volume': np.int64,
+    'change': np.float64,
+    'change_percent': np.float64,
+}
+
+
+class TickRingBuffer:
+    """
+    Ring buffer of ticks stored as NumPy columns
+
+    Every value is written twice, at slot i and i + capacity, so the last N
+    ticks are always one contiguous slice and last() can return views
+    without copying. Appends are O(1) and expected from a single writer
+    thread; readers never block it. A view stays valid until the writer
+    has appended another (capacity - N) ticks; use snapshot() for a copy
+    that is guaranteed consistent.
+    """
+
+    def __init__(self, capacity: int = 100000):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.columns = {name: np.zeros(2 * capacity, dtype=dtype) for name, dtype in TICK_COLUMNS.items()}
+        self._write_lock = threading.Lock()
+        self._count = 0  # total ticks ever appended; published after the values are written
+
+    def append(self, timestamp: int, price: float, volume: int, change: float = 0.0,
+               change_percent: float = 0.0):
+        """Append one tick (timestamp in epoch nanoseconds)"""
+        columns = self.columns
+        with self._write_lock:
+            slot = self._count % self.capacity
+            mirror = slot + self.capacity
+            # Unrolled: a loop over (name, value) pairs allocates a tuple per column
+            column = columns['timestamp']
+            column[slot] = column[mirror] = timestamp
+            column = columns['price']
+            column[slot] = column[mirror] = price
+            column = columns['volume']
+            column[slot] = column[mirror] = volume
+            column = columns['change']
+            column[slot] = column[mirror] = change
+            column = columns['change_percent']
+            column[slot] = column[mirror] = change_percent
+            self._count += 1
+
+    def append_tick(self, tick):
+        """Append a decoded Tick"""
+        self.append(tick.timestamp, tick.price, tick.volume, tick.change, tick.change_percent)
+
+    def extend(self, ticks: List):
+        """Append a batch of decoded Ticks with one vectorized write per column"""
+        total = len(ticks)
+        if not total:
+            return
+        # Only the last capacity ticks of an oversized batch can survive
+        ticks = ticks[-self.capacity:]
+        values = {
+            'timestamp': [tick.timestamp for tick in ticks],
+            'price': [tick.price for tick in ticks],
+            'volume': [tick.volume for tick in ticks],
+            'change': [tick.change for tick in ticks],
+            'change_percent': [tick.change_percent for tick in ticks],
+        }
+        with self._write_lock:
+            slots = (self._count + total - len(ticks) + np.arange(len(ticks))) % self.capacity
+            mirrors = slots + self.capacity
+            for name, column in self.columns.items():
+                column[slots] = values[name]
+                column[mirrors] = values[name]
+            self._count += total
+
+    def extend_columns(self, columns: Dict[str, np.ndarray]):
+        """Append a batch given as column arrays (e.g. replayed journal records), one write per column"""
+        total = len(columns['timestamp'])
+        if not total:
+            return
+        keep = min(total, self.capacity)
+        with self._write_lock:
+            slots = (self._count + total - keep + np.arange(keep)) % self.capacity
+            mirrors = slots + self.capacity
+            for name, column in self.columns.items():
+                values = columns[name][total - keep:]
+                column[slots] = values
+                column[mirrors] = values
+            self._count += total
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    @property
+    def total_appended(self) -> int:
+        return self._count
+
+    def _bounds(self, n: Optional[int], count: int):
+        size = min(count, self.capacity)
+        n = size if n is None else min(n, size)
+        end = (count - 1) % self.capacity + 1 + self.capacity if count else 0
+        return end - n, end
+
+    def last(self, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Read-only views of the last n ticks (all buffered ticks when n is None), oldest first"""
+        start, end = self._bounds(n, self._count)
+        views = {}
+        for name, column in self.columns.items():
+            view = column[start:end]
+            view.flags.writeable = False
+            views[name] = view
+        return views
+
+    def snapshot(self, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Consistent copies of the last n ticks"""
+        count = self._count
+        start, end = self._bounds(n, count)
+        copies = {name: column[start:end].copy() for name, column in self.columns.items()}
+        # The oldest copied tick is only overwritten once the writer (possibly
+        # mid-append) gets capacity - n ticks further; otherwise copy under the lock
+        if self._count + 1 - count <= self.capacity - (end - start):
+            return copies
+        with self._write_lock:
+            start, end = self._bounds(n, self._count)
+            return {name: column[start:end].copy() for name, column in self.columns.items()}
+
+    def latest(self) -> Optional[Dict]:
+        """Most recent tick as scalars, or None when empty"""
+        count = self._count
+        if not count:
+            return None
+        slot = (count - 1) % self.capacity
+        return {name: column[slot].item() for name, column in self.columns.items()}
+
+    def to_records(self, n: Optional[int] = None, symbol: Optional[str] = None) -> List[Dict]:
+        """Last n ticks as the per-tick dicts MarketDataCollector used to buffer"""
+        ticks = self.snapshot(n)
+        return [
+            _tick_dict(symbol, timestamp, price, volume, change, change_percent)
+            for timestamp, price, volume, change, change_percent in zip(
+                ticks['timestamp'].tolist(), ticks['price'].tolist(), ticks['volume'].tolist(),
+                ticks['change'].tolist(), ticks['change_percent'].tolist()
+            )
+        ]
+
+    def clear(self):
+        with self._write_lock:
+            self._count = 0
+
+
+def _tick_dict(symbol, timestamp, price, volume, change, change_percent) -> Dict:
+    return {
+        'symbol': symbol,
+        'price': price,
+        'volume': volume,
+        'timestamp': datetime.fromtimestamp(timestamp / 1e9).isoformat(),
+        'change': change,
+        'change_percent': change_percent,
+    }
+
+
+def tick_dict(record: Dict, symbol: Optional[str] = None) -> Dict:
+    """Convert a latest()-style record to a MarketDataCollector tick dict"""
+    return _tick_dict(symbol, record['timestamp'], record['price'], record['volume'],
+                      record['change'], record['change_percent'])
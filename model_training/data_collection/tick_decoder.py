@@ -0,0 +1,197 @@
+"""
+Tick Decoder
+Low-allocation decoding of WebSocket tick messages
+"""
+
+import json
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+try:
+    import orjson
+    _loads = orjson.loads
+    JSON_BACKEND = 'orjson'
+except ImportError:
+    _loads = json.loads
+    JSON_BACKEND = 'json'
+
+
+class Tick:
+    """
+    One decoded tick with an integer epoch-nanosecond timestamp
+
+    Supports tick['price'] and tick.get('price') so callbacks written for the
+    old per-tick dicts keep working; to_dict() gives the old dict form.
+    """
+
+    __slots__ = ('symbol', 'timestamp', 'price', 'volume', 'change', 'change_percent')
+
+    def __init__(self, symbol: Optional[str], timestamp: int, price: float, volume: int,
+                 change: float = 0.0, change_percent: float = 0.0):
+        self.symbol = symbol
+        self.timestamp = timestamp
+        self.price = price
+        self.volume = volume
+        self.change = change
+        self.change_percent = change_percent
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def __repr__(self):
+        return (f"Tick({self.symbol!r}, {self.timestamp}, price={self.price}, volume={self.volume}, "
+                f"change={self.change}, change_percent={self.change_percent})")
+
+    def to_dict(self) -> Dict:
+        """Tick as the dict MarketDataCollector used to publish (ISO timestamp string)"""
+        return {
+            'symbol': self.symbol,
+            'price': self.price,
+            'volume': self.volume,
+            'timestamp': datetime.fromtimestamp(self.timestamp / 1e9).isoformat(),
+            'change': self.change,
+            'change_percent': self.change_percent,
+        }
+
+
+class TickDecoder:
+    """
+    Decodes tick messages into Tick records
+
+    A message may be one tick object, an array of them, or several
+    newline-separated frames. All ticks in a message share one receive
+    timestamp, taken once per message.
+    """
+
+    def __init__(self, default_symbol: Optional[str] = None, clock: Callable[[], int] = time.time_ns):
+        """
+        Args:
+            default_symbol: Symbol for ticks that do not carry one
+            clock: Source of epoch-nanosecond receive timestamps
+        """
+        self.default_symbol = default_symbol
+        self.clock = clock
+        self.errors = 0
+
+    def decode(self, message) -> List[Tick]:
+        """
+        Decode a message
+
+        Args:
+            message: str or bytes as received from the socket
+
+        Returns:
+            Decoded ticks; malformed items are counted in errors and skipped
+        """
+        try:
+            data = _loads(message)
+        except ValueError:
+            if isinstance(message, bytes):
+                message = message.decode()
+            # Newline-delimited frames batched into one message
+            try:
+                data = [_loads(line) for line in message.splitlines() if line.strip()]
+            except ValueError:
+                self.errors += 1
+                return []
+
+        items = data if isinstance(data, list) else (data,)
+        if any(isinstance(item, list) for item in items):
+            # Batched frames may themselves be arrays of ticks
+            items = [tick for item in items for tick in (item if isinstance(item, list) else (item,))]
+        return self.decode_items(items, self.clock())
+
+    def decode_items(self, items, timestamp: int) -> List[Tick]:
+        """Convert already-parsed tick objects sharing one timestamp"""
+        default_symbol = self.default_symbol
+        ticks = []
+        append = ticks.append
+        for item in items:
+            try:
+                get = item.get
+                append(Tick(
+                    get('symbol', default_symbol),
+                    timestamp,
+                    float(get('price', 0)),
+                    int(get('volume', 0)),
+                    float(get('change', 0)),
+                    float(get('change_percent', 0)),
+                ))
+            except (AttributeError, TypeError, ValueError):
+                self.errors += 1
+        return ticks
+
+
+def _legacy_decode(message, symbol: str) -> Dict:
+    """The per-message path on_message used before TickDecoder (kept for benchmarking)"""
+    data = json.loads(message)
+    return {
+        'symbol': data.get('symbol', symbol),
+        'price': float(data.get('price', 0)),
+        'volume': int(data.get('volume', 0)),
+        'timestamp': datetime.now().isoformat(),
+        'change': float(data.get('change', 0)),
+        'change_percent': float(data.get('change_percent', 0))
+    }
+
+
+def benchmark_decoding(num_ticks: int = 200000, batch_size: int = 50) -> Dict:
+    """
+    Ticks per second of the old on_message decoding versus TickDecoder
+
+    Args:
+        num_ticks: Ticks to decode in each run
+        batch_size: Ticks per array-framed message for the batched run
+
+    Returns:
+        Dictionary with ticks/sec for legacy, single-message and batched decoding
+    """
+    from data_collection.tick_buffer import TickRingBuffer
+
+    ticks = [
+        {'symbol': 'AAPL', 'price': 150.0 + i * 0.01, 'volume': 100 + i,
+         'change': 0.5, 'change_percent': 0.33}
+        for i in range(batch_size)
+    ]
+    single = [json.dumps(tick) for tick in ticks]
+    batched = json.dumps(ticks)
+    decoder = TickDecoder('AAPL')
+    results = {'json_backend': JSON_BACKEND, 'num_ticks': num_ticks}
+
+    # Old path: json.loads, dict, ISO string timestamp, then a buffer append
+    buffer = TickRingBuffer(100000)
+    started = time.perf_counter()
+    for i in range(num_ticks):
+        market_data = _legacy_decode(single[i % batch_size], 'AAPL')
+        buffer.append(time.time_ns(), market_data['price'], market_data['volume'],
+                      market_data['change'], market_data['change_percent'])
+    results['legacy_ticks_per_sec'] = num_ticks / (time.perf_counter() - started)
+
+    buffer = TickRingBuffer(100000)
+    started = time.perf_counter()
+    for i in range(num_ticks):
+        for tick in decoder.decode(single[i % batch_size]):
+            buffer.append_tick(tick)
+    results['decoder_ticks_per_sec'] = num_ticks / (time.perf_counter() - started)
+
+    buffer = TickRingBuffer(100000)
+    started = time.perf_counter()
+    for _ in range(num_ticks // batch_size):
+        buffer.extend(decoder.decode(batched))
+    results['batched_ticks_per_sec'] = (num_ticks // batch_size) * batch_size / (time.perf_counter() - started)
+
+    results['speedup'] = results['decoder_ticks_per_sec'] / results['legacy_ticks_per_sec']
+    results['batched_speedup'] = results['batched_ticks_per_sec'] / results['legacy_ticks_per_sec']
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in benchmark_decoding().items():
+        print(f"{name}: {value:,.2f}" if isinstance(value, float) else f"{name}: {value}")
@@ -0,0 +1,532 @@
+"""
+Tick Journal
+Append-only binary journal of streamed ticks with memory-mapped replay
+"""
+
+import os
+import struct
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from data_collection.dispatch import CallbackDispatcher
+from data_collection.tick_decoder import Tick
+from instrumentation.latency import METRICS
+
+MAGIC = b'TICKJRNL'
+VERSION = 1
+HEADER_SIZE = 64
+SEGMENT_SUFFIX = '.ticks'
+SYMBOLS_FILE = 'symbols.txt'
+
+# Fixed-width little-endian records, 48 bytes; symbols are ids into the journal's symbol table
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<i8'),        # epoch nanoseconds
+    ('symbol_id', '<u4'),
+    ('reserved', '<u4'),
+    ('price', '<f8'),
+    ('volume', '<i8'),
+    ('change', '<f8'),
+    ('change_percent', '<f8'),
+])
+
+_HEADER = struct.Struct('<8sHHIq')  # magic, version, record size, reserved, created (epoch ns)
+
+
+def _segment_index(name: str) -> Optional[int]:
+    stem, suffix = os.path.splitext(name)
+    return int(stem) if suffix == SEGMENT_SUFFIX and stem.isdigit() else None
+
+
+def list_segments(directory: str) -> List[str]:
+    """Segment paths of a journal in write order"""
+    if not os.path.isdir(directory):
+        return []
+    names = [name for name in os.listdir(directory) if _segment_index(name) is not None]
+    return [os.path.join(directory, name) for name in sorted(names, key=_segment_index)]
+
+
+def read_symbols(directory: str) -> List[Optional[str]]:
+    """Symbol table of a journal; '' (ticks without a symbol) maps to None"""
+    path = os.path.join(directory, SYMBOLS_FILE)
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [line.rstrip('\n') or None for line in f]
+
+
+class TickJournal:
+    """
+    Writes ticks to an append-only segmented binary journal
+
+    Ticks are packed into fixed-width records and staged in a preallocated
+    batch; a batch is written with one write() call when it fills, when
+    its oldest tick is older than max_delay, or on flush(). A timer armed
+    when the first tick of a batch is staged enforces max_delay even if
+    no further ticks arrive. Segments roll
+    over after segment_records records, and a writer never reopens an
+    existing segment, so a crash can at most leave a torn record at the
+    end of the last segment, which readers ignore.
+
+    fsync_interval controls durability: None leaves flushing to disk to the
+    OS, 0 fsyncs every written batch, and a positive value fsyncs at most
+    that often (in seconds).
+    """
+
+    def __init__(self, directory: str, segment_records: int = 1 << 20, batch_size: int = 4096,
+                 max_delay: float = 1.0, fsync_interval: Optional[float] = None):
+        """
+        Args:
+            directory: Journal directory (created if missing)
+            segment_records: Records per segment file
+            batch_size: Records staged in memory before a write
+            max_delay: Seconds a staged tick may wait before the batch is written
+            fsync_interval: Seconds between fsyncs (None: never, 0: every batch)
+        """
+        self.directory = directory
+        self.segment_records = segment_records
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.fsync_interval = fsync_interval
+
+        os.makedirs(directory, exist_ok=True)
+        self.symbols = read_symbols(directory)
+        self._symbol_ids = {symbol: index for index, symbol in enumerate(self.symbols)}
+        self._symbols_file = open(os.path.join(directory, SYMBOLS_FILE), 'a')
+
+        self._batch = np.zeros(batch_size, dtype=RECORD_DTYPE)
+        self._staged = 0
+        self._staged_since = 0.0
+        self._lock = threading.Lock()
+        self._timer = None
+        self._closed = False
+        self._file = None
+        self._segment_written = 0
+        self._last_fsync = time.monotonic()
+        existing = [_segment_index(os.path.basename(path)) for path in list_segments(directory)]
+        self._next_segment = max(existing, default=-1) + 1
+
+        self.records_written = 0
+        self.batches_written = 0
+        self.fsyncs = 0
+        self.segments_opened = 0
+
+    def _symbol_id(self, symbol: Optional[str]) -> int:
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            # Written before any record that refers to it
+            symbol_id = len(self.symbols)
+            self.symbols.append(symbol)
+            self._symbol_ids[symbol] = symbol_id
+            self._symbols_file.write(f"{symbol or ''}\n")
+            self._symbols_file.flush()
+            if self.fsync_interval is not None:
+                os.fsync(self._symbols_file.fileno())
+        return symbol_id
+
+    def append(self, tick: Tick):
+        """Stage one tick (also usable directly as a collector callback)"""
+        with self._lock:
+            if not self._staged:
+                self._staged_since = time.monotonic()
+                self._arm_timer(self.max_delay)
+            self._batch[self._staged] = (tick.timestamp, self._symbol_id(tick.symbol), 0, tick.price,
+                                         tick.volume, tick.change, tick.change_percent)
+            self._staged += 1
+            if self._staged == self.batch_size or time.monotonic() - self._staged_since >= self.max_delay:
+                self._write_batch()
+
+    on_tick = append
+
+    def extend(self, ticks: Sequence[Tick]):
+        """Stage a batch of ticks with one vectorized copy per column"""
+        if not ticks:
+            return
+        records = np.empty(len(ticks), dtype=RECORD_DTYPE)
+        with self._lock:
+            records['symbol_id'] = [self._symbol_id(tick.symbol) for tick in ticks]
+            records['reserved'] = 0
+            records['timestamp'] = [tick.timestamp for tick in ticks]
+            records['price'] = [tick.price for tick in ticks]
+            records['volume'] = [tick.volume for tick in ticks]
+            records['change'] = [tick.change for tick in ticks]
+            records['change_percent'] = [tick.change_percent for tick in ticks]
+            self._stage_records(records)
+
+    def _stage_records(self, records: np.ndarray):
+        if not self._staged:
+            self._staged_since = time.monotonic()
+            self._arm_timer(self.max_delay)
+        position = 0
+        while position < len(records):
+            count = min(self.batch_size - self._staged, len(records) - position)
+            self._batch[self._staged:self._staged + count] = records[position:position + count]
+            self._staged += count
+            position += count
+            if self._staged == self.batch_size:
+                self._write_batch()
+        if self._staged and time.monotonic() - self._staged_since >= self.max_delay:
+            self._write_batch()
+
+    def _arm_timer(self, delay: float):
+        """Flush the staged batch after delay seconds unless a timer is pending (caller holds the lock)"""
+        if self._timer is not None or self._closed:
+            return
+        self._timer = threading.Timer(max(delay, 0.0), self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+            if not self._staged or self._closed:
+                return
+            # The batch that armed this timer may have been written; a newer one gets the rest of its delay
+            remaining = self.max_delay - (time.monotonic() - self._staged_since)
+            if remaining <= 0:
+                self._write_batch()
+            else:
+                self._arm_timer(remaining)
+
+    def _open_segment(self):
+        if self._file is not None:
+            self._file.close()
+        path = os.path.join(self.directory, f"{self._next_segment:06d}{SEGMENT_SUFFIX}")
+        self._next_segment += 1
+        self._file = open(path, 'xb')
+        header = _HEADER.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize, 0, time.time_ns())
+        self._file.write(header.ljust(HEADER_SIZE, b'\0'))
+        self._segment_written = 0
+        self.segments_opened += 1
+
+    def _write_batch(self):
+        """Write the staged records, rolling segments as needed (caller holds the lock)"""
+        t = METRICS.start()
+        position = 0
+        while position < self._staged:
+            if self._file is None or self._segment_written == self.segment_records:
+                self._open_segment()
+            count = min(self._staged - position, self.segment_records - self._segment_written)
+            self._file.write(self._batch[position:position + count].tobytes())
+            self._segment_written += count
+            position += count
+        self._file.flush()
+        self.records_written += self._staged
+        self.batches_written += 1
+        self._staged = 0
+
+        now = time.monotonic()
+        if self.fsync_interval is not None and now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+            self.fsyncs += 1
+        METRICS.lap('journal_write', t)
+
+    def flush(self, fsync: bool = False):
+        """Write staged ticks now, optionally forcing them to disk"""
+        with self._lock:
+            if self._staged:
+                self._write_batch()
+            if fsync and self._file is not None:
+                os.fsync(self._file.fileno())
+                self.fsyncs += 1
+
+    def close(self):
+        """Write staged ticks and close the current segment"""
+        self.flush(fsync=self.fsync_interval is not None)
+        with self._lock:
+            self._closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._symbols_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def get_stats(self) -> Dict:
+        return {
+            'records_written': self.records_written,
+            'records_staged': self._staged,
+            'batches_written': self.batches_written,
+            'fsyncs': self.fsyncs,
+            'segments_opened': self.segments_opened,
+            'symbols': len(self.symbols),
+        }
+
+
+class TickJournalReader:
+    """
+    Memory-mapped reads of a tick journal
+
+    Each segment is mapped as an array of records; batches are views into
+    the maps, so reading does no per-tick work. Segments are re-mapped at
+    the start of every iter_batches()/read() (or by refresh()), so records
+    written by a live writer show up once their batch has been written;
+    len() and symbols reflect the last mapping. A torn trailing record is
+    ignored.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: Journal directory written by TickJournal
+        """
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"No tick journal at {directory}")
+        self.directory = directory
+        self.refresh()
+
+    def refresh(self):
+        """Re-read the symbol table and re-map the segments to pick up newly written records"""
+        self.symbols = read_symbols(self.directory)
+        self.segments = [segment for segment in (self._map(path) for path in list_segments(self.directory))
+                         if segment is not None]
+
+    @staticmethod
+    def _map(path: str) -> Optional[np.ndarray]:
+        with open(path, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            return None
+        magic, version, record_size, _, _ = _HEADER.unpack_from(header)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_DTYPE.itemsize:
+            raise ValueError(f"{path} is not a version {VERSION} tick journal segment")
+        count = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+        if not count:
+            return None
+        return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
+
+    def __len__(self):
+        return sum(len(segment) for segment in self.segments)
+
+    def symbol_ids(self, symbols: Sequence[str]) -> np.ndarray:
+        """Ids of the given symbols (symbols never journaled are left out)"""
+        wanted = set(symbols)
+        return np.array([index for index, symbol in enumerate(self.symbols) if symbol in wanted], dtype=np.uint32)
+
+    def iter_batches(self, batch_size: int = 65536, start: Optional[int] = None, end: Optional[int] = None,
+                     symbols: Optional[Sequence[str]] = None) -> Iterator[np.ndarray]:
+        """
+        Records in write order, in batches
+
+        Args:
+            batch_size: Records per batch
+            start: First timestamp (epoch ns, inclusive)
+            end: Last timestamp (epoch ns, exclusive)
+            symbols: Only these symbols
+
+        Yields:
+            Structured arrays of RECORD_DTYPE (views unless filtered)
+        """
+        self.refresh()
+        wanted = self.symbol_ids(symbols) if symbols is not None else None
+        for segment in self.segments:
+            for position in range(0, len(segment), batch_size):
+                batch = segment[position:position + batch_size]
+                if start is not None or end is not None or wanted is not None:
+                    keep = np.ones(len(batch), dtype=bool)
+                    if start is not None:
+                        keep &= batch['timestamp'] >= start
+                    if end is not None:
+                        keep &= batch['timestamp'] < end
+                    if wanted is not None:
+                        keep &= np.isin(batch['symbol_id'], wanted)
+                    batch = batch[keep]
+                if len(batch):
+                    yield batch
+
+    def read(self, start: Optional[int] = None, end: Optional[int] = None,
+             symbols: Optional[Sequence[str]] = None) -> np.ndarray:
+        """All matching records as one array"""
+        batches = list(self.iter_batches(start=start, end=end, symbols=symbols))
+        return np.concatenate(batches) if batches else np.empty(0, dtype=RECORD_DTYPE)
+
+    def to_ticks(self, records: np.ndarray) -> List[Tick]:
+        """Tick objects for a batch of records"""
+        symbols = self.symbols
+        return [
+            Tick(symbols[symbol_id], timestamp, price, volume, change, change_percent)
+            for timestamp, symbol_id, price, volume, change, change_percent in zip(
+                records['timestamp'].tolist(), records['symbol_id'].tolist(), records['price'].tolist(),
+                records['volume'].tolist(), records['change'].tolist(), records['change_percent'].tolist()
+            )
+        ]
+
+
+def columns(records: np.ndarray) -> Dict[str, np.ndarray]:
+    """Tick columns of a record batch, in the TickRingBuffer layout"""
+    return {name: records[name] for name in ('timestamp', 'price', 'volume', 'change', 'change_percent')}
+
+
+class TickReplay:
+    """
+    Streams journaled ticks back through a collector's buffer and callbacks
+
+    speed=1.0 replays at the recorded pace, speed=N at N times that pace,
+    and speed=None as fast as possible. Pacing follows the recorded
+    timestamps: ticks are released in groups once their scheduled wall
+    time has passed, so a fast replay is never slowed by per-tick sleeps.
+
+    Released ticks are written to the ring buffer with one write per
+    column, passed as record arrays to batch callbacks, and, when the
+    dispatcher has subscribers, published one Tick at a time just as the
+    live stream publishes them. Subscribers in exclude (such as the
+    journal recording the live stream) are skipped, so a replay is not
+    written back into a journal.
+    """
+
+    def __init__(self, journal, buffer=None, dispatcher: Optional[CallbackDispatcher] = None,
+                 speed: Optional[float] = None, start: Optional[int] = None, end: Optional[int] = None,
+                 symbols: Optional[Sequence[str]] = None, batch_size: int = 65536,
+                 exclude: Sequence = ()):
+        """
+        Args:
+            journal: Journal directory or TickJournalReader
+            buffer: TickRingBuffer that receives the replayed ticks
+            dispatcher: Dispatcher whose subscribers receive Tick objects
+            speed: Replay speed relative to the recording (None: as fast as possible)
+            start: First timestamp to replay (epoch ns)
+            end: Timestamp to stop at (epoch ns, exclusive)
+            symbols: Only replay these symbols
+            batch_size: Records read from the journal at a time
+            exclude: Dispatcher subscribers that do not receive replayed ticks
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive (or None for as fast as possible)")
+        self.reader = journal if isinstance(journal, TickJournalReader) else TickJournalReader(journal)
+        self.buffer = buffer
+        self.dispatcher = dispatcher
+        self.speed = speed
+        self.start_ns = start
+        self.end_ns = end
+        self.symbols = symbols
+        self.batch_size = batch_size
+        self.exclude = list(exclude)
+        self.batch_callbacks: List[Callable[[np.ndarray], None]] = []
+
+        self.replayed = 0
+        self.elapsed = 0.0
+        self._stopping = False
+        self._thread = None
+
+    def add_batch_callback(self, callback: Callable[[np.ndarray], None]):
+        """Receive replayed records as structured arrays, one call per released group"""
+        self.batch_callbacks.append(callback)
+
+    def _emit(self, records: np.ndarray):
+        if self.buffer is not None:
+            self.buffer.extend_columns(columns(records))
+        for callback in self.batch_callbacks:
+            callback(records)
+        if self.dispatcher is not None:
+            subscribers = [subscriber for subscriber in self.dispatcher.subscribers
+                           if subscriber not in self.exclude]
+            if subscribers:
+                for tick in self.reader.to_ticks(records):
+                    for subscriber in subscribers:
+                        subscriber.put(tick)
+        self.replayed += len(records)
+
+    def run(self) -> Dict:
+        """Replay until the journal (or the time range) is exhausted or stop() is called"""
+        self._stopping = False
+        started = time.perf_counter()
+        first = None
+        for batch in self.reader.iter_batches(self.batch_size, self.start_ns, self.end_ns, self.symbols):
+            if self._stopping:
+                break
+            if self.speed is None:
+                self._emit(batch)
+                continue
+
+            # Scheduled wall time of each tick; the running max keeps it sorted if the clock stepped back
+            timestamps = np.maximum.accumulate(batch['timestamp'])
+            if first is None:
+                first = int(timestamps[0])
+            due = started + (timestamps - first) / (1e9 * self.speed)
+            position = 0
+            while position < len(batch) and not self._stopping:
+                now = time.perf_counter()
+                ready = int(np.searchsorted(due, now, side='right'))
+                if ready > position:
+                    self._emit(batch[position:ready])
+                    position = ready
+                else:
+                    time.sleep(min(due[position] - now, 0.05))
+
+        self.elapsed = time.perf_counter() - started
+        METRICS.increment('replayed_ticks', self.replayed)
+        return self.get_stats()
+
+    def start(self) -> threading.Thread:
+        """Replay on a background thread"""
+        self._thread = threading.Thread(target=self.run, name='tick-replay', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        self._stopping = True
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def get_stats(self) -> Dict:
+        return {
+            'replayed': self.replayed,
+            'elapsed': self.elapsed,
+            'ticks_per_sec': self.replayed / self.elapsed if self.elapsed > 0 else 0.0,
+        }
+
+
+def benchmark_journal(directory: str, num_ticks: int = 5_000_000, num_symbols: int = 50) -> Dict:
+    """
+    Write and replay rate of the journal
+
+    Args:
+        directory: Empty directory for the benchmark journal
+        num_ticks: Ticks written and replayed
+        num_symbols: Distinct symbols
+
+    Returns:
+        Dictionary with ticks/sec for writing, raw reads and buffered replay
+    """
+    from data_collection.tick_buffer import TickRingBuffer
+
+    rng = np.random.default_rng(0)
+    results = {'num_ticks': num_ticks}
+    ticks = [Tick(f"SYM{i % num_symbols}", 1_700_000_000_000_000_000 + i * 1000, 100 + rng.random(), 100)
+             for i in range(100_000)]
+
+    with TickJournal(directory) as journal:
+        started = time.perf_counter()
+        for offset in range(0, num_ticks, len(ticks)):
+            journal.extend(ticks[:num_ticks - offset])
+    results['write_ticks_per_sec'] = num_ticks / (time.perf_counter() - started)
+
+    reader = TickJournalReader(directory)
+    started = time.perf_counter()
+    total = 0.0
+    for batch in reader.iter_batches():
+        total += batch['price'].sum()
+    results['read_ticks_per_sec'] = num_ticks / (time.perf_counter() - started)
+
+    replay = TickReplay(reader, buffer=TickRingBuffer(100000))
+    results['replay_ticks_per_sec'] = replay.run()['ticks_per_sec']
+    return results
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, value in benchmark_journal(os.path.join(tmp, 'journal')).items():
+            print(f"{name}: {value:,.2f}" if isinstance(value, float) else f"{name}: {value}")
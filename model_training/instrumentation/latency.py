@@ -0,0 +1,232 @@
+"""
+Latency Instrumentation
+Per-stage latency histograms and counters for the tick-to-signal path
+"""
+
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of nanosecond latencies
+
+    Buckets are linear within each power of two (2**sub_bucket_bits per
+    octave), so every recorded value keeps a relative error below
+    2**-(sub_bucket_bits - 1) across the whole range with a fixed, small
+    number of counters.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 7):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half_count = self.sub_bucket_count >> 1
+        # 64 octaves cover any int64 nanosecond value
+        self.counts = [0] * (self.sub_bucket_count + 64 * self.half_count)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self._lock = threading.Lock()
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return self.sub_bucket_count + (shift - 1) * self.half_count + (value >> shift) - self.half_count
+
+    def _value(self, index: int) -> int:
+        """Upper bound of the values counted in a bucket"""
+        if index < self.sub_bucket_count:
+            return index
+        shift, offset = divmod(index - self.sub_bucket_count, self.half_count)
+        shift += 1
+        return ((offset + self.half_count + 1) << shift) - 1
+
+    def record(self, value: int):
+        """Record one latency in nanoseconds"""
+        value = max(int(value), 0)
+        index = self._index(value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+            if self.min is None or value < self.min:
+                self.min = value
+
+    def percentile(self, q: float) -> int:
+        """Latency in nanoseconds at quantile q (0-1)"""
+        with self._lock:
+            if not self.count:
+                return 0
+            target = max(1, int(q * self.count + 0.5))
+            seen = 0
+            for index, bucket in enumerate(self.counts):
+                seen += bucket
+                if seen >= target:
+                    return min(self._value(index), self.max)
+            return self.max
+
+    def snapshot(self) -> Dict:
+        """Count, mean, min, max and percentiles in microseconds"""
+        snapshot = {
+            'count': self.count,
+            'mean_us': self.total / self.count / 1e3 if self.count else 0.0,
+            'min_us': (self.min or 0) / 1e3,
+            'max_us': self.max / 1e3,
+        }
+        for q in QUANTILES:
+            snapshot[f'p{q * 100:g}_us'] = self.percentile(q) / 1e3
+        return snapshot
+
+
+class StageMetrics:
+    """
+    Registry of per-stage latency histograms and event counters
+
+    Hot paths use start()/lap(): when disabled, start() returns 0 and lap()
+    returns immediately, so instrumentation costs two trivial calls.
+
+        t = METRICS.start()
+        ticks = decoder.decode(message)
+        t = METRICS.lap('decode', t)
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server = None
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Drop every recorded latency and counter"""
+        with self._lock:
+            self.histograms = {}
+            self.counters = {}
+
+    def start(self) -> int:
+        """Timestamp for lap(), or 0 when disabled"""
+        return time.perf_counter_ns() if self.enabled else 0
+
+    def lap(self, stage: str, start: int) -> int:
+        """Record the time since start under stage and return now for the next stage"""
+        if not start:
+            return 0
+        now = time.perf_counter_ns()
+        self.record(stage, now - start)
+        return now
+
+    def record(self, stage: str, nanoseconds: int):
+        """Record a latency for a stage"""
+        try:
+            histogram = self.histograms[stage]
+        except KeyError:
+            with self._lock:
+                histogram = self.histograms.setdefault(stage, LatencyHistogram())
+        histogram.record(nanoseconds)
+
+    def increment(self, name: str, amount: int = 1):
+        """Add to an event counter (no-op when disabled)"""
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + amount
+
+    def timer(self, stage: str) -> '_StageTimer':
+        """Context manager timing a block under stage"""
+        return _StageTimer(self, stage)
+
+    def snapshot(self) -> Dict:
+        """Per-stage histogram summaries and counters"""
+        with self._lock:
+            histograms = dict(self.histograms)
+            counters = dict(self.counters)
+        return {
+            'stages': {stage: histogram.snapshot() for stage, histogram in sorted(histograms.items())},
+            'counters': counters,
+        }
+
+    def to_prometheus(self, prefix: str = 'trading') -> str:
+        """Prometheus text exposition: a latency summary per stage plus counters"""
+        with self._lock:
+            histograms = dict(self.histograms)
+            counters = dict(self.counters)
+
+        name = f'{prefix}_stage_latency_seconds'
+        lines = [
+            f'# HELP {name} Latency of each tick-to-signal stage',
+            f'# TYPE {name} summary',
+        ]
+        for stage, histogram in sorted(histograms.items()):
+            for q in QUANTILES:
+                lines.append(f'{name}{{stage="{stage}",quantile="{q:g}"}} {histogram.percentile(q) / 1e9:.9g}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.total / 1e9:.9g}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+
+        name = f'{prefix}_events_total'
+        lines += [f'# HELP {name} Events counted on the hot path', f'# TYPE {name} counter']
+        for counter, value in sorted(counters.items()):
+            lines.append(f'{name}{{name="{counter}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def serve_prometheus(self, port: int = 9108, host: str = '0.0.0.0') -> ThreadingHTTPServer:
+        """Serve to_prometheus() on http://host:port/metrics from a background thread"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server
+
+    def stop_server(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+
+
+class _StageTimer:
+    __slots__ = ('metrics', 'stage', 'started')
+
+    def __init__(self, metrics: StageMetrics, stage: str):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = self.metrics.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.lap(self.stage, self.started)
+        return False
+
+
+# Process-wide registry; set TRADING_METRICS=1 to enable at startup
+METRICS = StageMetrics(enabled=os.environ.get('TRADING_METRICS', '0') not in ('', '0'))
+
+
+def get_metrics() -> StageMetrics:
+    return METRICS
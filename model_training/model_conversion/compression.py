@@ -0,0 +1,216 @@
+"""
+Model Compression
+Magnitude pruning and weight clustering with brief fine-tuning, before TFLite export
+"""
+
+import gzip
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from tensorflow import keras
+
+# Weight matrices that are pruned and clustered; biases and normalization stay dense
+COMPRESSIBLE_WEIGHTS = ('kernel', 'recurrent_kernel')
+
+
+def compressible_weights(model: keras.Model) -> List:
+    """Kernel variables of every Dense, Conv1D and LSTM layer"""
+    return [weight for weight in model.trainable_weights if weight.name in COMPRESSIBLE_WEIGHTS]
+
+
+def weight_sparsity(model: keras.Model) -> Dict:
+    """Fraction of zeros in each compressible weight and overall"""
+    layers = {}
+    zeros = total = 0
+    for weight in compressible_weights(model):
+        values = np.asarray(weight.numpy())
+        layer_zeros = int(np.count_nonzero(values == 0))
+        layers[weight.path] = layer_zeros / values.size
+        zeros += layer_zeros
+        total += values.size
+    return {'overall': zeros / total if total else 0.0, 'layers': layers}
+
+
+def unique_weight_counts(model: keras.Model) -> Dict[str, int]:
+    """Distinct values per compressible weight (at most num_clusters (+1 for zero) once clustered)"""
+    return {weight.path: int(len(np.unique(weight.numpy()))) for weight in compressible_weights(model)}
+
+
+def gzipped_size(data: bytes) -> int:
+    """Size after gzip; zeros and shared cluster values only shrink a flatbuffer once compressed"""
+    return len(gzip.compress(bytes(data), compresslevel=9))
+
+
+def polynomial_sparsity(step: int, target_sparsity: float, begin_step: int, end_step: int,
+                        initial_sparsity: float = 0.0, power: int = 3) -> float:
+    """Sparsity ramp from initial to target between begin_step and end_step (tfmot's PolynomialDecay)"""
+    if step <= begin_step:
+        return initial_sparsity
+    progress = min(1.0, (step - begin_step) / max(1, end_step - begin_step))
+    return target_sparsity + (initial_sparsity - target_sparsity) * (1 - progress) ** power
+
+
+class MagnitudePruning(keras.callbacks.Callback):
+    """
+    Zeroes the smallest-magnitude kernel weights while the model trains
+
+    Every frequency steps the masks are recomputed for the scheduled
+    sparsity; after every step the masks are re-applied, so weights the
+    optimizer moves stay pruned.
+    """
+
+    def __init__(self, target_sparsity: float = 0.5, end_step: int = 1000, begin_step: int = 0,
+                 initial_sparsity: float = 0.0, frequency: int = 10):
+        """
+        Args:
+            target_sparsity: Fraction of each kernel set to zero at end_step
+            end_step: Step at which target_sparsity is reached
+            begin_step: Step at which pruning starts
+            initial_sparsity: Sparsity at begin_step
+            frequency: Steps between mask updates
+        """
+        super().__init__()
+        self.target_sparsity = target_sparsity
+        self.end_step = end_step
+        self.begin_step = begin_step
+        self.initial_sparsity = initial_sparsity
+        self.frequency = frequency
+        self.step = 0
+        self.masks: Dict[str, np.ndarray] = {}
+
+    def _update_masks(self, sparsity: float):
+        for weight in compressible_weights(self.model):
+            magnitudes = np.abs(weight.numpy()).ravel()
+            num_pruned = int(sparsity * magnitudes.size)
+            mask = np.ones(magnitudes.size, dtype=bool)
+            if num_pruned:
+                mask[np.argpartition(magnitudes, num_pruned - 1)[:num_pruned]] = False
+            self.masks[weight.path] = mask.reshape(weight.shape)
+
+    def _apply_masks(self):
+        for weight in compressible_weights(self.model):
+            mask = self.masks.get(weight.path)
+            if mask is not None:
+                weight.assign(np.where(mask, weight.numpy(), 0).astype(weight.dtype))
+
+    def on_train_batch_end(self, batch, logs=None):
+        self.step += 1
+        if self.step >= self.begin_step and (self.step % self.frequency == 0 or self.step == self.end_step):
+            self._update_masks(polynomial_sparsity(self.step, self.target_sparsity, self.begin_step,
+                                                   self.end_step, self.initial_sparsity))
+        self._apply_masks()
+
+    def on_train_end(self, logs=None):
+        self._update_masks(polynomial_sparsity(self.step, self.target_sparsity, self.begin_step,
+                                               self.end_step, self.initial_sparsity))
+        self._apply_masks()
+
+
+def _nearest(values: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the nearest centroid for each value (centroids sorted)"""
+    midpoints = (centroids[1:] + centroids[:-1]) / 2
+    return np.searchsorted(midpoints, values)
+
+
+class WeightClustering(keras.callbacks.Callback):
+    """
+    Shares each kernel's weights among num_clusters centroids
+
+    Centroids start evenly spaced over the weight range and are refined
+    with k-means. After every training step, weights are reassigned to the
+    nearest centroid, each centroid moves to the mean of its members, and
+    the weights are replaced by their centroid. Zeros from pruning stay
+    zero (sparsity-preserving clustering).
+    """
+
+    def __init__(self, num_clusters: int = 16, preserve_sparsity: bool = True, kmeans_iterations: int = 10):
+        """
+        Args:
+            num_clusters: Distinct non-zero values per kernel
+            preserve_sparsity: Keep zero weights at zero
+            kmeans_iterations: Refinement iterations for the initial centroids
+        """
+        super().__init__()
+        self.num_clusters = num_clusters
+        self.preserve_sparsity = preserve_sparsity
+        self.kmeans_iterations = kmeans_iterations
+        self.centroids: Dict[str, np.ndarray] = {}
+        self.active: Dict[str, np.ndarray] = {}
+
+    def _cluster(self, weight, iterations: int):
+        values = weight.numpy()
+        flat = values.ravel()
+        # The sparsity pattern is fixed when training starts; the optimizer would otherwise revive pruned weights
+        active = self.active.get(weight.path)
+        if active is None:
+            active = flat != 0 if self.preserve_sparsity else np.ones(flat.size, dtype=bool)
+            self.active[weight.path] = active
+        members = flat[active]
+        if not members.size:
+            return
+        centroids = self.centroids.get(weight.path)
+        if centroids is None:
+            centroids = np.linspace(members.min(), members.max(), self.num_clusters)
+        for _ in range(iterations):
+            assignment = _nearest(members, centroids)
+            sums = np.bincount(assignment, weights=members, minlength=len(centroids))
+            counts = np.bincount(assignment, minlength=len(centroids))
+            centroids = np.where(counts > 0, sums / np.maximum(counts, 1), centroids)
+            centroids.sort()
+        self.centroids[weight.path] = centroids
+        clustered = np.zeros_like(flat)
+        clustered[active] = centroids[_nearest(members, centroids)]
+        weight.assign(clustered.reshape(values.shape).astype(values.dtype))
+
+    def on_train_begin(self, logs=None):
+        for weight in compressible_weights(self.model):
+            self._cluster(weight, self.kmeans_iterations)
+
+    def on_train_batch_end(self, batch, logs=None):
+        for weight in compressible_weights(self.model):
+            self._cluster(weight, 1)
+
+
+def compress_model(model: keras.Model, X: np.ndarray, y: np.ndarray, prune: bool = True,
+                   target_sparsity: float = 0.5, cluster: bool = False, num_clusters: int = 16,
+                   epochs: int = 2, batch_size: int = 64, learning_rate: float = 1e-4,
+                   validation_data: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> keras.Model:
+    """
+    Prune and/or cluster a copy of a trained model, fine-tuning briefly for each stage
+
+    The returned model is a plain Keras model (no wrapper layers), so it
+    converts to TFLite like the dense one.
+
+    Args:
+        model: Trained dense model (left unchanged)
+        X: Training windows (N, seq_length, features)
+        y: Training labels
+        prune: Apply magnitude pruning
+        target_sparsity: Fraction of kernel weights set to zero
+        cluster: Apply weight clustering (after pruning, preserving its zeros)
+        num_clusters: Distinct non-zero values per kernel
+        epochs: Fine-tuning epochs per stage
+        batch_size: Fine-tuning batch size
+        learning_rate: Fine-tuning learning rate (small, the model is already trained)
+        validation_data: Optional (X, y) reported during fine-tuning
+    """
+    from model_development.train_trading_model import WindowBatchSequence
+
+    compressed = keras.models.clone_model(model)
+    compressed.set_weights(model.get_weights())
+    compressed.compile(optimizer=keras.optimizers.Adam(learning_rate=learning_rate),
+                       loss='sparse_categorical_crossentropy', metrics=['accuracy'])
+    batches = WindowBatchSequence(X, y, batch_size, shuffle=True)
+    validation = WindowBatchSequence(*validation_data, batch_size) if validation_data is not None else None
+
+    if prune:
+        # Reach the target sparsity two thirds of the way in, then recover at that sparsity
+        end_step = max(1, int(len(batches) * epochs * 2 / 3))
+        pruning = MagnitudePruning(target_sparsity, end_step=end_step, frequency=max(1, end_step // 20))
+        print(f"Pruning to {target_sparsity:.0%} sparsity over {end_step} steps...")
+        compressed.fit(batches, epochs=epochs, validation_data=validation, verbose=1, callbacks=[pruning])
+    if cluster:
+        print(f"Clustering kernels into {num_clusters} centroids...")
+        clustering = WeightClustering(num_clusters, preserve_sparsity=prune)
+        compressed.fit(batches, epochs=epochs, validation_data=validation, verbose=1, callbacks=[clustering])
+    return compressed
@@ -3,12 +3,46 @@ Model Conversion Script
 Converts trained TensorFlow models to TensorFlow Lite format with optimization
 """
 
+import argparse
+import json
 import tensorflow as tf
 import numpy as np
 import os
+import time
 from tensorflow import keras
-# from tensorflow_model_optimization import quantization
-# from tensorflow_model_optimization.sparsity import keras as sparsity
+from typing import Dict, List, Tuple
+
+from instrumentation.latency import METRICS
+from model_conversion.compression import compress_model, gzipped_size, weight_sparsity
+from model_conversion.scoring_engine import TFLiteScoringEngine
+from model_development.model_artifact import ModelArtifact, is_artifact, write_artifact
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'models')
+
+
+def builtin_convertible(model: keras.Model) -> keras.Model:
+    """
+    Copy of a model that converts to TFLite builtin ops only
+    
+    Keras 3 LSTM layers trace to a while loop over tensor lists, which only
+    converts with Flex (SELECT_TF_OPS) ops that tf.lite.Interpreter cannot
+    run, and which full-INT8 conversion cannot lower at all. Unrolled over
+    the fixed window length, they become plain FULLY_CONNECTED and
+    elementwise ops with identical outputs and a resizable batch dimension.
+    Models without recurrent layers are returned as they are.
+    """
+    if not any(isinstance(layer, keras.layers.RNN) and not layer.unroll for layer in model.layers):
+        return model
+    
+    def unrolled(layer):
+        config = layer.get_config()
+        if isinstance(layer, keras.layers.RNN):
+            config['unroll'] = True
+        return layer.__class__.from_config(config)
+    
+    copy = keras.models.clone_model(model, clone_function=unrolled)
+    copy.set_weights(model.get_weights())
+    return copy
 
 
 class ModelConverter:
@@ -17,19 +51,22 @@ class ModelConverter:
     def __init__(self, model_path: str):
         self.model_path = model_path
         self.model = None
+        self.artifact = None
     
     def load_model(self):
-        """Load the trained model"""
-        self.model = keras.models.load_model(self.model_path)
+        """Load the trained model (a model artifact, or a plain Keras file)"""
+        if is_artifact(self.model_path):
+            self.artifact = ModelArtifact(self.model_path, verify=True)
+            self.model = self.artifact.load_keras_model()
+        else:
+            self.model = keras.models.load_model(self.model_path)
         print(f"Model loaded from {self.model_path}")
         print(f"Model input shape: {self.model.input_shape}")
         print(f"Model output shape: {self.model.output_shape}")
     
     def convert_to_tflite_basic(self, output_path: str):
         """Convert model to basic TensorFlow Lite format"""
-        converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
-        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS, tf.lite.OpsSet.SELECT_TF_OPS]
-        converter._experimental_lower_tensor_list_ops = False
+        converter = tf.lite.TFLiteConverter.from_keras_model(builtin_convertible(self.model))
         tflite_model = converter.convert()
         
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
@@ -38,6 +75,8 @@ class ModelConverter:
         
         print(f"Basic TFLite model saved to {output_path}")
         print(f"Model size: {len(tflite_model) / 1024:.2f} KB")
+        
+        return tflite_model
     
     def convert_to_tflite_quantized(self, output_path: str, quantization_type: str = "dynamic"):
         """
@@ -47,7 +86,7 @@ class ModelConverter:
             output_path: Output file path
             quantization_type: 'dynamic', 'float16', or 'int8'
         """
-        converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+        converter = tf.lite.TFLiteConverter.from_keras_model(builtin_convertible(self.model))
         
         if quantization_type == "dynamic":
             converter.optimizations = [tf.lite.Optimize.DEFAULT]
@@ -79,7 +118,7 @@ class ModelConverter:
             output_path: Output file path
             representative_dataset: Generator function providing representative samples
         """
-        converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+        converter = tf.lite.TFLiteConverter.from_keras_model(builtin_convertible(self.model))
         converter.optimizations = [tf.lite.Optimize.DEFAULT]
         converter.representative_dataset = representative_dataset
         converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
@@ -116,7 +155,8 @@ class ModelConverter:
         interpreter.set_tensor(input_details[0]['index'], test_input.astype(np.float32))
         
         # Run inference
-        interpreter.invoke()
+        with METRICS.timer('interpreter_invoke'):
+            interpreter.invoke()
         
         # Get output
         output_data = interpreter.get_tensor(output_details[0]['index'])
@@ -127,28 +167,358 @@ class ModelConverter:
         print(f"Output: {output_data}")
         
         return output_data
+    
+    def export_artifact(self, tflite_model: bytes, output_path: str, quantization: str = "none",
+                        extra: Dict = None) -> str:
+        """
+        Package a converted TFLite model with the scaler and feature schema
+        
+        Args:
+            tflite_model: Bytes returned by one of the convert methods
+            output_path: Artifact path
+            quantization: Quantization type, recorded in the metadata
+            extra: Additional metadata (e.g. compression settings)
+        
+        Returns:
+            Content hash of the artifact
+        """
+        if self.artifact is None:
+            raise ValueError("export_artifact needs a model loaded from an artifact (for scaler and schema)")
+        sha256 = write_artifact(
+            output_path, tflite_model, 'tflite', self.artifact.scaler_mean, self.artifact.scaler_scale,
+            self.artifact.feature_columns, self.artifact.sequence_length, self.artifact.feature_params,
+            extra={'quantization': quantization, 'source_sha256': self.artifact.sha256, **(extra or {})}
+        )
+        print(f"TFLite artifact saved to {output_path} (version {sha256[:12]})")
+        return sha256
+    
+    def create_scoring_engine(self, tflite_path: str, num_workers: int = None, batch_size: int = 64,
+                              num_threads: int = 1) -> TFLiteScoringEngine:
+        """
+        Create a reusable batched scoring engine for a TFLite model
+        
+        Unlike test_tflite_model, the interpreters are built and allocated
+        once and reused for every call.
+        
+        Args:
+            tflite_path: Path to TFLite model
+            num_workers: Number of interpreters in the pool
+            batch_size: Batch dimension the interpreters are resized to
+            num_threads: Threads per interpreter
+        """
+        return TFLiteScoringEngine(tflite_path, num_workers=num_workers, batch_size=batch_size,
+                                   num_threads=num_threads)
+    
+    def build_variants(self, output_dir: str, calibration_windows: np.ndarray,
+                       num_calibration_samples: int = 200) -> Dict[str, str]:
+        """
+        Build the basic, dynamic, float16 and full-int8 TFLite variants
+        
+        Returns:
+            Variant name -> model path
+        """
+        representative_dataset = create_representative_dataset(
+            self.model.input_shape[1:], num_calibration_samples, windows=calibration_windows
+        )
+        builders = {
+            'basic': lambda path: self.convert_to_tflite_basic(path),
+            'dynamic': lambda path: self.convert_to_tflite_quantized(path, quantization_type="dynamic"),
+            'float16': lambda path: self.convert_to_tflite_quantized(path, quantization_type="float16"),
+            'int8': lambda path: self.convert_with_post_training_quantization(path, representative_dataset),
+        }
+        
+        variants = {}
+        for name, build in builders.items():
+            path = os.path.join(output_dir, f"trading_model_{name}.tflite")
+            build(path)
+            variants[name] = path
+        return variants
+    
+    def benchmark_variants(self, variants: Dict[str, str], eval_windows: np.ndarray, batch_size: int = 64,
+                           repeats: int = 50, max_eval: int = 2000) -> List[Dict]:
+        """
+        Compare TFLite variants against the Keras model
+        
+        Args:
+            variants: Variant name -> TFLite model path
+            eval_windows: Held-out scaled windows
+            batch_size: Batch size for the batched latency measurement
+            repeats: Timed invocations per latency measurement
+            max_eval: Maximum held-out windows used for agreement
+        
+        Returns:
+            One row per variant with size, load time, latencies and agreement
+        """
+        eval_windows = np.ascontiguousarray(eval_windows[-max_eval:], dtype=np.float32)
+        reference = self.model.predict(eval_windows, batch_size=batch_size, verbose=0)
+        reference_labels = reference.argmax(axis=1)
+        
+        results = []
+        for name, path in variants.items():
+            start = time.perf_counter()
+            single = TFLiteScoringEngine(path, num_workers=1, batch_size=1)
+            load_ms = (time.perf_counter() - start) * 1000
+            batched = TFLiteScoringEngine(path, num_workers=1, batch_size=batch_size)
+            
+            single_latency = _median_latency_ms(single, eval_windows[:1], repeats)
+            batch_latency = _median_latency_ms(batched, eval_windows[:batch_size], repeats)
+            outputs = batched.score(eval_windows)
+            single.close()
+            batched.close()
+            
+            results.append({
+                'variant': name,
+                'size_kb': os.path.getsize(path) / 1024,
+                'load_ms': load_ms,
+                'single_ms': single_latency,
+                'batch_ms': batch_latency,
+                'batch_per_window_ms': batch_latency / min(batch_size, len(eval_windows)),
+                'agreement': float(np.mean(outputs.argmax(axis=1) == reference_labels)),
+                'max_prob_diff': float(np.abs(outputs - reference).max()),
+            })
+        return results
+    
+    def build_compressed(self, X_train: np.ndarray, y_train: np.ndarray, target_sparsity: float = 0.5,
+                         num_clusters: int = 16, epochs: int = 2, batch_size: int = 64,
+                         learning_rate: float = 1e-4, validation_data: Tuple[np.ndarray, np.ndarray] = None
+                         ) -> 'ModelConverter':
+        """
+        Prune and/or cluster the loaded model with brief fine-tuning
+        
+        Args:
+            X_train: Scaled training windows
+            y_train: Labels for X_train
+            target_sparsity: Fraction of kernel weights pruned (0 disables pruning)
+            num_clusters: Shared values per kernel (0 disables clustering)
+            epochs: Fine-tuning epochs per stage
+            batch_size: Fine-tuning batch size
+            learning_rate: Fine-tuning learning rate
+            validation_data: Optional held-out (X, y) reported during fine-tuning
+        
+        Returns:
+            A converter holding the compressed model, sharing this converter's artifact
+        """
+        if target_sparsity <= 0 and num_clusters <= 0:
+            raise ValueError("Nothing to compress: set target_sparsity and/or num_clusters")
+        compressed = ModelConverter(self.model_path)
+        compressed.artifact = self.artifact
+        compressed.model = compress_model(
+            self.model, X_train, y_train, prune=target_sparsity > 0, target_sparsity=target_sparsity,
+            cluster=num_clusters > 0, num_clusters=num_clusters, epochs=epochs, batch_size=batch_size,
+            learning_rate=learning_rate, validation_data=validation_data
+        )
+        print(f"Kernel sparsity: {weight_sparsity(compressed.model)['overall']:.1%}")
+        return compressed
 
 
-def create_representative_dataset(model_input_shape, num_samples=100):
+def _median_latency_ms(engine: TFLiteScoringEngine, X: np.ndarray, repeats: int) -> float:
+    engine.score(X)  # warm-up
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        engine.score(X)
+        latencies.append(time.perf_counter() - start)
+    return float(np.median(latencies) * 1000)
+
+
+def print_benchmark(results: List[Dict]):
+    """Print the variant benchmark as a table"""
+    print(f"{'variant':<10}{'size KB':>10}{'load ms':>10}{'1x ms':>10}{'batch ms':>10}"
+          f"{'ms/window':>11}{'agree':>8}{'max diff':>10}")
+    for row in results:
+        print(f"{row['variant']:<10}{row['size_kb']:>10.1f}{row['load_ms']:>10.1f}{row['single_ms']:>10.3f}"
+              f"{row['batch_ms']:>10.3f}{row['batch_per_window_ms']:>11.4f}{row['agreement']:>8.3f}"
+              f"{row['max_prob_diff']:>10.4f}")
+
+
+def create_representative_dataset(model_input_shape, num_samples=100, windows: np.ndarray = None):
     """
     Create representative dataset for quantization
     
     Args:
         model_input_shape: Input shape of the model (seq_length, features)
         num_samples: Number of representative samples
+        windows: Real scaled feature windows (N, seq_length, features) to calibrate on;
+            random normal samples are used when omitted
     """
     def representative_dataset_gen():
+        if windows is not None:
+            # Spread the samples evenly over the history
+            indices = np.linspace(0, len(windows) - 1, min(num_samples, len(windows))).astype(int)
+            for i in indices:
+                yield [np.asarray(windows[i:i + 1], dtype=np.float32)]
+            return
         for _ in range(num_samples):
             # Generate random samples matching model input shape
-            yield [np.random.randn(*model_input_shape).astype(np.float32)]
+            yield [np.random.randn(1, *model_input_shape).astype(np.float32)]
     
     return representative_dataset_gen
 
 
-def main():
-    """Main conversion function"""
-    model_path = "../../models/trading_model.h5"
+def load_labelled_windows(df, artifact: ModelArtifact, holdout: float = 0.2
+                          ) -> Tuple[Tuple[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]]:
+    """
+    Build scaled feature windows and their labels from market data with the training scaler
+    
+    Args:
+        df: DataFrame with OHLCV data (plus any extra feature columns the model was trained on)
+        artifact: Model artifact holding the scaler, feature schema, feature parameters and sequence length
+        holdout: Fraction of windows, at the end, held out for evaluation
+    
+    Returns:
+        (windows, labels) for the earlier history and for the held-out latest history
+    """
+    from model_development.train_trading_model import FEATURE_COLUMNS, TradingModelTrainer
+    
+    trainer = TradingModelTrainer(feature_params=artifact.feature_params,
+                                  extra_feature_columns=artifact.feature_columns[len(FEATURE_COLUMNS):])
+    features, targets = trainer.prepare_features(df)
+    features_scaled = artifact.scaler().transform(features).astype(np.float32)
+    X, y = trainer.create_sequences((features_scaled, targets), artifact.sequence_length)
+    split = len(X) - int(np.ceil(len(X) * holdout))
+    return (X[:split], y[:split]), (X[split:], y[split:])
+
+
+def load_evaluation_windows(df, artifact: ModelArtifact, holdout: float = 0.2) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build scaled feature windows from market data with the training scaler
+    
+    Returns:
+        Calibration windows (earlier history), held-out windows (latest history)
+    """
+    (calibration, _), (held_out, _) = load_labelled_windows(df, artifact, holdout)
+    return calibration, held_out
+
+
+def run_benchmark(converter: ModelConverter, symbol: str = "AAPL", period: str = "6mo", interval: str = "1h",
+                  output_dir: str = MODELS_DIR):
+    """Build every quantization variant and benchmark it on real held-out windows"""
+    from data_collection.bar_cache import BarCache
+    from data_collection.market_data_collector import MarketDataCollector
+    
+    df = MarketDataCollector(symbol, cache=BarCache()).get_historical_data(period=period, interval=interval)
+    if df.empty:
+        print("No market data available for calibration")
+        return
+    
+    calibration, holdout = load_evaluation_windows(df, converter.artifact)
+    print(f"Calibration windows: {len(calibration)}, held-out windows: {len(holdout)}")
+    
+    variants = converter.build_variants(os.path.join(output_dir, "variants"), calibration)
+    results = converter.benchmark_variants(variants, holdout)
+    print_benchmark(results)
+    
+    results_path = os.path.join(output_dir, "variants", "benchmark.json")
+    with open(results_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Benchmark saved to {results_path}")
+
+
+def print_compression(results: List[Dict]):
+    """Print the dense vs compressed comparison as a table"""
+    print(f"{'variant':<20}{'size KB':>10}{'gzip KB':>10}{'sparsity':>10}{'1x ms':>10}{'batch ms':>10}"
+          f"{'agree':>8}{'max diff':>10}{'accuracy':>10}")
+    for row in results:
+        print(f"{row['variant']:<20}{row['size_kb']:>10.1f}{row['gzip_kb']:>10.1f}{row['sparsity']:>10.1%}"
+              f"{row['single_ms']:>10.3f}{row['batch_ms']:>10.3f}{row['agreement']:>8.3f}"
+              f"{row['max_prob_diff']:>10.4f}{row['holdout_accuracy']:>10.3f}")
+
+
+def run_compression(converter: ModelConverter, symbol: str = "AAPL", period: str = "6mo", interval: str = "1h",
+                    output_dir: str = MODELS_DIR, target_sparsity: float = 0.5, num_clusters: int = 16,
+                    fine_tune_epochs: int = 2, df=None) -> List[Dict]:
+    """
+    Prune and/or cluster the model, export it, and compare it with the dense baseline
+    
+    The compressed model is fine-tuned on the earlier history and compared
+    on the held-out latest windows: size, gzipped size, kernel sparsity,
+    TFLite latency and agreement with the dense Keras model, for the plain
+    and dynamic-range quantized conversions of both models.
     
+    Args:
+        converter: Converter with the dense model loaded from an artifact
+        symbol: Symbol used for fine-tuning and evaluation data
+        period: History used for fine-tuning and evaluation
+        interval: Bar interval
+        output_dir: Directory for the compressed models
+        target_sparsity: Fraction of kernel weights pruned (0 disables pruning)
+        num_clusters: Shared values per kernel (0 disables clustering)
+        fine_tune_epochs: Fine-tuning epochs per stage
+        df: OHLCV data to use instead of downloading symbol's history
+    
+    Returns:
+        One row per variant
+    """
+    if df is None:
+        from data_collection.bar_cache import BarCache
+        from data_collection.market_data_collector import MarketDataCollector
+        
+        df = MarketDataCollector(symbol, cache=BarCache()).get_historical_data(period=period, interval=interval)
+    if df.empty:
+        print("No market data available for fine-tuning")
+        return []
+    
+    (X_train, y_train), (X_holdout, y_holdout) = load_labelled_windows(df, converter.artifact)
+    print(f"Fine-tuning windows: {len(X_train)}, held-out windows: {len(X_holdout)}")
+    compressed = converter.build_compressed(X_train, y_train, target_sparsity=target_sparsity,
+                                            num_clusters=num_clusters, epochs=fine_tune_epochs,
+                                            validation_data=(X_holdout, y_holdout))
+    
+    compression_dir = os.path.join(output_dir, "compressed")
+    paths = {}
+    models = {}
+    for prefix, source in (('dense', converter), ('compressed', compressed)):
+        for quantization in ('none', 'dynamic'):
+            name = prefix if quantization == 'none' else f"{prefix}_{quantization}"
+            path = os.path.join(compression_dir, f"trading_model_{name}.tflite")
+            if quantization == 'none':
+                models[name] = source.convert_to_tflite_basic(path)
+            else:
+                models[name] = source.convert_to_tflite_quantized(path, quantization_type=quantization)
+            paths[name] = path
+    
+    # Agreement is measured against the dense Keras model
+    results = converter.benchmark_variants(paths, X_holdout)
+    sparsity = {'dense': weight_sparsity(converter.model)['overall'],
+                'compressed': weight_sparsity(compressed.model)['overall']}
+    for row in results:
+        row['gzip_kb'] = gzipped_size(models[row['variant']]) / 1024
+        row['sparsity'] = sparsity[row['variant'].split('_')[0]]
+        engine = TFLiteScoringEngine(paths[row['variant']], num_workers=1)
+        row['holdout_accuracy'] = float(np.mean(engine.score(X_holdout).argmax(axis=1) == y_holdout))
+        engine.close()
+    print_compression(results)
+    
+    settings = {'target_sparsity': target_sparsity, 'num_clusters': num_clusters,
+                'fine_tune_epochs': fine_tune_epochs, 'sparsity': sparsity['compressed']}
+    compressed.export_artifact(models['compressed_dynamic'],
+                               os.path.join(output_dir, "trading_model_compressed.artifact"), "dynamic",
+                               extra={'compression': settings})
+    
+    results_path = os.path.join(compression_dir, "compression.json")
+    with open(results_path, 'w') as f:
+        json.dump({'settings': settings, 'results': results}, f, indent=2)
+    print(f"Compression report saved to {results_path}")
+    return results
+
+
+def convert_model(model_path: str, output_dir: str = MODELS_DIR, benchmark: bool = False,
+                  symbol: str = "AAPL", period: str = "6mo", compress: bool = False,
+                  target_sparsity: float = 0.5, num_clusters: int = 16, fine_tune_epochs: int = 2):
+    """
+    Convert a trained model artifact to basic, dynamic and float16 TFLite models and artifacts
+    
+    Args:
+        model_path: Keras model artifact saved by TradingModelTrainer.save_model
+        output_dir: Directory for the converted models
+        benchmark: Also build every quantization variant and benchmark it on real data
+        symbol: Symbol used for calibration and evaluation data
+        period: History used for calibration and evaluation
+        compress: Also build a pruned/clustered model and compare it with the dense one
+        target_sparsity: Fraction of kernel weights pruned when compressing (0 disables pruning)
+        num_clusters: Shared values per kernel when compressing (0 disables clustering)
+        fine_tune_epochs: Fine-tuning epochs per compression stage
+    """
     if not os.path.exists(model_path):
         print(f"Model not found at {model_path}")
         print("Please train the model first using train_trading_model.py")
@@ -158,26 +528,56 @@ def main():
     converter.load_model()
     
     # Convert to basic TFLite
-    output_basic = "../../models/trading_model.tflite"
-    converter.convert_to_tflite_basic(output_basic)
+    output_basic = os.path.join(output_dir, "trading_model.tflite")
+    tflite_basic = converter.convert_to_tflite_basic(output_basic)
     
-    # # Convert to dynamic quantized TFLite (recommended for mobile)
-    # output_quantized = "../../models/trading_model_quantized.tflite"
-    # converter.convert_to_tflite_quantized(output_quantized, quantization_type="dynamic")
+    # Convert to dynamic quantized TFLite (recommended for mobile)
+    output_quantized = os.path.join(output_dir, "trading_model_quantized.tflite")
+    tflite_quantized = converter.convert_to_tflite_quantized(output_quantized, quantization_type="dynamic")
     
-    # # Convert to float16 quantized (smaller size, good accuracy)
-    # output_float16 = "../../models/trading_model_float16.tflite"
-    # converter.convert_to_tflite_quantized(output_float16, quantization_type="float16")
+    # Convert to float16 quantized (smaller size, good accuracy)
+    output_float16 = os.path.join(output_dir, "trading_model_float16.tflite")
+    tflite_float16 = converter.convert_to_tflite_quantized(output_float16, quantization_type="float16")
     
-    # # Test the quantized model
-    # print("\nTesting quantized model...")
-    # test_input = np.random.randn(1, 60, 17).astype(np.float32)  # (batch, sequence, features)
-    # converter.test_tflite_model(output_quantized, test_input)
+    # Self-contained artifacts (model + scaler + feature schema) for scoring processes
+    converter.export_artifact(tflite_basic, output_basic.replace('.tflite', '_tflite.artifact'))
+    converter.export_artifact(tflite_quantized, output_quantized.replace('.tflite', '.artifact'), "dynamic")
+    converter.export_artifact(tflite_float16, output_float16.replace('.tflite', '.artifact'), "float16")
+    
+    if benchmark:
+        print("\nBenchmarking quantization variants...")
+        run_benchmark(converter, symbol=symbol, period=period, output_dir=output_dir)
+    
+    if compress:
+        print("\nCompressing model...")
+        run_compression(converter, symbol=symbol, period=period, output_dir=output_dir,
+                        target_sparsity=target_sparsity, num_clusters=num_clusters,
+                        fine_tune_epochs=fine_tune_epochs)
     
     print("\nModel conversion completed!")
-    print("Model saved as trading_model.tflite")
+    print("Models saved as trading_model.tflite, trading_model_quantized.tflite and trading_model_float16.tflite")
+    print("Artifacts saved as trading_model_tflite.artifact, trading_model_quantized.artifact "
+          "and trading_model_float16.artifact")
+
+
+def main():
+    """Main conversion function"""
+    parser = argparse.ArgumentParser(description="Convert the trained model to TensorFlow Lite")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Build all quantization variants and benchmark them on real data")
+    parser.add_argument('--compress', action='store_true',
+                        help="Also build a pruned/clustered model and compare it with the dense one")
+    parser.add_argument('--sparsity', type=float, default=0.5, help="Pruned fraction of kernel weights (0: no pruning)")
+    parser.add_argument('--clusters', type=int, default=16, help="Shared values per kernel (0: no clustering)")
+    parser.add_argument('--fine-tune-epochs', type=int, default=2, help="Fine-tuning epochs per compression stage")
+    parser.add_argument('--symbol', default="AAPL", help="Symbol used for calibration and evaluation data")
+    parser.add_argument('--period', default="6mo", help="History used for calibration and evaluation")
+    args = parser.parse_args()
+    
+    convert_model(os.path.join(MODELS_DIR, "trading_model.artifact"), benchmark=args.benchmark,
+                  symbol=args.symbol, period=args.period, compress=args.compress, target_sparsity=args.sparsity,
+                  num_clusters=args.clusters, fine_tune_epochs=args.fine_tune_epochs)
 
 
 if __name__ == "__main__":
     main()
-
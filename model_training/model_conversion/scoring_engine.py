@@ -0,0 +1,247 @@
+"""
+TFLite Scoring Engine
+Batched, multi-interpreter inference for backtests and multi-symbol screening
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+import tensorflow as tf
+
+from instrumentation.latency import METRICS
+from model_development.model_artifact import ModelArtifact, is_artifact
+
+
+class _InterpreterSlot:
+    """One interpreter with its input resized to the batch size and a reusable input buffer"""
+
+    def __init__(self, model_path: str, batch_size: int, num_threads: int, model_content: bytes = None):
+        if model_content is not None:
+            self.interpreter = tf.lite.Interpreter(model_content=model_content, num_threads=num_threads)
+        else:
+            self.interpreter = tf.lite.Interpreter(model_path=model_path, num_threads=num_threads)
+        input_details = self.interpreter.get_input_details()[0]
+        self.input_index = input_details['index']
+        self.interpreter.resize_tensor_input(
+            self.input_index, [batch_size, *input_details['shape'][1:]], strict=False
+        )
+        self.interpreter.allocate_tensors()
+
+        input_details = self.interpreter.get_input_details()[0]
+        output_details = self.interpreter.get_output_details()[0]
+        self.output_index = output_details['index']
+        self.input_dtype = input_details['dtype']
+        self.input_quantization = input_details['quantization']
+        self.output_quantization = output_details['quantization']
+        self.buffer = np.zeros(input_details['shape'], dtype=self.input_dtype)
+
+    def run(self, X: np.ndarray) -> np.ndarray:
+        """Score up to batch_size windows; unused buffer rows are ignored"""
+        n = len(X)
+        t = METRICS.start()
+        scale, zero_point = self.input_quantization
+        if self.input_dtype == np.float32 or not scale:
+            self.buffer[:n] = X
+        else:
+            info = np.iinfo(self.input_dtype)
+            self.buffer[:n] = np.clip(np.round(X / scale + zero_point), info.min, info.max)
+
+        self.interpreter.set_tensor(self.input_index, self.buffer)
+        t = METRICS.lap('interpreter_input', t)
+        self.interpreter.invoke()
+        t = METRICS.lap('interpreter_invoke', t)
+        output = self.interpreter.get_tensor(self.output_index)[:n]
+
+        scale, zero_point = self.output_quantization
+        if scale:
+            output = (output.astype(np.float32) - zero_point) * scale
+        else:
+            output = output.copy()
+        METRICS.lap('interpreter_output', t)
+        METRICS.increment('windows_scored', n)
+        return output
+
+
+class TFLiteScoringEngine:
+    """
+    Scores windows with a pool of pre-allocated TFLite interpreters
+
+    score() runs a batch of windows synchronously, splitting it across the
+    pool. submit() queues single windows; dispatcher threads group queued
+    windows into batches of up to batch_size (waiting at most max_wait_ms)
+    and resolve the returned futures.
+    """
+
+    def __init__(self, model_path: str, num_workers: Optional[int] = None, batch_size: int = 64,
+                 num_threads: int = 1, max_wait_ms: float = 2.0, latency_window: int = 10000):
+        """
+        Args:
+            model_path: Path to a TFLite model or a tflite model artifact
+            num_workers: Interpreters in the pool (defaults to cores / num_threads)
+            batch_size: Batch dimension the interpreters are resized to
+            num_threads: Threads per interpreter
+            max_wait_ms: Longest a queued window waits for its batch to fill
+            latency_window: Number of recent latencies kept for percentiles
+        """
+        self.model_path = model_path
+        self.batch_size = batch_size
+        self.num_workers = num_workers or max(1, (os.cpu_count() or 1) // num_threads)
+        self.max_wait = max_wait_ms / 1000.0
+
+        # Artifacts carry the scaler and feature schema alongside the model
+        self.artifact = ModelArtifact(model_path) if is_artifact(model_path) else None
+        if self.artifact is not None and self.artifact.model_format != 'tflite':
+            model_format = self.artifact.model_format
+            self.artifact.close()
+            raise ValueError(f"{model_path} holds a {model_format} model; convert it to a tflite artifact "
+                             f"(model_conversion.convert_to_tflite) before scoring")
+        model_content = bytes(self.artifact.model_bytes()) if self.artifact is not None else None
+        
+        self._slots = queue.Queue()
+        for _ in range(self.num_workers):
+            self._slots.put(_InterpreterSlot(model_path, batch_size, num_threads, model_content))
+        self._executor = ThreadPoolExecutor(max_workers=self.num_workers)
+
+        self._requests = queue.Queue()
+        self._dispatchers = []
+
+        self._stats_lock = threading.Lock()
+        self._batch_latencies = deque(maxlen=latency_window)
+        self._request_latencies = deque(maxlen=latency_window)
+        self.reset_stats()
+
+    def _run_batch(self, X: np.ndarray) -> np.ndarray:
+        slot = self._slots.get()
+        try:
+            start = time.perf_counter()
+            output = slot.run(X)
+            elapsed = time.perf_counter() - start
+        finally:
+            self._slots.put(slot)
+
+        with self._stats_lock:
+            if self._first_scored is None:
+                self._first_scored = start
+            self._last_scored = start + elapsed
+            self._batch_latencies.append(elapsed)
+            self._windows_scored += len(X)
+            self._batches += 1
+        return output
+
+    def score(self, X: np.ndarray) -> np.ndarray:
+        """
+        Score windows synchronously
+
+        Args:
+            X: Windows of shape (N, seq_length, features)
+
+        Returns:
+            Model outputs of shape (N, classes)
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if len(X) <= self.batch_size:
+            return self._run_batch(X)
+        batches = [X[i:i + self.batch_size] for i in range(0, len(X), self.batch_size)]
+        return np.concatenate(list(self._executor.map(self._run_batch, batches)))
+
+    def start(self):
+        """Start the dispatcher threads behind submit()"""
+        if self._dispatchers:
+            return
+        for _ in range(self.num_workers):
+            thread = threading.Thread(target=self._dispatch_loop, daemon=True)
+            thread.start()
+            self._dispatchers.append(thread)
+
+    def stop(self):
+        """Stop the dispatchers once queued windows have been scored"""
+        for _ in self._dispatchers:
+            self._requests.put(None)
+        for thread in self._dispatchers:
+            thread.join()
+        self._dispatchers = []
+
+    def close(self):
+        """Stop dispatchers and release the worker pool"""
+        self.stop()
+        self._executor.shutdown(wait=True)
+
+    def submit(self, window: np.ndarray) -> Future:
+        """Queue one (seq_length, features) window; the future resolves to its output row"""
+        if not self._dispatchers:
+            self.start()
+        future = Future()
+        self._requests.put((np.asarray(window, dtype=np.float32), future, time.perf_counter()))
+        return future
+
+    def _dispatch_loop(self):
+        while True:
+            item = self._requests.get()
+            if item is None:
+                return
+            pending = [item]
+            deadline = time.perf_counter() + self.max_wait
+            stopping = False
+            while len(pending) < self.batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._requests.get(timeout=remaining) if remaining > 0 else self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                pending.append(item)
+
+            self._score_pending(pending)
+            if stopping:
+                return
+
+    def _score_pending(self, pending: List):
+        try:
+            output = self._run_batch(np.stack([window for window, _, _ in pending]))
+        except Exception as e:
+            for _, future, _ in pending:
+                future.set_exception(e)
+            return
+
+        done = time.perf_counter()
+        with self._stats_lock:
+            for _, _, submitted in pending:
+                self._request_latencies.append(done - submitted)
+        for row, (_, future, _) in zip(output, pending):
+            future.set_result(row)
+
+    def reset_stats(self):
+        """Clear throughput and latency statistics"""
+        with self._stats_lock:
+            self._batch_latencies.clear()
+            self._request_latencies.clear()
+            self._windows_scored = 0
+            self._batches = 0
+            self._first_scored = None
+            self._last_scored = None
+
+    def get_stats(self) -> Dict:
+        """Throughput (windows/s) and p50/p99 latencies in milliseconds"""
+        with self._stats_lock:
+            batch_latencies = np.array(self._batch_latencies)
+            request_latencies = np.array(self._request_latencies)
+            elapsed = (self._last_scored - self._first_scored) if self._first_scored is not None else 0.0
+            stats = {
+                'windows_scored': self._windows_scored,
+                'batches': self._batches,
+                'throughput': self._windows_scored / elapsed if elapsed > 0 else 0.0,
+            }
+
+        for name, latencies in (('batch', batch_latencies), ('request', request_latencies)):
+            if len(latencies):
+                stats[f'{name}_p50_ms'] = float(np.percentile(latencies, 50) * 1000)
+                stats[f'{name}_p99_ms'] = float(np.percentile(latencies, 99) * 1000)
+        return stats
@@ -0,0 +1,180 @@
+"""
+Backtesting Engine
+Vectorized simulation of Buy/Hold/Sell model signals
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from model_development.train_trading_model import FEATURE_COLUMNS, TradingModelTrainer, WindowBatchSequence
+
+SELL, HOLD, BUY = 0, 1, 2
+
+
+def model_probabilities(model, X: np.ndarray, batch_size: int = 1024) -> np.ndarray:
+    """
+    Class probabilities from a Keras model or a TFLiteScoringEngine
+
+    Args:
+        model: keras.Model, or any object with a score(X) method
+        X: Windows of shape (N, seq_length, features)
+        batch_size: Prediction batch size for Keras models
+    """
+    if hasattr(model, 'score'):
+        return model.score(X)
+    batches = WindowBatchSequence(X, np.zeros(len(X), dtype=np.int8), batch_size)
+    return model.predict(batches, verbose=0)
+
+
+class Backtester:
+    """
+    Simulates positions from model outputs over a price history
+
+    A Buy signal goes long, a Sell signal goes short (or flat when shorting
+    is disabled) and Hold keeps the current position. The position chosen at
+    bar t is held over the return from t to t+1. Everything is computed with
+    array operations, so inputs may hold many symbols as columns.
+    """
+
+    def __init__(self, fee_bps: float = 1.0, slippage_bps: float = 1.0,
+                 confidence_threshold: float = 0.0, allow_short: bool = False,
+                 periods_per_year: float = 252 * 7):
+        """
+        Args:
+            fee_bps: Fee per unit of position change, in basis points
+            slippage_bps: Slippage per unit of position change, in basis points
+            confidence_threshold: Signals whose top probability is below this become Hold
+            allow_short: Sell goes short instead of flat
+            periods_per_year: Bars per year, for annualizing (default: hourly bars)
+        """
+        self.fee_bps = fee_bps
+        self.slippage_bps = slippage_bps
+        self.confidence_threshold = confidence_threshold
+        self.allow_short = allow_short
+        self.periods_per_year = periods_per_year
+
+    def signals_from_outputs(self, outputs: np.ndarray) -> np.ndarray:
+        """
+        Convert model outputs to 0/1/2 labels
+
+        Args:
+            outputs: Probabilities (..., 3) or labels already in 0/1/2 form
+        """
+        outputs = np.asarray(outputs)
+        if outputs.ndim >= 2 and outputs.shape[-1] == 3 and np.issubdtype(outputs.dtype, np.floating):
+            signals = outputs.argmax(axis=-1)
+            if self.confidence_threshold > 0:
+                signals = np.where(outputs.max(axis=-1) >= self.confidence_threshold, signals, HOLD)
+            return signals
+        return outputs.astype(np.int64)
+
+    def positions_from_signals(self, signals: np.ndarray) -> np.ndarray:
+        """Target positions (T, S): Buy/Sell set the position, Hold carries it forward"""
+        signals = np.asarray(signals)
+        sell_position = -1.0 if self.allow_short else 0.0
+        target = np.where(signals == BUY, 1.0, sell_position)
+        has_signal = signals != HOLD
+
+        # Forward-fill the last Buy/Sell; bars before the first one are flat
+        steps = np.arange(1, len(signals) + 1).reshape(-1, *([1] * (signals.ndim - 1)))
+        last = np.maximum.accumulate(np.where(has_signal, steps, 0), axis=0)
+        padded = np.concatenate([np.zeros((1,) + target.shape[1:]), target], axis=0)
+        return np.take_along_axis(padded, last, axis=0)
+
+    def run(self, outputs: np.ndarray, prices: np.ndarray) -> Dict:
+        """
+        Backtest model outputs against prices
+
+        Args:
+            outputs: Probabilities (T, 3) / (T, S, 3), or labels (T,) / (T, S)
+            prices: Prices at each bar, (T,) or (T, S)
+
+        Returns:
+            Dictionary with metrics plus positions, returns and equity arrays
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        single = prices.ndim == 1
+        if single:
+            prices = prices[:, None]
+        signals = self.signals_from_outputs(outputs)
+        if signals.ndim == 1:
+            signals = signals[:, None]
+        if signals.shape != prices.shape:
+            raise ValueError(f"Signals {signals.shape} do not match prices {prices.shape}")
+
+        positions = self.positions_from_signals(signals)
+        asset_returns = np.zeros_like(prices)
+        asset_returns[1:] = prices[1:] / prices[:-1] - 1
+
+        # Position from bar t-1 earns the return into bar t; changes pay costs at t
+        held = np.zeros_like(positions)
+        held[1:] = positions[:-1]
+        trades = np.abs(np.diff(positions, axis=0, prepend=0.0))
+        costs = trades * (self.fee_bps + self.slippage_bps) / 10000.0
+        returns = held * asset_returns - costs
+
+        equity = np.cumprod(1.0 + returns, axis=0)
+        drawdown = equity / np.maximum.accumulate(equity, axis=0) - 1.0
+        metrics = self._metrics(returns, equity, drawdown, trades, positions)
+
+        result = {
+            'positions': positions,
+            'returns': returns,
+            'equity': equity,
+            'drawdown': drawdown,
+        }
+        if single:
+            result = {name: values[:, 0] for name, values in result.items()}
+            metrics = {name: float(values[0]) for name, values in metrics.items()}
+        result['metrics'] = metrics
+        return result
+
+    def _metrics(self, returns: np.ndarray, equity: np.ndarray, drawdown: np.ndarray,
+                 trades: np.ndarray, positions: np.ndarray) -> Dict:
+        periods = len(returns)
+        mean = returns.mean(axis=0)
+        std = returns.std(axis=0, ddof=1) if periods > 1 else np.zeros(returns.shape[1])
+        total_return = equity[-1] - 1.0
+        years = periods / self.periods_per_year
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe = np.where(std > 0, mean / std * np.sqrt(self.periods_per_year), 0.0)
+            annual_return = np.where(equity[-1] > 0, equity[-1] ** (1.0 / years) - 1.0, -1.0)
+
+        return {
+            'total_return': total_return,
+            'annual_return': annual_return,
+            'sharpe': sharpe,
+            'max_drawdown': drawdown.min(axis=0),
+            'turnover': trades.sum(axis=0) / periods,
+            'trades': np.count_nonzero(trades, axis=0),
+            'exposure': np.mean(positions != 0, axis=0),
+        }
+
+
+def backtest_model(trainer: TradingModelTrainer, df: pd.DataFrame, model=None,
+                   sequence_length: Optional[int] = None, backtester: Optional[Backtester] = None) -> Dict:
+    """
+    Backtest a trained model over an OHLCV history
+
+    Features and windows are built exactly as in training (with the trainer's
+    fitted scaler), and each window's signal is applied at the bar it labels.
+
+    Args:
+        trainer: Trainer with a fitted scaler (and model, unless one is given)
+        df: DataFrame with OHLCV data
+        model: Keras model or TFLiteScoringEngine; defaults to trainer.model
+        sequence_length: Length of input sequences; defaults to trainer.sequence_length
+        backtester: Backtester configuration; defaults to Backtester()
+    """
+    model = model if model is not None else trainer.model
+    backtester = backtester or Backtester()
+    sequence_length = sequence_length or trainer.sequence_length
+
+    features, targets = trainer.prepare_features(df)
+    features_scaled = trainer.scaler.transform(features).astype(np.float32)
+    X, _ = trainer.create_sequences((features_scaled, targets), sequence_length)
+    prices = features[sequence_length:, FEATURE_COLUMNS.index('Close')]
+
+    return backtester.run(model_probabilities(model, X), prices)
@@ -0,0 +1,151 @@
+"""
+Feature Store
+Caches prepare_features output and scaler statistics as memory-mapped arrays
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+from model_development.train_trading_model import FEATURE_COLUMNS
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data', 'features')
+
+# Bump when prepare_features changes in a way the parameters don't capture
+FEATURE_VERSION = 1
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def feature_key(df: pd.DataFrame, feature_params: Dict, feature_columns: List[str] = FEATURE_COLUMNS) -> str:
+    """Hash of the input bars (values and timestamps) and the feature configuration"""
+    extra_columns = [column for column in feature_columns if column not in FEATURE_COLUMNS]
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(df[OHLCV_COLUMNS + extra_columns], index=True).values.tobytes())
+    digest.update(json.dumps({
+        'params': feature_params,
+        'columns': feature_columns,
+        'version': FEATURE_VERSION,
+    }, sort_keys=True).encode())
+    return digest.hexdigest()[:32]
+
+
+class FeatureEntry:
+    """One stored feature set; arrays are memory-mapped on first access"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._arrays = {}
+        with open(os.path.join(path, 'metadata.json')) as f:
+            self.metadata = json.load(f)
+
+    def _load(self, name: str) -> np.ndarray:
+        if name not in self._arrays:
+            self._arrays[name] = np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode='r')
+        return self._arrays[name]
+
+    @property
+    def features(self) -> np.ndarray:
+        return self._load('features')
+
+    @property
+    def targets(self) -> np.ndarray:
+        return self._load('targets')
+
+    @property
+    def scaler_mean(self) -> np.ndarray:
+        return self._load('scaler_mean')
+
+    @property
+    def scaler_scale(self) -> np.ndarray:
+        return self._load('scaler_scale')
+
+    def scaled_features(self) -> np.ndarray:
+        """Features standardized with the stored statistics, as float32"""
+        return (self.features - self.scaler_mean) / self.scaler_scale
+
+    def scaler(self) -> StandardScaler:
+        """StandardScaler rebuilt from the stored statistics"""
+        scaler = StandardScaler()
+        scaler.mean_ = self.scaler_mean.astype(np.float64)
+        scaler.scale_ = self.scaler_scale.astype(np.float64)
+        scaler.var_ = self._load('scaler_var').astype(np.float64)
+        scaler.n_features_in_ = len(scaler.mean_)
+        scaler.n_samples_seen_ = self.metadata['rows']
+        return scaler
+
+
+class FeatureStore:
+    """Content-addressed store of precomputed features, keyed by data and feature config"""
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.root = root
+        self.stats = {'hits': 0, 'misses': 0}
+        os.makedirs(root, exist_ok=True)
+
+    def get(self, key: str) -> Optional[FeatureEntry]:
+        """Return the entry for key, or None if it has not been stored"""
+        path = os.path.join(self.root, key)
+        if not os.path.exists(os.path.join(path, 'metadata.json')):
+            return None
+        return FeatureEntry(path)
+
+    def put(self, key: str, features: np.ndarray, targets: np.ndarray, scaler: StandardScaler,
+            feature_params: Dict, feature_columns: List[str] = FEATURE_COLUMNS) -> FeatureEntry:
+        """Write a feature set and its fitted scaler statistics"""
+        path = os.path.join(self.root, key)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        os.makedirs(tmp_path, exist_ok=True)
+
+        np.save(os.path.join(tmp_path, 'features.npy'), np.asarray(features, dtype=np.float32))
+        np.save(os.path.join(tmp_path, 'targets.npy'), np.asarray(targets, dtype=np.int8))
+        np.save(os.path.join(tmp_path, 'scaler_mean.npy'), scaler.mean_.astype(np.float32))
+        np.save(os.path.join(tmp_path, 'scaler_scale.npy'), scaler.scale_.astype(np.float32))
+        np.save(os.path.join(tmp_path, 'scaler_var.npy'), scaler.var_.astype(np.float32))
+        with open(os.path.join(tmp_path, 'metadata.json'), 'w') as f:
+            json.dump({
+                'rows': int(len(features)),
+                'feature_columns': feature_columns,
+                'feature_params': feature_params,
+                'version': FEATURE_VERSION,
+                'created_at': time.time(),
+            }, f, indent=2)
+
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            # Another run stored the same key first; entries are immutable
+            if not os.path.exists(os.path.join(path, 'metadata.json')):
+                shutil.rmtree(tmp_path, ignore_errors=True)
+                raise
+            shutil.rmtree(tmp_path)
+        return FeatureEntry(path)
+
+    def get_or_compute(self, trainer, df: pd.DataFrame) -> FeatureEntry:
+        """
+        Look up the features for df, computing and storing them on a miss
+
+        Args:
+            trainer: TradingModelTrainer whose feature_params define the features
+            df: DataFrame with OHLCV data
+
+        Returns:
+            FeatureEntry for the data and configuration
+        """
+        key = feature_key(df, trainer.feature_params, trainer.feature_columns)
+        entry = self.get(key)
+        if entry is not None:
+            self.stats['hits'] += 1
+            return entry
+
+        self.stats['misses'] += 1
+        features, targets = trainer.prepare_features(df)
+        scaler = StandardScaler().fit(features)
+        return self.put(key, features, targets, scaler, trainer.feature_params, trainer.feature_columns)
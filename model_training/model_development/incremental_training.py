@@ -0,0 +1,216 @@
+"""
+Incremental Training
+Warm-start fine-tuning of a saved model on newly arrived bars
+"""
+
+import math
+import os
+import time
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+from tensorflow import keras
+
+from model_development.throughput import EpochThroughput
+from model_development.train_trading_model import MODELS_DIR, TradingModelTrainer, WindowBatchSequence
+
+# Periods tried, shortest first, until the fetched history covers IncrementalUpdater.history_bars
+FETCH_PERIODS = ('3mo', '6mo', '1y', '2y')
+
+
+def warmup_bars(feature_params: Dict, tolerance: float = 1e-4) -> int:
+    """
+    Bars of history prepare_features needs before its output matches a full-history run
+
+    Rolling indicators are exact once their window is full. The EWMs behind
+    MACD start from the first bar they see, so the slow and signal spans
+    also need enough bars for the truncated start to carry less than
+    tolerance of their weight.
+    """
+    p = feature_params
+    rolling = max(p['rsi_period'] + 1, p['bb_period'], p['sma_short'], p['sma_long'],
+                  p['volatility_window'] + 1, p['volume_window'])
+
+    def ewm_bars(span: int) -> int:
+        return math.ceil(math.log(tolerance) / math.log(1 - 2 / (span + 1)))
+
+    return rolling + ewm_bars(p['macd_slow']) + ewm_bars(p['macd_signal'])
+
+
+class IncrementalUpdater:
+    """
+    Fine-tunes the last saved model on the bars that arrived since it was trained
+
+    Only the new bars, a recency window of older bars and the indicator
+    warm-up tail before them go through prepare_features; the saved scaler
+    is reused as-is so the network sees inputs on the scale it was trained
+    on. A copy of the model is fine-tuned for a few epochs with sample
+    weights that halve every half_life_bars bars back, and is promoted only
+    if its loss on the newest windows (held out, never trained on) does not
+    regress against the current model.
+    """
+
+    def __init__(self, trainer: TradingModelTrainer, window_bars: int = 2000, half_life_bars: int = 500,
+                 epochs: int = 3, batch_size: int = 32, learning_rate: float = 1e-4,
+                 validation_fraction: float = 0.3, min_new_windows: int = 20, tolerance: float = 0.0,
+                 warmup_tolerance: float = 1e-4):
+        """
+        Args:
+            trainer: Trainer with the current model and scaler (TradingModelTrainer.load_model)
+            window_bars: Older bars replayed alongside the new ones
+            half_life_bars: Age, in bars, at which a window's sample weight halves
+            epochs: Fine-tuning epoch budget
+            batch_size: Fine-tuning batch size
+            learning_rate: Fine-tuning learning rate
+            validation_fraction: Share of the new labelled windows held out for the promotion check
+            min_new_windows: New labelled windows needed before an update is attempted
+            tolerance: Allowed relative increase in validation loss for promotion
+            warmup_tolerance: EWM weight allowed on bars before the computed tail
+        """
+        if trainer.symbols:
+            raise ValueError("Incremental updates support single-symbol models; retrain panel models with train_panel")
+        self.trainer = trainer
+        self.window_bars = window_bars
+        self.half_life_bars = half_life_bars
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.learning_rate = learning_rate
+        self.validation_fraction = validation_fraction
+        self.min_new_windows = min_new_windows
+        self.tolerance = tolerance
+        self.warmup = warmup_bars(trainer.feature_params, warmup_tolerance)
+
+    def history_bars(self, new_bars: int) -> int:
+        """Bars (ending at the latest one) that an update with new_bars new bars reads"""
+        return self.warmup + self.trainer.sequence_length + self.window_bars + new_bars
+
+    def recency_weights(self, num_windows: int) -> np.ndarray:
+        """Sample weights halving every half_life_bars windows back from the newest, mean 1"""
+        age = np.arange(num_windows)[::-1]
+        weights = 0.5 ** (age / self.half_life_bars)
+        return (weights / weights.mean()).astype(np.float32)
+
+    def update(self, df: pd.DataFrame, since: Optional[pd.Timestamp] = None) -> Dict:
+        """
+        Fine-tune on the bars of df after since and promote the result if it holds up
+
+        Args:
+            df: OHLCV bars (plus any extra feature columns) ending with the newest bar;
+                only the last history_bars(new bars) rows are used
+            since: Last bar the current model was trained on (defaults to trainer.trained_through)
+
+        Returns:
+            Dictionary with the new bar, window and new window counts, the current and candidate
+            validation loss and accuracy, and whether the candidate was promoted
+        """
+        trainer = self.trainer
+        since = trainer.trained_through if since is None else since
+        if since is None:
+            raise ValueError("The model does not record the last bar it was trained on; pass since")
+        started = time.perf_counter()
+        horizon = trainer.feature_params['label_horizon']
+        seq_len = trainer.sequence_length
+
+        new_bars = int((df.index > pd.Timestamp(since)).sum())
+        tail = df.iloc[-self.history_bars(new_bars):]
+        features, targets = trainer.prepare_features(tail)
+
+        # Keep the warmed-up rows (a short history loses some older windows rather than
+        # training on unconverged indicators); the last horizon rows have no outcome yet
+        rows = max(0, min(len(features), len(tail) - self.warmup, seq_len + self.window_bars + new_bars))
+        start = len(features) - rows
+        features = trainer.scaler.transform(features[start:]).astype(np.float32)
+        X, y = trainer.create_sequences((features[:-horizon], targets[start:-horizon]), seq_len)
+        new_windows = min(len(X), max(0, new_bars - horizon))
+        result = {'new_bars': new_bars, 'windows': len(X), 'new_windows': new_windows, 'promoted': False,
+                  'trained_through': pd.Timestamp(since).isoformat()}
+        if new_windows < self.min_new_windows:
+            print(f"{new_windows} new labelled windows since {since}; need {self.min_new_windows}, skipping update")
+            return result
+
+        # The newest windows validate; a horizon-sized gap keeps their labels out of training
+        validation = max(1, int(new_windows * self.validation_fraction))
+        split = len(X) - validation
+        X_train, y_train = X[:split - horizon], y[:split - horizon]
+        validation_batches = WindowBatchSequence(X[split:], y[split:], self.batch_size)
+        baseline_loss, baseline_accuracy = trainer.model.evaluate(validation_batches, verbose=0)
+
+        candidate = keras.models.clone_model(trainer.model)
+        candidate.set_weights(trainer.model.get_weights())
+        candidate.compile(optimizer=keras.optimizers.Adam(learning_rate=self.learning_rate),
+                          loss='sparse_categorical_crossentropy', metrics=['accuracy'],
+                          jit_compile=trainer.jit_compile)
+        throughput = EpochThroughput(len(X_train))
+        candidate.fit(
+            WindowBatchSequence(X_train, y_train, self.batch_size, shuffle=True,
+                                sample_weight=self.recency_weights(len(X_train))),
+            epochs=self.epochs, verbose=1, callbacks=[throughput]
+        )
+        trainer.record_throughput(throughput)
+        candidate_loss, candidate_accuracy = candidate.evaluate(validation_batches, verbose=0)
+
+        promoted = candidate_loss <= baseline_loss * (1 + self.tolerance)
+        if promoted:
+            trainer.model = candidate
+            # Bars whose labels are not known yet are picked up by the next update
+            trainer.trained_through = tail.index[-1 - horizon]
+        result.update({
+            'promoted': bool(promoted),
+            'training_windows': len(X_train),
+            'validation_windows': validation,
+            'baseline_loss': float(baseline_loss),
+            'baseline_accuracy': float(baseline_accuracy),
+            'candidate_loss': float(candidate_loss),
+            'candidate_accuracy': float(candidate_accuracy),
+            'trained_through': pd.Timestamp(trainer.trained_through).isoformat(),
+            'seconds': time.perf_counter() - started,
+        })
+        print(f"Validation loss {baseline_loss:.4f} -> {candidate_loss:.4f}, "
+              f"accuracy {baseline_accuracy:.4f} -> {candidate_accuracy:.4f}: "
+              f"{'promoted' if promoted else 'kept the current model'} ({result['seconds']:.1f}s)")
+        return result
+
+
+def run_incremental_update(model_path: str = os.path.join(MODELS_DIR, "trading_model.artifact"),
+                           symbol: str = "AAPL", period: Optional[str] = None, interval: str = "1h",
+                           output_path: Optional[str] = None, **updater_kwargs) -> Dict:
+    """
+    Load the saved model, fetch recent bars and save the fine-tuned model if it is promoted
+
+    Args:
+        model_path: Artifact saved by TradingModelTrainer.save_model
+        symbol: Ticker symbol the model trades
+        period: Recent history to fetch; by default the shortest of FETCH_PERIODS that
+            covers IncrementalUpdater.history_bars for the bars since the last training
+        interval: Bar interval the model was trained on
+        output_path: Where a promoted model is saved (defaults to model_path)
+        **updater_kwargs: IncrementalUpdater settings
+    """
+    from data_collection.bar_cache import BarCache
+    from data_collection.market_data_collector import MarketDataCollector
+
+    trainer = TradingModelTrainer.load_model(model_path)
+    updater = IncrementalUpdater(trainer, **updater_kwargs)
+
+    # Cached locally; only bars since the last fetch are downloaded
+    collector = MarketDataCollector(symbol, cache=BarCache())
+    since = trainer.trained_through
+    for fetch_period in (period,) if period else FETCH_PERIODS:
+        df = collector.get_historical_data(period=fetch_period, interval=interval)
+        if df.empty:
+            break
+        new_bars = int((df.index > pd.Timestamp(since)).sum()) if since is not None else 0
+        if len(df) >= updater.history_bars(new_bars):
+            break
+        print(f"{fetch_period} of history holds {len(df)} bars; the update reads {updater.history_bars(new_bars)}")
+    if df.empty:
+        print(f"No market data for {symbol}; nothing to update")
+        return {'new_bars': 0, 'promoted': False}
+    if since is not None and df.index[0] > pd.Timestamp(since):
+        print(f"Fetched history starts after the last trained bar ({since}); increase period")
+
+    result = updater.update(df)
+    if result['promoted']:
+        trainer.save_model(output_path or model_path)
+    return result
@@ -0,0 +1,140 @@
+"""
+Live Signals
+Scores a rolling feature window each time a live bar closes
+"""
+
+from collections import deque
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_collection.dispatch import CallbackDispatcher
+from instrumentation.latency import METRICS
+from model_development.backtest import Backtester, model_probabilities
+from model_development.streaming_features import StreamingFeatureEngine
+from model_development.train_trading_model import FEATURE_COLUMNS, TradingModelTrainer
+
+SIGNAL_NAMES = ['SELL', 'HOLD', 'BUY']
+
+
+def _check_columns(feature_columns):
+    # The streaming engine computes FEATURE_COLUMNS only
+    if list(feature_columns) != FEATURE_COLUMNS:
+        extra = [column for column in feature_columns if column not in FEATURE_COLUMNS]
+        raise ValueError(f"Live scoring computes the price/volume features only; model also uses {extra}")
+
+
+class LiveSignalGenerator:
+    """
+    Turns closed bars into model signals
+
+    Each symbol has a StreamingFeatureEngine and a window of the latest
+    sequence_length scaled feature rows. Once the window is full, every
+    closed bar produces one prediction, published to subscribers as a dict
+    with symbol, timestamp, signal, label and probabilities.
+    """
+
+    def __init__(self, model, scaler, sequence_length: int = 60, feature_params: Optional[Dict] = None,
+                 confidence_threshold: float = 0.0, dispatcher: Optional[CallbackDispatcher] = None):
+        """
+        Args:
+            model: Keras model or TFLiteScoringEngine
+            scaler: Fitted StandardScaler from training (or an artifact's ArrayScaler)
+            sequence_length: Window length the model was trained on
+            feature_params: Indicator parameters used in training
+            confidence_threshold: Predictions below this confidence become HOLD
+            dispatcher: Dispatcher that receives signals
+        """
+        self.model = model
+        self.mean = np.asarray(scaler.mean_, dtype=np.float64)
+        self.scale = np.asarray(scaler.scale_, dtype=np.float64)
+        self.sequence_length = sequence_length
+        params = feature_params or {}
+        self.engine_params = {
+            name: value for name, value in params.items() if not name.startswith('label_')
+        }
+        self.backtester = Backtester(confidence_threshold=confidence_threshold)
+        self.dispatcher = dispatcher or CallbackDispatcher()
+        self.engines: Dict[str, StreamingFeatureEngine] = {}
+        self.windows: Dict[str, deque] = {}
+        self.latest_signals: Dict[str, Dict] = {}
+
+    @classmethod
+    def from_trainer(cls, trainer: TradingModelTrainer, model=None, **kwargs) -> 'LiveSignalGenerator':
+        """Build a generator from a trained TradingModelTrainer"""
+        _check_columns(trainer.feature_columns)
+        kwargs.setdefault('sequence_length', trainer.sequence_length)
+        return cls(model if model is not None else trainer.model, trainer.scaler,
+                   feature_params=trainer.feature_params, **kwargs)
+
+    @classmethod
+    def from_artifact(cls, path: str, **kwargs) -> 'LiveSignalGenerator':
+        """Build a generator around a TFLite model artifact, using its scaler and feature schema"""
+        from model_conversion.scoring_engine import TFLiteScoringEngine
+
+        engine = TFLiteScoringEngine(path, num_workers=1, batch_size=1)
+        artifact = engine.artifact
+        if artifact is None:
+            raise ValueError(f"{path} is not a model artifact")
+        _check_columns(artifact.feature_columns)
+        return cls(engine, artifact.scaler(), sequence_length=artifact.sequence_length,
+                   feature_params=artifact.feature_params, **kwargs)
+
+    def subscribe(self, callback: Callable, policy: str = 'drop_oldest', maxsize: int = 10000, **kwargs):
+        """Call callback with every signal"""
+        return self.dispatcher.subscribe(callback, maxsize=maxsize, policy=policy, **kwargs)
+
+    def _state(self, symbol: str):
+        engine = self.engines.get(symbol)
+        if engine is None:
+            engine = self.engines[symbol] = StreamingFeatureEngine(**self.engine_params)
+            self.windows[symbol] = deque(maxlen=self.sequence_length)
+        return engine, self.windows[symbol]
+
+    def warm_up(self, symbol: str, df: pd.DataFrame):
+        """
+        Prime a symbol's indicators and window from historical bars
+
+        Args:
+            symbol: Ticker symbol
+            df: OHLCV DataFrame of the bars preceding the live stream
+        """
+        engine, window = self._state(symbol)
+        for features in engine.update_frame(df)[-self.sequence_length:]:
+            window.append((features - self.mean) / self.scale)
+
+    def on_bar(self, bar: Dict) -> Optional[Dict]:
+        """
+        Consume one closed bar; usable directly as a BarAggregator subscriber
+
+        Returns:
+            The signal, or None while the window is still filling
+        """
+        symbol = bar['symbol']
+        engine, window = self._state(symbol)
+        t = METRICS.start()
+        features = engine.update(bar['Open'], bar['High'], bar['Low'], bar['Close'], bar['Volume'])
+        t = METRICS.lap('feature_update', t)
+        if features is None:
+            return None
+        window.append((features - self.mean) / self.scale)
+        t = METRICS.lap('scaler_transform', t)
+        if len(window) < self.sequence_length:
+            return None
+
+        X = np.stack(window).astype(np.float32)[None]
+        probabilities = model_probabilities(self.model, X)[0]
+        METRICS.lap('model_invoke', t)
+        METRICS.increment('signals')
+        label = int(self.backtester.signals_from_outputs(probabilities[None])[0])
+        signal = {
+            'symbol': symbol,
+            'timestamp': bar['timestamp'],
+            'signal': SIGNAL_NAMES[label],
+            'label': label,
+            'probabilities': probabilities,
+        }
+        self.latest_signals[symbol] = signal
+        self.dispatcher.publish(signal)
+        return signal
@@ -0,0 +1,258 @@
+"""
+Model Artifact
+Single-file, content-hashed model format with embedded scaler and feature schema
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+ARTIFACT_MAGIC = b'TRDMODEL'
+ARTIFACT_FORMAT_VERSION = 1
+ARTIFACT_EXTENSION = '.artifact'
+SIGNAL_CLASSES = ['SELL', 'HOLD', 'BUY']
+
+# magic, format version, header length
+_PREAMBLE = struct.Struct('<8sII')
+_ALIGNMENT = 64
+# Header keys left out of the content hash
+_UNHASHED_METADATA = ('sha256', 'created_at')
+
+
+class ArrayScaler:
+    """Standardization from stored mean/scale arrays; the transform StandardScaler applies"""
+
+    def __init__(self, mean: np.ndarray, scale: np.ndarray):
+        self.mean_ = mean
+        self.scale_ = scale
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        return (np.asarray(X) - self.mean_) / self.scale_
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _content_hash(metadata: Dict, payload: List[bytes]) -> str:
+    # The write time is left out so that identical content gets the same version
+    hashed = {key: value for key, value in metadata.items() if key not in _UNHASHED_METADATA}
+    digest = hashlib.sha256(json.dumps(hashed, sort_keys=True).encode())
+    for section in payload:
+        digest.update(section)
+    return digest.hexdigest()
+
+
+def is_artifact(path: str) -> bool:
+    """Whether a file starts with the artifact magic"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(ARTIFACT_MAGIC)) == ARTIFACT_MAGIC
+    except OSError:
+        return False
+
+
+def write_artifact(path: str, model_bytes: bytes, model_format: str, scaler_mean: np.ndarray,
+                   scaler_scale: np.ndarray, feature_columns: List[str], sequence_length: int,
+                   feature_params: Optional[Dict] = None, extra: Optional[Dict] = None) -> str:
+    """
+    Write a model artifact
+
+    Layout: magic, format version and header length, a JSON header, then
+    64-byte aligned raw sections (scaler mean, scaler scale, model bytes).
+
+    Args:
+        path: Output file path
+        model_bytes: Serialized model ('tflite' flatbuffer or 'keras' archive)
+        model_format: 'tflite' or 'keras'
+        scaler_mean: Per-feature mean used for standardization
+        scaler_scale: Per-feature scale used for standardization
+        feature_columns: Model input columns, in order
+        sequence_length: Window length the model expects
+        feature_params: Indicator and label parameters used in training
+        extra: Additional metadata (e.g. quantization type)
+
+    Returns:
+        SHA-256 content hash, also stored in the header
+    """
+    if model_format not in ('tflite', 'keras'):
+        raise ValueError(f"Unknown model format: {model_format}")
+    feature_params = dict(feature_params or {})
+    sections = {
+        'scaler_mean': np.ascontiguousarray(scaler_mean, dtype=np.float32),
+        'scaler_scale': np.ascontiguousarray(scaler_scale, dtype=np.float32),
+        'model': np.frombuffer(bytes(model_bytes), dtype=np.uint8),
+    }
+    if len(sections['scaler_mean']) != len(feature_columns):
+        raise ValueError(f"Scaler has {len(sections['scaler_mean'])} features, schema has {len(feature_columns)}")
+
+    metadata = {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'model_format': model_format,
+        'feature_columns': list(feature_columns),
+        'sequence_length': int(sequence_length),
+        'input_shape': [int(sequence_length), len(feature_columns)],
+        'classes': SIGNAL_CLASSES,
+        'feature_params': feature_params,
+        'label_horizon': feature_params.get('label_horizon'),
+        'label_threshold': feature_params.get('label_threshold'),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        **(extra or {}),
+    }
+
+    # Section offsets are relative to the (aligned) start of the data area
+    offset = 0
+    layout = {}
+    for name, array in sections.items():
+        offset = _align(offset)
+        layout[name] = {'offset': offset, 'length': array.nbytes, 'dtype': array.dtype.str,
+                        'shape': list(array.shape)}
+        offset += array.nbytes
+    metadata['sections'] = layout
+    payload = [array.tobytes() for array in sections.values()]
+    metadata['sha256'] = _content_hash(metadata, payload)
+
+    header = json.dumps(metadata, sort_keys=True).encode()
+    data_start = _align(_PREAMBLE.size + len(header))
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(ARTIFACT_MAGIC, ARTIFACT_FORMAT_VERSION, len(header)))
+        f.write(header)
+        for (name, _), section in zip(layout.items(), payload):
+            f.seek(data_start + layout[name]['offset'])
+            f.write(section)
+    os.replace(tmp_path, path)
+    return metadata['sha256']
+
+
+class ModelArtifact:
+    """
+    Read-only view of an artifact file
+
+    The file is memory-mapped; the scaler arrays and model bytes are
+    zero-copy views into the map, so opening costs one header parse and no
+    unpickling. Content is only hashed when verify() is called.
+    """
+
+    def __init__(self, path: str, verify: bool = False):
+        """
+        Args:
+            path: Artifact file path
+            verify: Check the content hash on open
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_length = _PREAMBLE.unpack_from(self._map, 0)
+        if magic != ARTIFACT_MAGIC:
+            raise ValueError(f"{path} is not a model artifact")
+        if version > ARTIFACT_FORMAT_VERSION:
+            raise ValueError(f"{path} uses artifact format {version}; this reader supports {ARTIFACT_FORMAT_VERSION}")
+        header_start = _PREAMBLE.size
+        self.metadata = json.loads(self._map[header_start:header_start + header_length])
+        self._data_start = _align(header_start + header_length)
+        if verify:
+            self.verify()
+
+    def section(self, name: str) -> np.ndarray:
+        """Zero-copy array view of a section"""
+        info = self.metadata['sections'][name]
+        dtype = np.dtype(info['dtype'])
+        array = np.frombuffer(self._map, dtype=dtype, count=info['length'] // dtype.itemsize,
+                              offset=self._data_start + info['offset'])
+        return array.reshape(info['shape'])
+
+    @property
+    def sha256(self) -> str:
+        return self.metadata['sha256']
+
+    @property
+    def version(self) -> str:
+        """Short content hash identifying this model"""
+        return self.sha256[:12]
+
+    @property
+    def model_format(self) -> str:
+        return self.metadata['model_format']
+
+    @property
+    def feature_columns(self) -> List[str]:
+        return self.metadata['feature_columns']
+
+    @property
+    def feature_params(self) -> Dict:
+        return self.metadata['feature_params']
+
+    @property
+    def sequence_length(self) -> int:
+        return self.metadata['sequence_length']
+
+    @property
+    def input_shape(self) -> tuple:
+        return tuple(self.metadata['input_shape'])
+
+    @property
+    def scaler_mean(self) -> np.ndarray:
+        return self.section('scaler_mean')
+
+    @property
+    def scaler_scale(self) -> np.ndarray:
+        return self.section('scaler_scale')
+
+    def scaler(self) -> ArrayScaler:
+        """Standardization with the embedded statistics"""
+        return ArrayScaler(self.scaler_mean.astype(np.float64), self.scaler_scale.astype(np.float64))
+
+    def model_bytes(self) -> memoryview:
+        """The serialized model, as a view into the map"""
+        return memoryview(self.section('model'))
+
+    def verify(self):
+        """Raise ValueError if the content does not match the stored hash"""
+        sections = self.metadata['sections']
+        # Sections are hashed in file order; the JSON header stores them sorted by name
+        payload = [self.section(name).tobytes() for name in sorted(sections, key=lambda name: sections[name]['offset'])]
+        if _content_hash(self.metadata, payload) != self.sha256:
+            raise ValueError(f"{self.path} is corrupt: content hash mismatch")
+
+    def create_interpreter(self, num_threads: int = 1):
+        """TFLite interpreter for a 'tflite' artifact"""
+        import tensorflow as tf
+
+        if self.model_format != 'tflite':
+            raise ValueError(f"Artifact holds a {self.model_format} model, not tflite")
+        return tf.lite.Interpreter(model_content=bytes(self.model_bytes()), num_threads=num_threads)
+
+    def load_keras_model(self):
+        """Keras model for a 'keras' artifact"""
+        from tensorflow import keras
+
+        if self.model_format != 'keras':
+            raise ValueError(f"Artifact holds a {self.model_format} model, not keras")
+        # Keras only loads archives from a path
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'model.keras')
+            with open(path, 'wb') as f:
+                f.write(self.model_bytes())
+            return keras.models.load_model(path)
+
+    def close(self):
+        try:
+            self._map.close()
+        except BufferError:
+            # Section views are still referenced; the map closes when they are released
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
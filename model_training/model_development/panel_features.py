@@ -0,0 +1,226 @@
+"""
+Panel Features
+Group-wise feature engineering for long-format multi-symbol datasets
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Kept free of TensorFlow imports: pool workers import this module
+
+
+def panel_from_frames(frames: Dict[str, pd.DataFrame], symbol_column: str = 'symbol') -> pd.DataFrame:
+    """
+    Stack per-symbol OHLCV DataFrames into one long-format panel
+
+    Args:
+        frames: Symbol -> DataFrame indexed by timestamp
+        symbol_column: Name of the added symbol column
+    """
+    return pd.concat([df.assign(**{symbol_column: symbol}) for symbol, df in frames.items()])
+
+
+def compute_panel_features(panel: pd.DataFrame, feature_params: Dict, feature_columns: List[str],
+                           symbol_column: str = 'symbol') -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    TradingModelTrainer.prepare_features for every symbol of a panel at once
+
+    The panel must be sorted by symbol, then time. Every indicator is a
+    grouped pandas operation (rolling, ewm, diff, shift per symbol), so no
+    window ever reads another symbol's bars and the results match running
+    prepare_features on each symbol separately.
+
+    Returns:
+        features (N, len(feature_columns)), targets (N,), symbol codes (N,) and timestamps (N,)
+    """
+    p = feature_params
+    df = panel.reset_index(names='timestamp')
+    codes = df[symbol_column]
+    close = df['Close']
+    by_symbol = close.groupby(codes, sort=False)
+
+    def rolling(series: pd.Series, window: int, method: str = 'mean') -> pd.Series:
+        result = getattr(series.groupby(codes, sort=False).rolling(window), method)()
+        return result.reset_index(level=0, drop=True)
+
+    def ewm(series: pd.Series, span: int) -> pd.Series:
+        return series.groupby(codes, sort=False).ewm(span=span).mean().reset_index(level=0, drop=True)
+
+    # RSI
+    delta = by_symbol.diff()
+    gain = rolling(delta.where(delta > 0, 0), p['rsi_period'])
+    loss = rolling(-delta.where(delta < 0, 0), p['rsi_period'])
+    df['rsi'] = 100 - (100 / (1 + gain / loss))
+
+    # MACD
+    df['macd'] = ewm(close, p['macd_fast']) - ewm(close, p['macd_slow'])
+    df['macd_signal'] = ewm(df['macd'], p['macd_signal'])
+
+    # Bollinger Bands
+    df['bb_middle'] = rolling(close, p['bb_period'])
+    bb_std = rolling(close, p['bb_period'], 'std')
+    df['bb_upper'] = df['bb_middle'] + (bb_std * p['bb_std_dev'])
+    df['bb_lower'] = df['bb_middle'] - (bb_std * p['bb_std_dev'])
+
+    df['sma_20'] = rolling(close, p['sma_short'])
+    df['sma_50'] = rolling(close, p['sma_long'])
+
+    # Volatility and price change
+    df['price_change'] = close / by_symbol.shift(1) - 1
+    df['volatility'] = rolling(df['price_change'], p['volatility_window'], 'std')
+
+    # Volume indicators
+    df['volume_sma'] = rolling(df['Volume'], p['volume_window'])
+    df['volume_ratio'] = df['Volume'] / df['volume_sma']
+    df['high_low_ratio'] = df['High'] / df['Low']
+
+    df = df.dropna()
+
+    # Labels look label_horizon bars ahead within the same symbol
+    future_close = df['Close'].groupby(df[symbol_column], sort=False).shift(-p['label_horizon'])
+    future_return = future_close / df['Close'] - 1
+    threshold = p['label_threshold']
+    y = np.where(future_return > threshold, 2, np.where(future_return < -threshold, 0, 1))
+
+    return (df[feature_columns].values, y.astype(int), df[symbol_column].to_numpy(),
+            df['timestamp'].to_numpy())
+
+
+def _compute_chunk(args):
+    return compute_panel_features(*args)
+
+
+class PanelDataset:
+    """
+    Features of a multi-symbol panel, one contiguous segment per symbol
+
+    Rows of each symbol are stored together in time order; offsets[i] to
+    offsets[i + 1] is the segment of symbols[i].
+    """
+
+    def __init__(self, features: np.ndarray, targets: np.ndarray, symbol_codes: np.ndarray,
+                 timestamps: np.ndarray, symbols: List[str]):
+        """
+        Args:
+            features: Feature rows of every symbol (N, features)
+            targets: Labels (N,)
+            symbol_codes: Index into symbols for each row (N,), non-decreasing
+            timestamps: Bar timestamps (N,)
+            symbols: Symbol names
+        """
+        self.features = features
+        self.targets = targets
+        self.symbol_codes = symbol_codes
+        self.timestamps = timestamps
+        self.symbols = symbols
+        self.offsets = np.searchsorted(symbol_codes, np.arange(len(symbols) + 1))
+
+    def __len__(self):
+        return len(self.features)
+
+    def rows(self, symbol: str) -> slice:
+        """Row range of one symbol"""
+        code = self.symbols.index(symbol)
+        return slice(self.offsets[code], self.offsets[code + 1])
+
+    def window_index(self, sequence_length: int, stride: int = 1) -> np.ndarray:
+        """
+        Positions in create_sequences output whose windows stay inside one symbol
+
+        create_sequences over the stacked features yields window i covering
+        rows [i, i + sequence_length) with the target at row i + sequence_length;
+        only windows whose rows and target share a symbol are kept.
+        """
+        starts = [np.arange(start, end - sequence_length)[::stride]
+                  for start, end in zip(self.offsets[:-1], self.offsets[1:]) if end - start > sequence_length]
+        return np.concatenate(starts) if starts else np.empty(0, dtype=np.int64)
+
+    def window_symbols(self, index: np.ndarray) -> np.ndarray:
+        """Symbol code of each window in index"""
+        return self.symbol_codes[index]
+
+    def split_index(self, index: np.ndarray, test_fraction: float = 0.2) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Chronological train/test split of window positions, per symbol
+
+        The last test_fraction of every symbol's windows goes to the test set,
+        so the test set is later in time than training for each symbol.
+        """
+        codes = self.symbol_codes[index]
+        bounds = np.searchsorted(codes, np.arange(len(self.symbols) + 1))
+        train, test = [], []
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            split = end - int(np.ceil((end - start) * test_fraction))
+            train.append(index[start:split])
+            test.append(index[split:end])
+        return np.concatenate(train), np.concatenate(test)
+
+
+class PanelFeatureBuilder:
+    """
+    Builds a PanelDataset from a long-format multi-symbol DataFrame
+
+    The panel has one row per (symbol, bar): OHLCV columns, a symbol
+    column and a timestamp index. With num_workers > 1, symbols are split
+    into chunks of similar row counts and computed across a process pool;
+    each chunk runs the same group-wise computation.
+    """
+
+    def __init__(self, feature_params: Optional[Dict] = None, symbol_column: str = 'symbol',
+                 num_workers: int = 1, chunks_per_worker: int = 4, feature_columns: Optional[List[str]] = None):
+        """
+        Args:
+            feature_params: Overrides for DEFAULT_FEATURE_PARAMS
+            symbol_column: Column holding the symbol
+            num_workers: Worker processes (1 computes in-process, None uses every core)
+            chunks_per_worker: Symbol chunks per worker, for load balancing
+            feature_columns: Output columns (defaults to FEATURE_COLUMNS); extra ones are
+                taken from the panel as-is
+        """
+        from model_development.train_trading_model import DEFAULT_FEATURE_PARAMS, FEATURE_COLUMNS
+
+        self.feature_params = {**DEFAULT_FEATURE_PARAMS, **(feature_params or {})}
+        self.feature_columns = feature_columns or FEATURE_COLUMNS
+        self.symbol_column = symbol_column
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.chunks_per_worker = chunks_per_worker
+
+    def _sorted(self, panel: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
+        codes, symbols = pd.factorize(panel[self.symbol_column], sort=True)
+        order = np.lexsort((panel.index.to_numpy(), codes))
+        panel = panel.iloc[order].copy()
+        panel[self.symbol_column] = codes[order]
+        return panel, list(symbols)
+
+    def _chunks(self, panel: pd.DataFrame, num_symbols: int) -> List[pd.DataFrame]:
+        """Contiguous symbol ranges with roughly equal row counts"""
+        codes = panel[self.symbol_column].to_numpy()
+        offsets = np.searchsorted(codes, np.arange(num_symbols + 1))
+        num_chunks = min(num_symbols, self.num_workers * self.chunks_per_worker)
+        targets = np.linspace(0, len(panel), num_chunks + 1)
+        cuts = np.unique(offsets[np.searchsorted(offsets, targets[1:-1])])
+        bounds = [0, *cuts[(cuts > 0) & (cuts < len(panel))], len(panel)]
+        return [panel.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+    def build(self, panel: pd.DataFrame) -> PanelDataset:
+        """Compute features and labels for every symbol in the panel"""
+        panel, symbols = self._sorted(panel)
+        args = (self.feature_params, self.feature_columns, self.symbol_column)
+
+        if self.num_workers <= 1 or len(symbols) <= 1:
+            parts = [compute_panel_features(panel, *args)]
+        else:
+            chunks = self._chunks(panel, len(symbols))
+            print(f"Computing features for {len(symbols)} symbols in {len(chunks)} chunks "
+                  f"on {self.num_workers} workers")
+            with ProcessPoolExecutor(max_workers=self.num_workers,
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                parts = list(executor.map(_compute_chunk, [(chunk, *args) for chunk in chunks]))
+
+        features, targets, codes, timestamps = (np.concatenate(column) for column in zip(*parts))
+        return PanelDataset(features, targets, codes, timestamps, symbols)
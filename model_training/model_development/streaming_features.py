@@ -0,0 +1,378 @@
+"""
+Streaming Feature Engine
+Incrementally updates the TradingModelTrainer feature set one bar at a time
+"""
+
+import json
+import math
+import os
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from model_development.train_trading_model import FEATURE_COLUMNS
+
+
+class RollingWindow:
+    """
+    Fixed-size window with O(1) mean and sample standard deviation
+
+    Follows pandas' rolling mean/var: the sum is Kahan-compensated, a
+    window of identical values has exactly that mean and zero deviation,
+    and a window with no negative (or no positive) values never gets a
+    mean of the other sign. Without this, a flat-price stretch leaves a
+    tiny negative average loss and RSI far outside 0-100.
+    """
+
+    # Recompute the moments from scratch every N updates to bound float drift
+    RESYNC_INTERVAL = 10000
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.sum = 0.0
+        self.compensation = 0.0
+        self.mean_value = 0.0
+        self.m2 = 0.0
+        self.negatives = 0
+        self.positives = 0
+        self.same_run = 0
+        self.updates = 0
+
+    def _accumulate(self, value: float):
+        # Kahan summation, as in pandas' rolling sum
+        y = value - self.compensation
+        t = self.sum + y
+        self.compensation = (t - self.sum) - y
+        self.sum = t
+
+    def push(self, value: float):
+        """Add a value, evicting the oldest one once the window is full"""
+        self.same_run = self.same_run + 1 if self.values and value == self.values[-1] else 1
+        self.negatives += value < 0
+        self.positives += value > 0
+
+        if len(self.values) == self.size:
+            old = self.values[0]
+            self.values.append(value)
+            self.negatives -= old < 0
+            self.positives -= old > 0
+            self._accumulate(value - old)
+            old_mean = self.mean_value
+            self.mean_value = self.sum / self.size
+            self.m2 += (value - old) * (value - self.mean_value + old - old_mean)
+        else:
+            self.values.append(value)
+            self._accumulate(value)
+            delta = value - self.mean_value
+            self.mean_value = self.sum / len(self.values)
+            self.m2 += delta * (value - self.mean_value)
+
+        self.updates += 1
+        if self.updates % self.RESYNC_INTERVAL == 0:
+            self._resync()
+
+    def _resync(self):
+        values = np.fromiter(self.values, dtype=np.float64)
+        self.sum = math.fsum(self.values)
+        self.compensation = 0.0
+        self.mean_value = self.sum / len(values)
+        self.m2 = float(((values - self.mean_value) ** 2).sum())
+        self.negatives = int((values < 0).sum())
+        self.positives = int((values > 0).sum())
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.size
+
+    @property
+    def constant(self) -> bool:
+        return self.same_run >= self.size
+
+    def mean(self) -> float:
+        """Window mean, NaN until the window is full (pandas rolling semantics)"""
+        if not self.full:
+            return math.nan
+        if self.constant:
+            return self.values[-1]
+        if (not self.negatives and self.mean_value < 0) or (not self.positives and self.mean_value > 0):
+            return 0.0
+        return self.mean_value
+
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1), NaN until the window is full"""
+        if not self.full or self.size < 2:
+            return math.nan
+        if self.constant:
+            return 0.0
+        return math.sqrt(max(self.m2, 0.0) / (self.size - 1))
+
+    def state_dict(self) -> Dict:
+        return {'values': list(self.values), 'updates': self.updates}
+
+    def load_state_dict(self, state: Dict):
+        self.values = deque(state['values'], maxlen=self.size)
+        self.updates = state['updates']
+        self.same_run = 0
+        for value in reversed(self.values):
+            if value != self.values[-1]:
+                break
+            self.same_run += 1
+        if self.values:
+            self._resync()
+        else:
+            self.sum = self.compensation = self.mean_value = self.m2 = 0.0
+            self.negatives = self.positives = 0
+
+
+class EWMean:
+    """Exponentially weighted mean matching pandas ewm(span=...).mean() with adjust=True"""
+
+    def __init__(self, span: int):
+        self.span = span
+        self.decay = 1.0 - 2.0 / (span + 1.0)
+        self.numerator = 0.0
+        self.denominator = 0.0
+
+    def push(self, value: float) -> float:
+        self.numerator = value + self.decay * self.numerator
+        self.denominator = 1.0 + self.decay * self.denominator
+        return self.numerator / self.denominator
+
+    def state_dict(self) -> Dict:
+        return {'numerator': self.numerator, 'denominator': self.denominator}
+
+    def load_state_dict(self, state: Dict):
+        self.numerator = state['numerator']
+        self.denominator = state['denominator']
+
+
+class StreamingFeatureEngine:
+    """
+    Stateful, O(1)-per-bar version of TradingModelTrainer.prepare_features
+
+    Produces the same FEATURE_COLUMNS vector as the batch pipeline for the
+    latest bar, so training and live scoring share one feature definition.
+    """
+
+    def __init__(self, rsi_period: int = 14, macd_fast: int = 12, macd_slow: int = 26,
+                 macd_signal: int = 9, bb_period: int = 20, bb_std_dev: int = 2,
+                 sma_short: int = 20, sma_long: int = 50, volatility_window: int = 20,
+                 volume_window: int = 20):
+        self.params = {
+            'rsi_period': rsi_period,
+            'macd_fast': macd_fast,
+            'macd_slow': macd_slow,
+            'macd_signal': macd_signal,
+            'bb_period': bb_period,
+            'bb_std_dev': bb_std_dev,
+            'sma_short': sma_short,
+            'sma_long': sma_long,
+            'volatility_window': volatility_window,
+            'volume_window': volume_window,
+        }
+        self.reset()
+
+    def reset(self):
+        """Clear all indicator state"""
+        p = self.params
+        self.gains = RollingWindow(p['rsi_period'])
+        self.losses = RollingWindow(p['rsi_period'])
+        self.ema_fast = EWMean(p['macd_fast'])
+        self.ema_slow = EWMean(p['macd_slow'])
+        self.ema_signal = EWMean(p['macd_signal'])
+        self.bb_window = RollingWindow(p['bb_period'])
+        self.sma_short = RollingWindow(p['sma_short'])
+        self.sma_long = RollingWindow(p['sma_long'])
+        self.returns = RollingWindow(p['volatility_window'])
+        self.volumes = RollingWindow(p['volume_window'])
+        self.prev_close = None
+        self.bar_count = 0
+        self.latest = None
+
+    @property
+    def warmup_bars(self) -> int:
+        """Bars needed before every feature is defined"""
+        p = self.params
+        return max(p['rsi_period'], p['bb_period'], p['sma_short'], p['sma_long'],
+                   p['volatility_window'] + 1, p['volume_window'])
+
+    @property
+    def is_ready(self) -> bool:
+        return self.latest is not None and not np.isnan(self.latest).any()
+
+    def update(self, open_: float, high: float, low: float, close: float, volume: float) -> Optional[np.ndarray]:
+        """
+        Consume one OHLCV bar
+
+        Returns:
+            Feature vector ordered as FEATURE_COLUMNS, or None while any
+            indicator is still warming up (rows prepare_features would drop)
+        """
+        close = float(close)
+        volume = float(volume)
+
+        # RSI: the first diff is NaN and pandas' where() turns it into a 0 gain/loss
+        if self.prev_close is None:
+            delta = math.nan
+            gain = loss = 0.0
+        else:
+            delta = close - self.prev_close
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+        self.gains.push(gain)
+        self.losses.push(loss)
+        rsi = _rsi(self.gains.mean(), self.losses.mean())
+
+        # MACD
+        macd = self.ema_fast.push(close) - self.ema_slow.push(close)
+        macd_signal = self.ema_signal.push(macd)
+
+        # Bollinger Bands and moving averages
+        self.bb_window.push(close)
+        bb_middle = self.bb_window.mean()
+        bb_std = self.bb_window.std()
+        bb_upper = bb_middle + bb_std * self.params['bb_std_dev']
+        bb_lower = bb_middle - bb_std * self.params['bb_std_dev']
+        self.sma_short.push(close)
+        self.sma_long.push(close)
+
+        # Volatility of returns; a window holding the first (NaN) return stays NaN
+        if self.prev_close is None:
+            price_change = math.nan
+        else:
+            price_change = close / self.prev_close - 1
+            self.returns.push(price_change)
+        volatility = self.returns.std()
+
+        # Volume
+        self.volumes.push(volume)
+        volume_ratio = _divide(volume, self.volumes.mean())
+
+        self.prev_close = close
+        self.bar_count += 1
+
+        self.latest = np.array([
+            open_, high, low, close, volume,
+            rsi, macd, macd_signal,
+            bb_upper, bb_middle, bb_lower,
+            self.sma_short.mean(), self.sma_long.mean(), volatility,
+            volume_ratio, price_change, _divide(float(high), float(low))
+        ], dtype=np.float64)
+
+        return self.latest if self.is_ready else None
+
+    def update_frame(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Feed every bar of an OHLCV DataFrame through the engine
+
+        Returns:
+            Feature matrix for the bars that have all features defined, the
+            same rows prepare_features keeps before labelling
+        """
+        rows = []
+        for bar in df[['Open', 'High', 'Low', 'Close', 'Volume']].itertuples(index=False):
+            features = self.update(*bar)
+            if features is not None:
+                rows.append(features.copy())
+        if not rows:
+            return np.empty((0, len(FEATURE_COLUMNS)))
+        return np.vstack(rows)
+
+    def state_dict(self) -> Dict:
+        """Serializable snapshot of the engine state"""
+        return {
+            'params': dict(self.params),
+            'prev_close': self.prev_close,
+            'bar_count': self.bar_count,
+            'latest': None if self.latest is None else self.latest.tolist(),
+            'gains': self.gains.state_dict(),
+            'losses': self.losses.state_dict(),
+            'ema_fast': self.ema_fast.state_dict(),
+            'ema_slow': self.ema_slow.state_dict(),
+            'ema_signal': self.ema_signal.state_dict(),
+            'bb_window': self.bb_window.state_dict(),
+            'sma_short': self.sma_short.state_dict(),
+            'sma_long': self.sma_long.state_dict(),
+            'returns': self.returns.state_dict(),
+            'volumes': self.volumes.state_dict(),
+        }
+
+    def load_state_dict(self, state: Dict):
+        """Restore a snapshot produced by state_dict"""
+        self.params = dict(state['params'])
+        self.reset()
+        self.prev_close = state['prev_close']
+        self.bar_count = state['bar_count']
+        self.latest = None if state['latest'] is None else np.array(state['latest'], dtype=np.float64)
+        for name in ('gains', 'losses', 'ema_fast', 'ema_slow', 'ema_signal', 'bb_window',
+                     'sma_short', 'sma_long', 'returns', 'volumes'):
+            getattr(self, name).load_state_dict(state[name])
+
+    def save_checkpoint(self, filepath: str):
+        """Write the engine state to a JSON checkpoint"""
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(filepath, 'w') as f:
+            json.dump(self.state_dict(), f)
+
+    @classmethod
+    def load_checkpoint(cls, filepath: str) -> 'StreamingFeatureEngine':
+        """Create an engine from a JSON checkpoint"""
+        with open(filepath) as f:
+            state = json.load(f)
+        engine = cls(**state['params'])
+        engine.load_state_dict(state)
+        return engine
+
+
+def _divide(numerator: float, denominator: float) -> float:
+    """Division with NumPy semantics (x/0 -> +-inf, 0/0 -> NaN)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return float(np.float64(numerator) / np.float64(denominator))
+
+
+def _rsi(avg_gain: float, avg_loss: float) -> float:
+    rs = _divide(avg_gain, avg_loss)
+    return 100 - (100 / (1 + rs))
+
+
+def compare_with_batch(df: pd.DataFrame, atol: float = 1e-6) -> float:
+    """
+    Check the streaming engine against TradingModelTrainer.prepare_features
+
+    Rows are matched on the bar timestamp; both sides must define features
+    for the same bars, and the matched values must agree within atol.
+
+    Returns:
+        Maximum absolute difference between the two feature matrices
+    """
+    from model_development.train_trading_model import TradingModelTrainer
+
+    batch = TradingModelTrainer().compute_indicators(df)[FEATURE_COLUMNS]
+    engine = StreamingFeatureEngine()
+    rows, timestamps = [], []
+    for timestamp, bar in zip(df.index, df[['Open', 'High', 'Low', 'Close', 'Volume']].itertuples(index=False)):
+        features = engine.update(*bar)
+        if features is not None:
+            rows.append(features.copy())
+            timestamps.append(timestamp)
+    stream = pd.DataFrame(rows, index=pd.Index(timestamps), columns=FEATURE_COLUMNS)
+
+    only_batch = batch.index.difference(stream.index)
+    only_stream = stream.index.difference(batch.index)
+    if len(only_batch) or len(only_stream):
+        first = min([*only_batch[:1], *only_stream[:1]])
+        raise ValueError(f"{len(only_batch)} bars only in batch and {len(only_stream)} only in streaming "
+                         f"features (first at {first})")
+
+    stream = stream.loc[batch.index]
+    difference = np.abs(batch.values - stream.values)
+    max_diff = float(np.nanmax(difference)) if difference.size else 0.0
+    if not np.allclose(batch.values, stream.values, atol=atol, rtol=1e-9):
+        worst = batch.columns[np.nanargmax(difference.max(axis=0))]
+        raise ValueError(f"Streaming features diverge from batch features (max diff {max_diff:.3e} in {worst})")
+    return max_diff
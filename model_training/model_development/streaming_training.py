@@ -0,0 +1,304 @@
+"""
+Streaming Training Pipeline
+Trains TradingModelTrainer models from on-disk feature chunks with tf.data
+"""
+
+import json
+import os
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+from sklearn.preprocessing import StandardScaler
+from tensorflow import keras
+
+from model_development.streaming_features import StreamingFeatureEngine
+from model_development.throughput import EpochThroughput
+from model_development.train_trading_model import FEATURE_COLUMNS, TradingModelTrainer
+
+MANIFEST_FILE = "manifest.json"
+
+
+class FeatureChunkWriter:
+    """
+    Computes features from successive OHLCV frames and writes them to disk
+
+    Indicator state carries over between frames, so the chunks on disk are
+    identical to running the trainer's prepare_features on the concatenated
+    history. The scaler statistics are accumulated as chunks are flushed.
+    """
+
+    def __init__(self, directory: str, rows_per_chunk: int = 1_000_000,
+                 trainer: Optional[TradingModelTrainer] = None):
+        """
+        Args:
+            directory: Directory for the chunks and manifest (created if missing)
+            rows_per_chunk: Feature rows per chunk file
+            trainer: Trainer whose feature_params and feature_columns are used
+                (defaults to TradingModelTrainer())
+        """
+        trainer = trainer or TradingModelTrainer()
+        self.directory = directory
+        self.rows_per_chunk = rows_per_chunk
+        self.feature_params = dict(trainer.feature_params)
+        self.feature_columns = list(trainer.feature_columns)
+        self.extra_columns = self.feature_columns[len(FEATURE_COLUMNS):]
+        self.label_horizon = self.feature_params['label_horizon']
+        self.label_threshold = self.feature_params['label_threshold']
+        self.engine = StreamingFeatureEngine(**{
+            name: value for name, value in self.feature_params.items() if not name.startswith('label_')
+        })
+        self.chunks = []
+        self.total_rows = 0
+        self.scaler = StandardScaler()
+
+        # Rows waiting for the close label_horizon bars ahead
+        self._pending_rows = []
+        self._pending_closes = []
+        self._features = []
+        self._targets = []
+
+        os.makedirs(directory, exist_ok=True)
+
+    def append(self, df: pd.DataFrame):
+        """Feed the next OHLCV frame, in chronological order"""
+        close_index = FEATURE_COLUMNS.index('Close')
+        horizon = self.label_horizon
+        extras = df[self.extra_columns].to_numpy(dtype=np.float64) if self.extra_columns else None
+        for position, bar in enumerate(df[['Open', 'High', 'Low', 'Close', 'Volume']].itertuples(index=False)):
+            features = self.engine.update(*bar)
+            if features is None:
+                continue
+            if extras is not None:
+                # prepare_features drops rows with a missing extra column, like warm-up rows
+                if np.isnan(extras[position]).any():
+                    continue
+                features = np.concatenate([features, extras[position]])
+            self._pending_rows.append(features.copy())
+            self._pending_closes.append(features[close_index])
+            if len(self._pending_rows) > horizon:
+                close = self._pending_closes.pop(0)
+                future_return = self._pending_closes[horizon - 1] / close - 1
+                self._emit(self._pending_rows.pop(0), self._label(future_return))
+
+    def close(self) -> Dict:
+        """
+        Flush the remaining rows and write the manifest
+
+        Returns:
+            The manifest dictionary
+        """
+        # prepare_features labels rows without a future close as Hold
+        for row in self._pending_rows:
+            self._emit(row, 1)
+        self._pending_rows = []
+        self._pending_closes = []
+        self._flush()
+
+        if self.total_rows == 0:
+            raise ValueError("No complete feature rows were produced; more bars are needed")
+
+        manifest = {
+            'feature_columns': self.feature_columns,
+            'feature_params': self.feature_params,
+            'label_horizon': self.label_horizon,
+            'label_threshold': self.label_threshold,
+            'total_rows': self.total_rows,
+            'chunks': self.chunks,
+            'scaler_mean': self.scaler.mean_.tolist(),
+            'scaler_var': self.scaler.var_.tolist(),
+        }
+        with open(os.path.join(self.directory, MANIFEST_FILE), 'w') as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+    def _label(self, future_return: float) -> int:
+        if future_return > self.label_threshold:
+            return 2
+        if future_return < -self.label_threshold:
+            return 0
+        return 1
+
+    def _emit(self, row: np.ndarray, target: int):
+        self._features.append(row)
+        self._targets.append(target)
+        if len(self._features) >= self.rows_per_chunk:
+            self._flush()
+
+    def _flush(self):
+        if not self._features:
+            return
+        features = np.vstack(self._features)
+        targets = np.asarray(self._targets, dtype=np.int8)
+
+        name = f"chunk_{len(self.chunks):05d}"
+        np.save(os.path.join(self.directory, f"{name}_features.npy"), features.astype(np.float32))
+        np.save(os.path.join(self.directory, f"{name}_targets.npy"), targets)
+        self.chunks.append({'name': name, 'rows': len(features)})
+
+        self.total_rows += len(features)
+        self.scaler.partial_fit(features)
+        self._features = []
+        self._targets = []
+
+
+def write_feature_chunks(frames: Iterable[pd.DataFrame], directory: str, rows_per_chunk: int = 1_000_000,
+                         trainer: Optional[TradingModelTrainer] = None) -> Dict:
+    """Write feature chunks for a sequence of OHLCV frames and return the manifest"""
+    writer = FeatureChunkWriter(directory, rows_per_chunk=rows_per_chunk, trainer=trainer)
+    for df in frames:
+        writer.append(df)
+    return writer.close()
+
+
+class ChunkedFeatureSource:
+    """Random row access over memory-mapped feature chunks"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST_FILE)) as f:
+            self.manifest = json.load(f)
+
+        self.features = []
+        self.targets = []
+        for chunk in self.manifest['chunks']:
+            base = os.path.join(directory, chunk['name'])
+            self.features.append(np.load(f"{base}_features.npy", mmap_mode='r'))
+            self.targets.append(np.load(f"{base}_targets.npy", mmap_mode='r'))
+
+        rows = [chunk['rows'] for chunk in self.manifest['chunks']]
+        self.offsets = np.concatenate([[0], np.cumsum(rows)]).astype(np.int64)
+        self.mean = np.asarray(self.manifest['scaler_mean'], dtype=np.float32)
+        scale = np.sqrt(np.asarray(self.manifest['scaler_var']))
+        scale[scale == 0] = 1.0
+        self.scale = scale.astype(np.float32)
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    def read(self, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Read scaled features and targets for global rows [start, stop)"""
+        first = int(np.searchsorted(self.offsets, start, side='right')) - 1
+        parts_x, parts_y = [], []
+        row = start
+        chunk = first
+        while row < stop:
+            local_start = row - self.offsets[chunk]
+            local_stop = min(stop, self.offsets[chunk + 1]) - self.offsets[chunk]
+            parts_x.append(self.features[chunk][local_start:local_stop])
+            parts_y.append(self.targets[chunk][local_start:local_stop])
+            row = self.offsets[chunk] + local_stop
+            chunk += 1
+        X = np.concatenate(parts_x) if len(parts_x) > 1 else np.array(parts_x[0])
+        y = np.concatenate(parts_y) if len(parts_y) > 1 else np.array(parts_y[0])
+        X -= self.mean
+        X /= self.scale
+        return X, y
+
+    def fitted_scaler(self) -> StandardScaler:
+        """StandardScaler carrying the chunk statistics, for TradingModelTrainer.save_model"""
+        scaler = StandardScaler()
+        scaler.mean_ = np.asarray(self.manifest['scaler_mean'])
+        scaler.var_ = np.asarray(self.manifest['scaler_var'])
+        scaler.scale_ = self.scale.astype(np.float64)
+        scaler.n_features_in_ = len(scaler.mean_)
+        scaler.n_samples_seen_ = len(self)
+        return scaler
+
+
+def make_window_dataset(source: ChunkedFeatureSource, target_start: int, target_stop: int,
+                        sequence_length: int = 60, batch_size: int = 32, block_size: int = 4096,
+                        shuffle: bool = False, shuffle_buffer: int = 16384) -> tf.data.Dataset:
+    """
+    Build a tf.data pipeline of (window, label) batches
+
+    Windows predict target rows [target_start, target_stop). Blocks of
+    block_size windows are read and windowed in parallel, so only a few
+    blocks are ever resident.
+    """
+    starts = np.arange(target_start, target_stop, block_size, dtype=np.int64)
+    blocks = np.stack([starts, np.minimum(starts + block_size, target_stop)], axis=1)
+    num_features = len(source.mean)
+
+    def load_block(block):
+        start, stop = int(block[0]), int(block[1])
+        rows, targets = source.read(start - sequence_length, stop)
+        windows = np.lib.stride_tricks.sliding_window_view(rows, sequence_length, axis=0)
+        X = np.ascontiguousarray(windows[:-1].transpose(0, 2, 1))
+        y = targets[sequence_length:].astype(np.int32)
+        return X, y
+
+    def load(block):
+        X, y = tf.numpy_function(load_block, [block], (tf.float32, tf.int32))
+        X.set_shape((None, sequence_length, num_features))
+        y.set_shape((None,))
+        return X, y
+
+    dataset = tf.data.Dataset.from_tensor_slices(blocks)
+    if shuffle:
+        dataset = dataset.shuffle(len(blocks), reshuffle_each_iteration=True)
+    dataset = dataset.map(load, num_parallel_calls=tf.data.AUTOTUNE, deterministic=not shuffle)
+    dataset = dataset.unbatch()
+    if shuffle:
+        dataset = dataset.shuffle(shuffle_buffer)
+    return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+
+def train_streaming(trainer: TradingModelTrainer, directory: str, epochs: int = 50,
+                    batch_size: int = 32, sequence_length: int = 60, validation_split: float = 0.2,
+                    block_size: int = 4096, shuffle_buffer: int = 16384):
+    """
+    Train a TradingModelTrainer model from feature chunks on disk
+
+    Mirrors TradingModelTrainer.train: the last validation_split of the
+    windows, in time order, is held out for validation.
+
+    Args:
+        trainer: Trainer whose model_type selects the architecture
+        directory: Directory written by FeatureChunkWriter
+        epochs: Number of training epochs
+        batch_size: Batch size for training
+        sequence_length: Length of input sequences
+        validation_split: Fraction of windows held out at the end
+        block_size: Windows read per parallel block
+        shuffle_buffer: Window-level shuffle buffer for training
+    """
+    source = ChunkedFeatureSource(directory)
+    if source.manifest['feature_columns'] != trainer.feature_columns:
+        raise ValueError(f"Chunks in {directory} hold {source.manifest['feature_columns']}, "
+                         f"the trainer expects {trainer.feature_columns}")
+    if 'feature_params' in source.manifest:
+        trainer.feature_params = dict(source.manifest['feature_params'])
+    num_windows = len(source) - sequence_length
+    if num_windows <= 0:
+        raise ValueError(f"Need more than {sequence_length} rows, found {len(source)}")
+
+    split = sequence_length + num_windows - int(np.ceil(num_windows * validation_split))
+    train_data = make_window_dataset(source, sequence_length, split, sequence_length, batch_size,
+                                     block_size, shuffle=True, shuffle_buffer=shuffle_buffer)
+    val_data = make_window_dataset(source, split, len(source), sequence_length, batch_size, block_size)
+
+    trainer.scaler = source.fitted_scaler()
+    trainer.sequence_length = sequence_length
+    trainer.model = trainer.build_model((sequence_length, len(source.mean)))
+
+    throughput = EpochThroughput(split - sequence_length)
+    trainer.history = trainer.model.fit(
+        train_data,
+        epochs=epochs,
+        validation_data=val_data,
+        verbose=1,
+        callbacks=[
+            keras.callbacks.EarlyStopping(monitor='val_loss', patience=5, restore_best_weights=True),
+            keras.callbacks.ReduceLROnPlateau(monitor='val_loss', factor=0.5, patience=3),
+            throughput
+        ]
+    )
+    trainer.record_throughput(throughput)
+
+    test_loss, test_accuracy = trainer.model.evaluate(val_data, verbose=0)
+    print(f"Test Loss: {test_loss:.4f}")
+    print(f"Test Accuracy: {test_accuracy:.4f}")
+
+    return trainer.history
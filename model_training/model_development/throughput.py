@@ -0,0 +1,144 @@
+"""
+Training Throughput
+Opt-in CPU throughput settings and per-epoch samples/sec reporting
+"""
+
+import os
+import time
+from typing import Dict, List, Optional
+
+import tensorflow as tf
+from tensorflow import keras
+
+LSTM_LAYOUTS = ('default', 'unrolled')
+
+
+def cpu_supports_bfloat16() -> bool:
+    """Whether the CPU has native bfloat16 math (AVX512-BF16 or AMX)"""
+    try:
+        with open('/proc/cpuinfo') as f:
+            flags = f.read()
+    except OSError:
+        return False
+    return 'avx512_bf16' in flags or 'amx_bf16' in flags
+
+
+class ThroughputConfig:
+    """
+    Settings for TradingModelTrainer's throughput mode
+
+    - XLA-compiled train steps (jit_compile)
+    - bfloat16 mixed precision: layers compute in bfloat16 and keep float32
+      weights, and the softmax output and loss stay in float32. 'auto'
+      enables it only on CPUs with native bfloat16 support; elsewhere it
+      would be emulated and slower
+    - explicit intra/inter-op thread pools
+    - LSTM layout: 'default' keeps Keras' LSTM (which already uses the
+      fused cuDNN kernel on GPU nodes); 'unrolled' unrolls the timestep
+      loop so XLA can fuse it into one program, the CPU counterpart of a
+      fused kernel for short sequences
+    """
+
+    def __init__(self, jit_compile: bool = True, mixed_precision: str = 'auto',
+                 intra_op_threads: Optional[int] = None, inter_op_threads: Optional[int] = 2,
+                 lstm_layout: str = 'default'):
+        """
+        Args:
+            jit_compile: Compile train steps with XLA
+            mixed_precision: 'auto', 'bfloat16' or 'off'
+            intra_op_threads: Threads per op (defaults to the core count)
+            inter_op_threads: Ops run concurrently
+            lstm_layout: 'default' or 'unrolled'
+        """
+        if mixed_precision not in ('auto', 'bfloat16', 'off'):
+            raise ValueError(f"Unknown mixed precision mode: {mixed_precision}")
+        if lstm_layout not in LSTM_LAYOUTS:
+            raise ValueError(f"Unknown LSTM layout: {lstm_layout}")
+        self.jit_compile = jit_compile
+        self.mixed_precision = mixed_precision
+        self.intra_op_threads = intra_op_threads or os.cpu_count() or 1
+        self.inter_op_threads = inter_op_threads
+        self.lstm_layout = lstm_layout
+
+    @property
+    def use_bfloat16(self) -> bool:
+        if self.mixed_precision == 'auto':
+            return cpu_supports_bfloat16()
+        return self.mixed_precision == 'bfloat16'
+
+    def apply(self):
+        """Configure TF threading and the Keras dtype policy; call before building the model"""
+        try:
+            tf.config.threading.set_intra_op_parallelism_threads(self.intra_op_threads)
+            if self.inter_op_threads:
+                tf.config.threading.set_inter_op_parallelism_threads(self.inter_op_threads)
+        except RuntimeError as e:
+            # Thread pools are fixed once the TF runtime has started
+            print(f"Thread settings not applied: {e}")
+        keras.mixed_precision.set_global_policy('mixed_bfloat16' if self.use_bfloat16 else 'float32')
+
+    def lstm_kwargs(self) -> Dict:
+        """Extra LSTM layer arguments for the configured layout"""
+        if self.lstm_layout == 'unrolled':
+            return {'unroll': True}
+        return {}
+
+    def describe(self) -> Dict:
+        return {
+            'jit_compile': self.jit_compile,
+            'mixed_precision': 'bfloat16' if self.use_bfloat16 else 'float32',
+            'intra_op_threads': self.intra_op_threads,
+            'inter_op_threads': self.inter_op_threads,
+            'lstm_layout': self.lstm_layout,
+        }
+
+
+class EpochThroughput(keras.callbacks.Callback):
+    """Records training wall time and samples/sec for every epoch, excluding validation"""
+
+    def __init__(self, num_samples: int, verbose: bool = True):
+        """
+        Args:
+            num_samples: Training samples per epoch
+            verbose: Print a line per epoch
+        """
+        super().__init__()
+        self.num_samples = num_samples
+        self.verbose = verbose
+        self.epochs: List[Dict] = []
+        self._started = None
+        self._validation_started = None
+        self._validation_seconds = 0.0
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._started = time.perf_counter()
+        self._validation_seconds = 0.0
+
+    def on_test_begin(self, logs=None):
+        self._validation_started = time.perf_counter()
+
+    def on_test_end(self, logs=None):
+        if self._validation_started is not None:
+            self._validation_seconds += time.perf_counter() - self._validation_started
+            self._validation_started = None
+
+    def on_epoch_end(self, epoch, logs=None):
+        # fit() runs validation inside the epoch; only the training pass counts
+        seconds = time.perf_counter() - self._started - self._validation_seconds
+        record = {'epoch': epoch + 1, 'seconds': seconds, 'samples_per_sec': self.num_samples / seconds,
+                  'validation_seconds': self._validation_seconds}
+        self.epochs.append(record)
+        if self.verbose:
+            print(f"Epoch {epoch + 1}: {seconds:.2f}s, {record['samples_per_sec']:,.0f} samples/sec")
+
+    def summary(self) -> Dict:
+        """Totals, plus the mean rate excluding the first epoch (which includes compilation)"""
+        if not self.epochs:
+            return {}
+        steady = self.epochs[1:] or self.epochs
+        return {
+            'epochs': len(self.epochs),
+            'total_seconds': sum(record['seconds'] for record in self.epochs),
+            'first_epoch_seconds': self.epochs[0]['seconds'],
+            'samples_per_sec': sum(record['samples_per_sec'] for record in steady) / len(steady),
+        }
@@ -6,24 +6,120 @@ Trains machine learning models for trading signal generation
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
-from sklearn.model_selection import train_test_split
 import tensorflow as tf
 from tensorflow import keras
 from tensorflow.keras import layers
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List
 import os
-import pickle
+import tempfile
+
+from instrumentation.latency import METRICS
+from model_development.model_artifact import ModelArtifact, write_artifact
+from model_development.throughput import EpochThroughput, ThroughputConfig
+
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'models')
+
+# Model input columns, in the order the network sees them
+FEATURE_COLUMNS = [
+    'Open', 'High', 'Low', 'Close', 'Volume',
+    'rsi', 'macd', 'macd_signal',
+    'bb_upper', 'bb_middle', 'bb_lower',
+    'sma_20', 'sma_50', 'volatility',
+    'volume_ratio', 'price_change', 'high_low_ratio'
+]
+
+# Labels look LABEL_HORIZON bars ahead; moves beyond +-LABEL_THRESHOLD are Buy/Sell
+LABEL_HORIZON = 5
+LABEL_THRESHOLD = 0.02
+
+# Indicator periods/spans and labelling used by prepare_features
+DEFAULT_FEATURE_PARAMS = {
+    'rsi_period': 14,
+    'macd_fast': 12,
+    'macd_slow': 26,
+    'macd_signal': 9,
+    'bb_period': 20,
+    'bb_std_dev': 2,
+    'sma_short': 20,
+    'sma_long': 50,
+    'volatility_window': 20,
+    'volume_window': 20,
+    'label_horizon': LABEL_HORIZON,
+    'label_threshold': LABEL_THRESHOLD,
+}
+
+
+class WindowBatchSequence(keras.utils.PyDataset):
+    """
+    Feeds batches from a strided window view, copying one batch at a time
+    
+    index restricts the batches to a subset of window positions (e.g. the
+    windows of a panel that stay inside one symbol); sample_weight, one
+    weight per window, is yielded with each batch when given.
+    """
+    
+    def __init__(self, X: np.ndarray, y: np.ndarray, batch_size: int = 32, shuffle: bool = False,
+                 index: np.ndarray = None, sample_weight: np.ndarray = None, **kwargs):
+        super().__init__(**kwargs)
+        self.X = X
+        self.y = y
+        self.sample_weight = sample_weight
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.index = index
+        self.indices = np.arange(len(X)) if index is None else np.array(index)
+        if self.shuffle:
+            np.random.shuffle(self.indices)
+    
+    def __len__(self):
+        return int(np.ceil(len(self.indices) / self.batch_size))
+    
+    def __getitem__(self, idx):
+        start = idx * self.batch_size
+        stop = min(start + self.batch_size, len(self.indices))
+        if self.shuffle:
+            batch = np.sort(self.indices[start:stop])
+        elif self.index is not None:
+            batch = self.indices[start:stop]
+        else:
+            batch = slice(start, stop)
+        X = np.ascontiguousarray(self.X[batch])
+        if self.sample_weight is not None:
+            return X, self.y[batch], self.sample_weight[batch]
+        return X, self.y[batch]
+    
+    def on_epoch_end(self):
+        if self.shuffle:
+            np.random.shuffle(self.indices)
 
 
 class TradingModelTrainer:
     """Trains TensorFlow models for trading signal prediction"""
     
-    def __init__(self, model_type: str = "lstm"):
+    def __init__(self, model_type: str = "lstm", feature_params: Dict = None,
+                 throughput: ThroughputConfig = None, extra_feature_columns: List[str] = None):
+        """
+        Args:
+            model_type: 'lstm' or 'cnn'
+            feature_params: Overrides for DEFAULT_FEATURE_PARAMS
+            throughput: Opt-in XLA/bfloat16/threading settings (None trains with TF defaults)
+            extra_feature_columns: Columns of the input DataFrame appended to FEATURE_COLUMNS
+                (e.g. SENTIMENT_COLUMNS joined by a SentimentPipeline)
+        """
         self.model_type = model_type
+        self.feature_columns = FEATURE_COLUMNS + list(extra_feature_columns or [])
+        self.throughput = throughput
+        self.feature_params = {**DEFAULT_FEATURE_PARAMS, **(feature_params or {})}
         self.model = None
         self.scaler = StandardScaler()
         self.feature_scaler = MinMaxScaler()
         self.history = None
+        self.sequence_length = 60
+        self.epoch_stats = []
+        self.throughput_summary = {}
+        self.symbols = None
+        self.trained_through = None
     
     def prepare_features(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -38,20 +134,51 @@ class TradingModelTrainer:
         Returns:
             X (features), y (targets)
         """
+        p = self.feature_params
+        df = self.compute_indicators(df)
+        
+        # Select features
+        features = df[self.feature_columns].values
+        
+        # Create target: Buy (2), Hold (1), Sell (0)
+        # Based on future price movement
+        future_return = df['Close'].shift(-p['label_horizon']) / df['Close'] - 1
+        threshold = p['label_threshold']
+        y = np.where(future_return > threshold, 2, np.where(future_return < -threshold, 0, 1))
+        
+        # Remove last rows with NaN targets
+        valid_indices = ~np.isnan(y)
+        features = features[valid_indices]
+        y = y[valid_indices].astype(int)
+        
+        return features, y
+    
+    def compute_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        OHLCV with every indicator column added, indexed like df
+        
+        Rows where an indicator is still warming up are dropped, so the
+        index gives the bar of each prepare_features row.
+        """
         df = df.copy()
+        p = self.feature_params
         
         # Calculate technical indicators
-        df['rsi'] = self.calculate_rsi(df['Close'], period=14)
-        df['macd'], df['macd_signal'] = self.calculate_macd(df['Close'])
-        df['bb_upper'], df['bb_middle'], df['bb_lower'] = self.calculate_bollinger_bands(df['Close'])
-        df['sma_20'] = df['Close'].rolling(window=20).mean()
-        df['sma_50'] = df['Close'].rolling(window=50).mean()
+        df['rsi'] = self.calculate_rsi(df['Close'], period=p['rsi_period'])
+        df['macd'], df['macd_signal'] = self.calculate_macd(
+            df['Close'], fast=p['macd_fast'], slow=p['macd_slow'], signal=p['macd_signal']
+        )
+        df['bb_upper'], df['bb_middle'], df['bb_lower'] = self.calculate_bollinger_bands(
+            df['Close'], period=p['bb_period'], std_dev=p['bb_std_dev']
+        )
+        df['sma_20'] = df['Close'].rolling(window=p['sma_short']).mean()
+        df['sma_50'] = df['Close'].rolling(window=p['sma_long']).mean()
         
         # Volatility
-        df['volatility'] = df['Close'].pct_change().rolling(window=20).std()
+        df['volatility'] = df['Close'].pct_change().rolling(window=p['volatility_window']).std()
         
         # Volume indicators
-        df['volume_sma'] = df['Volume'].rolling(window=20).mean()
+        df['volume_sma'] = df['Volume'].rolling(window=p['volume_window']).mean()
         df['volume_ratio'] = df['Volume'] / df['volume_sma']
         
         # Price change features
@@ -59,30 +186,7 @@ class TradingModelTrainer:
         df['high_low_ratio'] = df['High'] / df['Low']
         
         # Remove NaN values
-        df = df.dropna()
-        
-        # Select features
-        feature_columns = [
-            'Open', 'High', 'Low', 'Close', 'Volume',
-            'rsi', 'macd', 'macd_signal',
-            'bb_upper', 'bb_middle', 'bb_lower',
-            'sma_20', 'sma_50', 'volatility',
-            'volume_ratio', 'price_change', 'high_low_ratio'
-        ]
-        
-        features = df[feature_columns].values
-        
-        # Create target: Buy (2), Hold (1), Sell (0)
-        # Based on future price movement
-        future_return = df['Close'].shift(-5) / df['Close'] - 1
-        y = np.where(future_return > 0.02, 2, np.where(future_return < -0.02, 0, 1))
-        
-        # Remove last rows with NaN targets
-        valid_indices = ~np.isnan(y)
-        features = features[valid_indices]
-        y = y[valid_indices].astype(int)
-        
-        return features, y
+        return df.dropna()
     
     def calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
         """Calculate Relative Strength Index"""
@@ -111,19 +215,22 @@ class TradingModelTrainer:
     
     def build_lstm_model(self, input_shape: Tuple) -> keras.Model:
         """Build LSTM model for sequence prediction"""
+        lstm_kwargs = self.throughput.lstm_kwargs() if self.throughput else {}
         model = keras.Sequential([
-            layers.LSTM(128, return_sequences=True, input_shape=input_shape),
+            layers.LSTM(128, return_sequences=True, input_shape=input_shape, **lstm_kwargs),
             layers.Dropout(0.2),
-            layers.LSTM(64, return_sequences=False),
+            layers.LSTM(64, return_sequences=False, **lstm_kwargs),
             layers.Dropout(0.2),
             layers.Dense(32, activation='relu'),
-            layers.Dense(3, activation='softmax')  # Buy, Hold, Sell
+            # Softmax stays float32 under mixed precision
+            layers.Dense(3, activation='softmax', dtype='float32')  # Buy, Hold, Sell
         ])
         
         model.compile(
             optimizer=keras.optimizers.Adam(learning_rate=0.001),
             loss='sparse_categorical_crossentropy',
-            metrics=['accuracy']
+            metrics=['accuracy'],
+            jit_compile=self.jit_compile
         )
         
         return model
@@ -138,26 +245,71 @@ class TradingModelTrainer:
             layers.Flatten(),
             layers.Dense(64, activation='relu'),
             layers.Dropout(0.2),
-            layers.Dense(3, activation='softmax')
+            layers.Dense(3, activation='softmax', dtype='float32')
         ])
         
         model.compile(
             optimizer=keras.optimizers.Adam(learning_rate=0.001),
             loss='sparse_categorical_crossentropy',
-            metrics=['accuracy']
+            metrics=['accuracy'],
+            jit_compile=self.jit_compile
         )
         
         return model
     
-    def create_sequences(self, data: np.ndarray, seq_length: int = 60) -> Tuple[np.ndarray, np.ndarray]:
-        """Create sequences for time series prediction"""
-        X, y = [], []
-        for i in range(seq_length, len(data[0])):
-            X.append(data[0][i-seq_length:i])
-            y.append(data[1][i])
-        return np.array(X), np.array(y)
+    @property
+    def jit_compile(self):
+        """XLA setting passed to compile(); 'auto' (Keras' default) unless throughput mode decides"""
+        return self.throughput.jit_compile if self.throughput else 'auto'
+    
+    def build_model(self, input_shape: Tuple) -> keras.Model:
+        """Build the network selected by model_type"""
+        if not self.throughput:
+            return self.build_lstm_model(input_shape) if self.model_type == "lstm" else self.build_cnn_model(input_shape)
+        
+        # Threads and dtype policy must be set before any layer is created; layers keep
+        # the policy they were built with, so the global one is restored afterwards
+        previous_policy = keras.mixed_precision.global_policy()
+        self.throughput.apply()
+        try:
+            if self.model_type == "lstm":
+                return self.build_lstm_model(input_shape)
+            return self.build_cnn_model(input_shape)
+        finally:
+            keras.mixed_precision.set_global_policy(previous_policy)
+    
+    def create_sequences(self, data: np.ndarray, seq_length: int = 60, stride: int = 1,
+                         dtype=np.float32) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Create sequences for time series prediction
+        
+        Windows are returned as a read-only strided view over the feature
+        matrix, so no (N, seq_length, features) copy is materialized.
+        
+        Args:
+            data: Tuple of (features, targets)
+            seq_length: Length of each input window
+            stride: Keep every stride-th window (1 keeps all of them)
+            dtype: Dtype of the window view
+        
+        Returns:
+            X windows of shape (N, seq_length, features), y targets of shape (N,)
+        """
+        features, targets = data
+        features = np.ascontiguousarray(features, dtype=dtype)
+        targets = np.asarray(targets)
+        
+        if len(features) <= seq_length:
+            return np.empty((0, seq_length, features.shape[1]), dtype=dtype), targets[:0]
+        
+        # Window i covers rows [i, i + seq_length) and predicts the row right after it
+        windows = np.lib.stride_tricks.sliding_window_view(features, seq_length, axis=0)
+        X = windows[:-1].transpose(0, 2, 1)[::stride]
+        y = targets[seq_length:][::stride]
+        return X, y
     
-    def train(self, df: pd.DataFrame, epochs: int = 50, batch_size: int = 32, sequence_length: int = 60):
+    def train(self, df: pd.DataFrame, epochs: int = 50, batch_size: int = 32, sequence_length: int = 60,
+              stride: int = 1, feature_store=None):
         """
         Train the trading model
         
@@ -166,95 +318,262 @@ class TradingModelTrainer:
             epochs: Number of training epochs
             batch_size: Batch size for training
             sequence_length: Length of input sequences
+            stride: Subsample windows, keeping every stride-th one
+            feature_store: Optional FeatureStore to reuse precomputed features and scaler
         """
-        # Prepare features
-        features, targets = self.prepare_features(df)
-        
-        # Normalize features
-        features_scaled = self.scaler.fit_transform(features)
+        if feature_store is not None:
+            # Reuse stored features and scaler statistics when this data was seen before
+            entry = feature_store.get_or_compute(self, df)
+            targets = entry.targets
+            features_scaled = entry.scaled_features()
+            self.scaler = entry.scaler()
+        else:
+            # Prepare features
+            with METRICS.timer('prepare_features'):
+                features, targets = self.prepare_features(df)
+            
+            # Normalize features
+            with METRICS.timer('scaler_transform'):
+                features_scaled = self.scaler.fit_transform(features).astype(np.float32)
         
         # Create sequences
-        X_seq, y_seq = self.create_sequences((features_scaled, targets), sequence_length)
+        self.sequence_length = sequence_length
+        # Last bar whose label is known; incremental updates pick up after it
+        self.trained_through = df.index[-1 - self.feature_params['label_horizon']]
+        X_seq, y_seq = self.create_sequences((features_scaled, targets), sequence_length, stride=stride)
         
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X_seq, y_seq, test_size=0.2, random_state=42, shuffle=False
-        )
+        # Split data chronologically; slicing keeps the windows as views
+        split = len(X_seq) - int(np.ceil(len(X_seq) * 0.2))
+        X_train, X_test = X_seq[:split], X_seq[split:]
+        y_train, y_test = y_seq[:split], y_seq[split:]
+        train_batches = WindowBatchSequence(X_train, y_train, batch_size, shuffle=True)
+        test_batches = WindowBatchSequence(X_test, y_test, batch_size)
         
         # Build model
-        input_shape = (X_train.shape[1], X_train.shape[2])
-        if self.model_type == "lstm":
-            self.model = self.build_lstm_model(input_shape)
-        else:
-            self.model = self.build_cnn_model(input_shape)
+        self.model = self.build_model((X_train.shape[1], X_train.shape[2]))
         
         # Train model
+        throughput = EpochThroughput(len(X_train))
         self.history = self.model.fit(
-            X_train, y_train,
+            train_batches,
             epochs=epochs,
-            batch_size=batch_size,
-            validation_data=(X_test, y_test),
+            validation_data=test_batches,
             verbose=1,
             callbacks=[
                 keras.callbacks.EarlyStopping(monitor='val_loss', patience=5, restore_best_weights=True),
-                keras.callbacks.ReduceLROnPlateau(monitor='val_loss', factor=0.5, patience=3)
+                keras.callbacks.ReduceLROnPlateau(monitor='val_loss', factor=0.5, patience=3),
+                throughput
             ]
         )
+        self.record_throughput(throughput)
         
         # Evaluate
-        test_loss, test_accuracy = self.model.evaluate(X_test, y_test, verbose=0)
+        test_loss, test_accuracy = self.model.evaluate(test_batches, verbose=0)
         print(f"Test Loss: {test_loss:.4f}")
         print(f"Test Accuracy: {test_accuracy:.4f}")
         
         return self.history
     
-    def save_model(self, filepath: str):
-        """Save trained model and scaler"""
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        self.model.save(filepath)
-        
-        # Save scaler
-        scaler_path = filepath.replace('.h5', '_scaler.pkl')
-        with open(scaler_path, 'wb') as f:
-            pickle.dump(self.scaler, f)
-        
-        print(f"Model saved to {filepath}")
-        print(f"Scaler saved to {scaler_path}")
+    def train_panel(self, panel: pd.DataFrame, epochs: int = 50, batch_size: int = 32, sequence_length: int = 60,
+                    stride: int = 1, num_workers: int = 1, symbol_column: str = 'symbol'):
+        """
+        Train one model across every symbol of a long-format panel
+        
+        Features are computed per symbol (see PanelFeatureBuilder) and scaled
+        with one scaler; windows never span two symbols, and the last 20% of
+        each symbol's windows is held out for validation.
+        
+        Args:
+            panel: OHLCV rows of many symbols with a symbol column and timestamp index
+            epochs: Number of training epochs
+            batch_size: Batch size for training
+            sequence_length: Length of input sequences
+            stride: Subsample windows, keeping every stride-th one per symbol
+            num_workers: Processes for feature computation (1 computes in-process)
+            symbol_column: Column holding the symbol
+        """
+        from model_development.panel_features import PanelFeatureBuilder
+        
+        with METRICS.timer('prepare_features'):
+            dataset = PanelFeatureBuilder(self.feature_params, symbol_column, num_workers,
+                                          feature_columns=self.feature_columns).build(panel)
+        with METRICS.timer('scaler_transform'):
+            features_scaled = self.scaler.fit_transform(dataset.features).astype(np.float32)
+        
+        # Windows over the stacked rows; the index keeps those inside one symbol
+        self.sequence_length = sequence_length
+        self.symbols = dataset.symbols
+        self.trained_through = panel.index.unique().sort_values()[-1 - self.feature_params['label_horizon']]
+        X_seq, y_seq = self.create_sequences((features_scaled, dataset.targets), sequence_length)
+        train_index, test_index = dataset.split_index(dataset.window_index(sequence_length, stride))
+        print(f"{len(dataset.symbols)} symbols, {len(train_index)} training and {len(test_index)} test windows")
+        train_batches = WindowBatchSequence(X_seq, y_seq, batch_size, shuffle=True, index=train_index)
+        test_batches = WindowBatchSequence(X_seq, y_seq, batch_size, index=test_index)
+        
+        self.model = self.build_model((X_seq.shape[1], X_seq.shape[2]))
+        
+        throughput = EpochThroughput(len(train_index))
+        self.history = self.model.fit(
+            train_batches,
+            epochs=epochs,
+            validation_data=test_batches,
+            verbose=1,
+            callbacks=[
+                keras.callbacks.EarlyStopping(monitor='val_loss', patience=5, restore_best_weights=True),
+                keras.callbacks.ReduceLROnPlateau(monitor='val_loss', factor=0.5, patience=3),
+                throughput
+            ]
+        )
+        self.record_throughput(throughput)
+        
+        test_loss, test_accuracy = self.model.evaluate(test_batches, verbose=0)
+        print(f"Test Loss: {test_loss:.4f}")
+        print(f"Test Accuracy: {test_accuracy:.4f}")
+        
+        return self.history
+    
+    def record_throughput(self, callback: EpochThroughput):
+        """Keep per-epoch wall time and samples/sec from a finished fit()"""
+        self.epoch_stats = callback.epochs
+        self.throughput_summary = callback.summary()
+        if self.throughput:
+            self.throughput_summary.update(self.throughput.describe())
+        if self.throughput_summary:
+            print(f"Training throughput: {self.throughput_summary['samples_per_sec']:,.0f} samples/sec, "
+                  f"{self.throughput_summary['total_seconds']:.1f}s over {self.throughput_summary['epochs']} epochs "
+                  f"(first epoch {self.throughput_summary['first_epoch_seconds']:.1f}s)")
+    
+    def save_model(self, filepath: str) -> str:
+        """
+        Save the trained model, scaler and feature schema as one artifact
+        
+        Args:
+            filepath: Artifact path (e.g. models/trading_model.artifact)
+        
+        Returns:
+            Content hash of the artifact
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            keras_path = os.path.join(tmp, 'model.keras')
+            self.model.save(keras_path)
+            with open(keras_path, 'rb') as f:
+                model_bytes = f.read()
+        
+        extra = {'model_type': self.model_type}
+        if self.symbols:
+            extra['symbols'] = self.symbols
+        if self.trained_through is not None:
+            # Where incremental updates pick up
+            extra['trained_through'] = pd.Timestamp(self.trained_through).isoformat()
+        sha256 = write_artifact(
+            filepath, model_bytes, 'keras', self.scaler.mean_, self.scaler.scale_,
+            self.feature_columns, self.sequence_length, self.feature_params, extra=extra
+        )
+        print(f"Model saved to {filepath} (version {sha256[:12]})")
+        return sha256
+    
+    @classmethod
+    def load_model(cls, filepath: str) -> 'TradingModelTrainer':
+        """Trainer with the model, scaler and parameters of a saved artifact"""
+        artifact = ModelArtifact(filepath, verify=True)
+        trainer = cls(model_type=artifact.metadata.get('model_type', 'lstm'),
+                      feature_params=artifact.feature_params,
+                      extra_feature_columns=artifact.feature_columns[len(FEATURE_COLUMNS):])
+        trainer.sequence_length = artifact.sequence_length
+        trainer.symbols = artifact.metadata.get('symbols')
+        if artifact.metadata.get('trained_through'):
+            trainer.trained_through = pd.Timestamp(artifact.metadata['trained_through'])
+        trainer.model = artifact.load_keras_model()
+        trainer.scaler = StandardScaler()
+        trainer.scaler.mean_ = artifact.scaler_mean.astype(np.float64)
+        trainer.scaler.scale_ = artifact.scaler_scale.astype(np.float64)
+        trainer.scaler.var_ = trainer.scaler.scale_ ** 2
+        trainer.scaler.n_features_in_ = len(trainer.scaler.mean_)
+        artifact.close()
+        return trainer
 
 
-def main():
-    """Main training function"""
-    import yfinance as yf
+def synthetic_ohlcv(num_bars: int, freq: str = '1h', seed: int = None) -> pd.DataFrame:
+    """
+    Random-walk OHLCV bars, used when no market data is available
     
-    # Fetch historical data
-    print("Fetching historical data...")
-    ticker = yf.Ticker("AAPL")
-    df = ticker.history(period="2y", interval="1h")
+    Args:
+        num_bars: Number of bars
+        freq: Bar spacing (use minutes or finer beyond ~2M bars to stay in the timestamp range)
+        seed: Seed for reproducible data
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start='2022-01-01', periods=num_bars, freq=freq)
+    return pd.DataFrame({
+        'Open': rng.standard_normal(num_bars).cumsum() + 150,
+        'High': rng.standard_normal(num_bars).cumsum() + 152,
+        'Low': rng.standard_normal(num_bars).cumsum() + 148,
+        'Close': rng.standard_normal(num_bars).cumsum() + 150,
+        'Volume': rng.integers(1000000, 10000000, num_bars)
+    }, index=dates)
+
+
+def run_training(symbol: str = "AAPL", period: str = "2y", interval: str = "1h", model_type: str = "lstm",
+                 epochs: int = 20, batch_size: int = 32, sequence_length: int = 60,
+                 output_path: str = os.path.join(MODELS_DIR, "trading_model.artifact"),
+                 throughput: ThroughputConfig = None, symbols: List[str] = None,
+                 num_workers: int = 1) -> TradingModelTrainer:
+    """
+    Fetch history, train a model and save it as an artifact
     
-    if df.empty:
-        print("Failed to fetch data. Using sample data...")
-        # Generate sample data
-        dates = pd.date_range(start='2022-01-01', periods=2000, freq='1h')
-        df = pd.DataFrame({
-            'Open': np.random.randn(2000).cumsum() + 150,
-            'High': np.random.randn(2000).cumsum() + 152,
-            'Low': np.random.randn(2000).cumsum() + 148,
-            'Close': np.random.randn(2000).cumsum() + 150,
-            'Volume': np.random.randint(1000000, 10000000, 2000)
-        }, index=dates)
+    Args:
+        symbol: Ticker symbol to train on
+        period: History to fetch
+        interval: Bar interval
+        model_type: 'lstm' or 'cnn'
+        epochs: Number of training epochs
+        batch_size: Batch size for training
+        sequence_length: Length of input sequences
+        output_path: Artifact path
+        throughput: Opt-in throughput settings
+        symbols: Several symbols to train one panel model on (overrides symbol)
+        num_workers: Processes for panel feature computation
+    """
+    from data_collection.bar_cache import BarCache
+    from data_collection.market_data_collector import MarketDataCollector
+    
+    symbols = symbols or [symbol]
+    cache = BarCache()
+    frames = {}
+    
+    # Fetch historical data (cached locally; only new bars are downloaded)
+    print("Fetching historical data...")
+    for name in symbols:
+        collector = MarketDataCollector(name, cache=cache)
+        df = collector.get_historical_data(period=period, interval=interval)
+        
+        if df.empty:
+            print(f"Failed to fetch data for {name}. Using sample data...")
+            df = synthetic_ohlcv(2000)
+        frames[name] = df
     
     # Train model
     print("Training model...")
-    trainer = TradingModelTrainer(model_type="lstm")
-    trainer.train(df, epochs=20, batch_size=32, sequence_length=60)
+    trainer = TradingModelTrainer(model_type=model_type, throughput=throughput)
+    if len(frames) > 1:
+        from model_development.panel_features import panel_from_frames
+        
+        trainer.train_panel(panel_from_frames(frames), epochs=epochs, batch_size=batch_size,
+                            sequence_length=sequence_length, num_workers=num_workers)
+    else:
+        trainer.train(frames[symbols[0]], epochs=epochs, batch_size=batch_size, sequence_length=sequence_length)
     
     # Save model
-    os.makedirs("../../models", exist_ok=True)
-    trainer.save_model("../../models/trading_model.h5")
+    trainer.save_model(output_path)
     
     print("Training completed!")
+    return trainer
+
+
+def main():
+    """Main training function"""
+    run_training()
 
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,253 @@
+"""
+Walk-Forward Evaluation
+Trains model configurations on rolling windows across a process pool
+"""
+
+import itertools
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PARAM_GRID = {
+    'model_type': ['lstm', 'cnn'],
+    'sequence_length': [30, 60],
+    'batch_size': [32, 64],
+    'label_threshold': [0.01, 0.02],
+}
+
+# Read-only arrays opened once per worker process
+_shared = {}
+
+
+def walk_forward_folds(num_rows: int, train_size: int, test_size: int, step: Optional[int] = None) -> List[Dict]:
+    """
+    Rolling train/test row ranges, each test range directly after its train range
+
+    Args:
+        num_rows: Rows available
+        train_size: Rows per training range
+        test_size: Rows per test range
+        step: Rows to advance between folds (defaults to test_size)
+    """
+    step = step or test_size
+    folds = []
+    start = 0
+    while start + train_size + test_size <= num_rows:
+        folds.append({
+            'fold': len(folds),
+            'train_start': start,
+            'train_end': start + train_size,
+            'test_end': start + train_size + test_size,
+        })
+        start += step
+    return folds
+
+
+def fold_window_slices(train_rows: int, sequence_length: int, horizon: int,
+                       validation_split: float) -> Dict[str, slice]:
+    """
+    Window ranges for one fold, with horizon-sized embargoes
+
+    Window i covers rows [i, i + sequence_length) of the fold and is labelled
+    with the return from row i + sequence_length over the next horizon rows.
+    Windows are dropped wherever that label would reach into the next range,
+    so fit labels never overlap validation rows and no training label reaches
+    the test range.
+
+    Args:
+        train_rows: Rows in the fold's training range
+        sequence_length: Window length
+        horizon: Label horizon in rows
+        validation_split: Tail of the training windows used for early stopping
+
+    Returns:
+        Slices into the fold's windows for 'fit', 'validation' and 'test'
+    """
+    split = train_rows - sequence_length
+    train_windows = split - horizon
+    val_split = train_windows - int(np.ceil(train_windows * validation_split))
+    return {
+        'fit': slice(0, val_split - horizon),
+        'validation': slice(val_split, train_windows),
+        'test': slice(split, None),
+    }
+
+
+def _init_worker(features_path: str, returns_path: str, threads: int):
+    """Pin TF threading and memory-map the shared arrays once per worker"""
+    import tensorflow as tf
+
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    _shared['features'] = np.load(features_path, mmap_mode='r')
+    _shared['future_returns'] = np.load(returns_path, mmap_mode='r')
+
+
+def _run_task(config: Dict, fold: Dict, epochs: int, validation_split: float, horizon: int) -> Dict:
+    """Train one configuration on one fold and evaluate it on the fold's test range"""
+    from tensorflow import keras
+
+    from model_development.backtest import Backtester
+    from model_development.train_trading_model import FEATURE_COLUMNS, TradingModelTrainer, WindowBatchSequence
+
+    started = time.perf_counter()
+    seq = config['sequence_length']
+    features = _shared['features']
+    future_returns = _shared['future_returns']
+
+    # Test windows reach back seq rows into the training range for their inputs
+    rows = features[fold['train_start']:fold['test_end']]
+    train_rows = fold['train_end'] - fold['train_start']
+    threshold = config['label_threshold']
+    fr = future_returns[fold['train_start']:fold['test_end']]
+    targets = np.where(fr > threshold, 2, np.where(fr < -threshold, 0, 1))
+
+    # Scale with training-range statistics only
+    mean = rows[:train_rows].mean(axis=0)
+    std = rows[:train_rows].std(axis=0)
+    std[std == 0] = 1.0
+    scaled = ((rows - mean) / std).astype(np.float32)
+
+    trainer = TradingModelTrainer(model_type=config['model_type'],
+                                  feature_params={'label_threshold': threshold})
+    X, y = trainer.create_sequences((scaled, targets), seq)
+    windows = fold_window_slices(train_rows, seq, horizon, validation_split)
+    X_test, y_test = X[windows['test']], y[windows['test']]
+
+    # Early stopping watches the tail of the training range, never the test range
+    batch_size = config['batch_size']
+    trainer.model = trainer.build_model((seq, X.shape[2]))
+    trainer.model.fit(
+        WindowBatchSequence(X[windows['fit']], y[windows['fit']], batch_size, shuffle=True),
+        epochs=epochs,
+        validation_data=WindowBatchSequence(X[windows['validation']], y[windows['validation']], batch_size),
+        verbose=0,
+        callbacks=[keras.callbacks.EarlyStopping(monitor='val_loss', patience=3, restore_best_weights=True)]
+    )
+
+    test_batches = WindowBatchSequence(X_test, y_test, batch_size)
+    test_loss, test_accuracy = trainer.model.evaluate(test_batches, verbose=0)
+    probabilities = trainer.model.predict(test_batches, verbose=0)
+    prices = rows[train_rows:, FEATURE_COLUMNS.index('Close')]
+    backtest = Backtester().run(probabilities, prices)['metrics']
+
+    return {
+        **config,
+        **fold,
+        'test_loss': float(test_loss),
+        'test_accuracy': float(test_accuracy),
+        'sharpe': backtest['sharpe'],
+        'total_return': backtest['total_return'],
+        'max_drawdown': backtest['max_drawdown'],
+        'seconds': time.perf_counter() - started,
+        'worker_pid': os.getpid(),
+    }
+
+
+class WalkForwardSweep:
+    """
+    Walk-forward evaluation of a hyperparameter grid
+
+    Features are computed once and written to a single .npy file that every
+    worker memory-maps read-only; labels for each label_threshold are derived
+    in the worker from shared forward returns. Each worker pins its TF
+    thread count so workers x threads matches the core count.
+    """
+
+    def __init__(self, param_grid: Dict = None, train_size: int = 5000, test_size: int = 1000,
+                 step: Optional[int] = None, epochs: int = 10, validation_split: float = 0.1,
+                 num_workers: Optional[int] = None, threads_per_worker: Optional[int] = None):
+        """
+        Args:
+            param_grid: Lists of values for model_type, sequence_length, batch_size, label_threshold
+            train_size: Rows per training range
+            test_size: Rows per test range
+            step: Rows between folds (defaults to test_size)
+            epochs: Maximum epochs per training run
+            validation_split: Tail of each training range used for early stopping
+            num_workers: Worker processes (defaults to cores / threads_per_worker)
+            threads_per_worker: TF intra-op threads per worker (defaults to 1)
+        """
+        self.param_grid = {**DEFAULT_PARAM_GRID, **(param_grid or {})}
+        self.train_size = train_size
+        self.test_size = test_size
+        self.step = step
+        self.epochs = epochs
+        self.validation_split = validation_split
+        cores = os.cpu_count() or 1
+        self.threads_per_worker = threads_per_worker or 1
+        self.num_workers = num_workers or max(1, cores // self.threads_per_worker)
+
+    def configurations(self) -> List[Dict]:
+        """Every combination in the parameter grid"""
+        keys = list(self.param_grid)
+        return [dict(zip(keys, values)) for values in itertools.product(*self.param_grid.values())]
+
+    def run(self, df: pd.DataFrame, trainer=None) -> pd.DataFrame:
+        """
+        Evaluate every configuration on every fold
+
+        Args:
+            df: DataFrame with OHLCV data
+            trainer: TradingModelTrainer whose feature_params define the features
+
+        Returns:
+            One row per (configuration, fold)
+        """
+        from model_development.train_trading_model import FEATURE_COLUMNS, TradingModelTrainer
+
+        trainer = trainer or TradingModelTrainer()
+        features, _ = trainer.prepare_features(df)
+        close = features[:, FEATURE_COLUMNS.index('Close')]
+        horizon = trainer.feature_params['label_horizon']
+        future_returns = np.full(len(close), np.nan)
+        future_returns[:-horizon] = close[horizon:] / close[:-horizon] - 1
+
+        folds = walk_forward_folds(len(features), self.train_size, self.test_size, self.step)
+        if not folds:
+            raise ValueError(
+                f"{len(features)} feature rows is too few for train_size={self.train_size} "
+                f"and test_size={self.test_size}"
+            )
+
+        shared_dir = tempfile.mkdtemp(prefix='walk_forward_')
+        try:
+            features_path = os.path.join(shared_dir, 'features.npy')
+            returns_path = os.path.join(shared_dir, 'future_returns.npy')
+            np.save(features_path, features.astype(np.float32))
+            np.save(returns_path, future_returns)
+            del features
+
+            tasks = [(config, fold) for config in self.configurations() for fold in folds]
+            print(f"Running {len(tasks)} tasks on {self.num_workers} workers "
+                  f"x {self.threads_per_worker} threads")
+
+            with ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(features_path, returns_path, self.threads_per_worker),
+            ) as executor:
+                futures = [
+                    executor.submit(_run_task, config, fold, self.epochs, self.validation_split, horizon)
+                    for config, fold in tasks
+                ]
+                results = [future.result() for future in futures]
+        finally:
+            shutil.rmtree(shared_dir, ignore_errors=True)
+
+        return pd.DataFrame(results)
+
+    def summary(self, results: pd.DataFrame) -> pd.DataFrame:
+        """Mean test metrics per configuration, best first"""
+        keys = list(self.param_grid)
+        metrics = ['test_accuracy', 'test_loss', 'sharpe', 'total_return', 'max_drawdown']
+        summary = results.groupby(keys)[metrics].mean().reset_index()
+        return summary.sort_values('sharpe', ascending=False).reset_index(drop=True)
@@ -0,0 +1,43 @@
+"""
+Backtester PnL, Sharpe and drawdown on a hand-built 10-bar series
+"""
+
+import numpy as np
+import pytest
+
+from model_development.backtest import BUY, HOLD, SELL, Backtester
+
+# +10% into bars 1, 4 and 6, -10% into bars 2 and 7
+PRICES = np.array([100.0, 110.0, 99.0, 99.0, 108.9, 108.9, 119.79, 107.811, 107.811, 107.811])
+SIGNALS = np.array([BUY, SELL, HOLD, BUY, HOLD, HOLD, HOLD, SELL, HOLD, HOLD])
+
+
+def test_known_pnl_sharpe_and_drawdown():
+    result = Backtester(fee_bps=0, slippage_bps=0, periods_per_year=10).run(SIGNALS, PRICES)
+
+    np.testing.assert_array_equal(result['positions'], [1, 0, 0, 1, 1, 1, 1, 0, 0, 0])
+    # The position set at bar t earns the return into bar t+1, never the return into t
+    np.testing.assert_allclose(result['returns'], [0, 0.1, 0, 0, 0.1, 0, 0.1, -0.1, 0, 0], atol=1e-12)
+    np.testing.assert_allclose(result['equity'][-1], 1.1 ** 3 * 0.9)
+
+    metrics = result['metrics']
+    assert metrics['total_return'] == pytest.approx(0.1979)
+    # mean 0.02, sample std sqrt(0.004), sqrt(10) periods per year
+    assert metrics['sharpe'] == pytest.approx(1.0)
+    assert metrics['max_drawdown'] == pytest.approx(-0.1)
+    assert metrics['trades'] == 4
+    assert metrics['exposure'] == pytest.approx(0.5)
+
+
+def test_signals_do_not_earn_the_move_they_are_issued_on():
+    # The same signals one bar late miss the jumps into bars 1 and 4 and still take the drops
+    late = np.concatenate([[HOLD], SIGNALS[:-1]])
+    result = Backtester(fee_bps=0, slippage_bps=0, periods_per_year=10).run(late, PRICES)
+    np.testing.assert_allclose(result['returns'], [0, 0, -0.1, 0, 0, 0, 0.1, -0.1, 0, 0], atol=1e-12)
+    assert result['metrics']['total_return'] < 0
+
+
+def test_costs_are_charged_on_position_changes():
+    free = Backtester(fee_bps=0, slippage_bps=0).run(SIGNALS, PRICES)
+    costly = Backtester(fee_bps=5, slippage_bps=5).run(SIGNALS, PRICES)
+    np.testing.assert_allclose(free['returns'] - costly['returns'], [0.001, 0.001, 0, 0.001, 0, 0, 0, 0.001, 0, 0])
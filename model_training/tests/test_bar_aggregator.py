@@ -0,0 +1,90 @@
+"""
+BarAggregator lateness handling, per-symbol watermarks and volume bars
+"""
+
+from data_collection.bar_aggregator import BarAggregator
+
+SECOND = 1_000_000_000
+MINUTE = 60 * SECOND
+
+
+def tick(symbol: str, timestamp: int, price: float, volume: float = 100) -> dict:
+    return {'symbol': symbol, 'timestamp': timestamp, 'price': price, 'volume': volume}
+
+
+def collect(aggregator: BarAggregator) -> list:
+    bars = []
+    aggregator.subscribe(bars.append)
+    return bars
+
+
+def test_out_of_order_tick_within_lateness_counts():
+    aggregator = BarAggregator(interval=60, allowed_lateness=2.0)
+    bars = collect(aggregator)
+    aggregator.on_tick(tick('AAPL', 10 * SECOND, 100.0))
+    aggregator.on_tick(tick('AAPL', 59 * SECOND, 102.0))
+    # The next bar has started, but the first bar stays open for the lateness
+    aggregator.on_tick(tick('AAPL', MINUTE + SECOND, 103.0))
+    aggregator.on_tick(tick('AAPL', 5 * SECOND, 99.0))
+    aggregator.on_tick(tick('AAPL', MINUTE + 3 * SECOND, 104.0))
+    aggregator.dispatcher.close(timeout=5)
+
+    assert len(bars) == 1
+    bar = bars[0]
+    assert (bar['timestamp'], bar['end']) == (0, MINUTE)
+    # The late tick is the earliest of the bar, so it becomes the Open
+    assert (bar['Open'], bar['High'], bar['Low'], bar['Close']) == (99.0, 102.0, 99.0, 102.0)
+    assert (bar['Volume'], bar['ticks']) == (300, 3)
+    assert aggregator.get_stats()['late_ticks'] == 0
+
+
+def test_tick_for_a_closed_bar_is_dropped():
+    aggregator = BarAggregator(interval=60, allowed_lateness=2.0)
+    bars = collect(aggregator)
+    aggregator.on_tick(tick('AAPL', 30 * SECOND, 100.0))
+    aggregator.on_tick(tick('AAPL', MINUTE + 5 * SECOND, 101.0))
+    # Behind the watermark but still inside the open second bar: counted
+    aggregator.on_tick(tick('AAPL', MINUTE + SECOND, 105.0))
+    # Its bar closed at the previous tick: dropped
+    aggregator.on_tick(tick('AAPL', 50 * SECOND, 90.0))
+    aggregator.flush()
+    aggregator.dispatcher.close(timeout=5)
+
+    assert aggregator.get_stats()['late_ticks'] == 1
+    assert [bar['ticks'] for bar in bars] == [1, 2]
+    assert bars[0]['Low'] == 100.0
+    assert bars[1]['High'] == 105.0
+
+
+def test_watermarks_are_per_symbol():
+    aggregator = BarAggregator(interval=60, allowed_lateness=2.0)
+    bars = collect(aggregator)
+    aggregator.on_tick(tick('AAPL', 30 * SECOND, 100.0))
+    aggregator.on_tick(tick('MSFT', 10 * MINUTE, 400.0))
+    # MSFT being ten minutes ahead neither closes AAPL's bar nor makes its ticks late
+    aggregator.on_tick(tick('AAPL', 40 * SECOND, 101.0))
+    aggregator.dispatcher.close(timeout=5)
+
+    assert bars == []
+    stats = aggregator.get_stats()
+    assert stats['late_ticks'] == 0
+    assert stats['open_bars'] == 2
+    assert stats['watermarks'] == {'AAPL': 38 * SECOND, 'MSFT': 10 * MINUTE - 2 * SECOND}
+
+
+def test_volume_bar_closes_at_the_threshold():
+    aggregator = BarAggregator(mode='volume', volume_per_bar=1000)
+    bars = collect(aggregator)
+    for i, volume in enumerate([400, 300, 500, 200]):
+        aggregator.on_tick(tick('AAPL', (i + 1) * SECOND, 100.0 + i, volume))
+    # Older than the closed bar's last tick: dropped
+    aggregator.on_tick(tick('AAPL', 2 * SECOND, 50.0, 900))
+    aggregator.dispatcher.close(timeout=5)
+
+    assert len(bars) == 1
+    bar = bars[0]
+    assert (bar['timestamp'], bar['end']) == (SECOND, 3 * SECOND)
+    assert (bar['Open'], bar['High'], bar['Low'], bar['Close']) == (100.0, 102.0, 100.0, 102.0)
+    assert (bar['Volume'], bar['ticks']) == (1200, 3)
+    stats = aggregator.get_stats()
+    assert (stats['open_bars'], stats['late_ticks']) == (1, 1)
@@ -0,0 +1,106 @@
+"""
+BarCache misses, hits, tail refreshes and offline reads against a fake data source
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_collection.bar_cache import BarCache
+
+
+def hourly_bars(start: pd.Timestamp, end: pd.Timestamp, close: float = 100.0) -> pd.DataFrame:
+    index = pd.date_range(start.floor('h'), end, freq='h', tz='UTC')
+    values = close + np.arange(len(index), dtype=float)
+    return pd.DataFrame({'Open': values, 'High': values + 1, 'Low': values - 1, 'Close': values,
+                         'Volume': np.full(len(index), 1000)}, index=index)
+
+
+class FakeSource:
+    """Serves bars from a history that tests can extend or revise, recording every call"""
+
+    def __init__(self, history: pd.DataFrame):
+        self.history = history
+        self.calls = []
+
+    def __call__(self, symbol, interval, period=None, start=None):
+        self.calls.append({'symbol': symbol, 'interval': interval, 'period': period, 'start': start})
+        if start is not None:
+            return self.history[self.history.index >= start]
+        return self.history
+
+
+@pytest.fixture
+def now():
+    return pd.Timestamp.now(tz='UTC').floor('h')
+
+
+@pytest.fixture
+def source(now):
+    return FakeSource(hourly_bars(now - pd.Timedelta(days=20), now))
+
+
+def test_first_request_is_a_miss(tmp_path, source):
+    cache = BarCache(str(tmp_path), source=source)
+    df = cache.get('AAPL', interval='1h', period='1mo')
+
+    assert len(df) == len(source.history)
+    assert source.calls == [{'symbol': 'AAPL', 'interval': '1h', 'period': '1mo', 'start': None}]
+    assert cache.get_stats()['misses'] == 1
+    assert cache.get_stats()['bars_fetched'] == len(df)
+
+
+def test_hit_within_max_age_skips_the_source(tmp_path, source):
+    cache = BarCache(str(tmp_path), source=source, max_age=3600)
+    first = cache.get('AAPL', period='1mo')
+    second = cache.get('AAPL', period='1mo')
+
+    assert len(source.calls) == 1
+    pd.testing.assert_frame_equal(second, first, check_freq=False)
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['misses'], stats['refreshes']) == (1, 1, 0)
+    assert stats['hit_rate'] == 0.5
+
+
+def test_tail_refresh_replaces_the_partial_last_bar(tmp_path, source, now):
+    cache = BarCache(str(tmp_path), source=source, max_age=0)
+    cached = cache.get('AAPL', period='1mo')
+    last = cached.index[-1]
+
+    # The last cached bar was still forming; the source now has its final values and two new bars
+    revised = source.history.copy()
+    revised.loc[last, 'Close'] = -1.0
+    source.history = pd.concat([revised, hourly_bars(now + pd.Timedelta(hours=1), now + pd.Timedelta(hours=2))])
+
+    df = cache.get('AAPL', period='1mo')
+    assert source.calls[-1]['start'] == last
+    assert cache.get_stats()['refreshes'] == 1
+    assert cache.get_stats()['bars_fetched'] == len(cached) + 3
+    assert len(df) == len(cached) + 2
+    assert df.index.is_unique and df.index.is_monotonic_increasing
+    assert df.loc[last, 'Close'] == -1.0
+
+    # The merged series was written back
+    assert len(cache.read_range('AAPL', '1h')) == len(cached) + 2
+
+
+def test_offline_with_empty_cache_returns_nothing(tmp_path, source):
+    cache = BarCache(str(tmp_path), source=source, offline=True)
+    df = cache.get('AAPL', period='1mo')
+
+    assert df.empty
+    assert source.calls == []
+    assert cache.get_stats()['misses'] == 1
+
+
+def test_offline_with_partial_cache_serves_what_is_cached(tmp_path, source):
+    BarCache(str(tmp_path), source=source).get('AAPL', period='5d')
+    offline = BarCache(str(tmp_path), source=source, offline=True)
+    calls = len(source.calls)
+
+    # Only 5 days are cached; a 1mo request is a miss but still returns the cached bars
+    df = offline.get('AAPL', period='1mo')
+    assert len(source.calls) == calls
+    assert offline.get_stats()['misses'] == 1
+    assert not df.empty
+    assert df.index[-1] == source.history.index[-1]
@@ -0,0 +1,86 @@
+"""
+CallbackDispatcher overflow policies against a callback held on its first item
+"""
+
+import threading
+
+from data_collection.dispatch import CallbackDispatcher
+
+
+class GatedCallback:
+    """Records items; blocks on the first one until released, so the queue backs up behind it"""
+
+    def __init__(self):
+        self.items = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, data):
+        self.started.set()
+        self.release.wait(5)
+        self.items.append(data)
+
+
+def subscribe_gated(policy: str, maxsize: int):
+    dispatcher = CallbackDispatcher()
+    callback = GatedCallback()
+    subscriber = dispatcher.subscribe(callback, maxsize=maxsize, policy=policy, name=policy)
+    return dispatcher, subscriber, callback
+
+
+def tick(symbol: str, price: float) -> dict:
+    return {'symbol': symbol, 'price': price}
+
+
+def test_drop_oldest_keeps_the_newest_items():
+    dispatcher, subscriber, callback = subscribe_gated('drop_oldest', maxsize=3)
+    dispatcher.publish(0)
+    assert callback.started.wait(5)
+    for item in range(1, 6):
+        dispatcher.publish(item)
+
+    stats = subscriber.get_stats()
+    assert (stats['queued'], stats['dropped']) == (3, 2)
+    callback.release.set()
+    dispatcher.close(timeout=5)
+    assert callback.items == [0, 3, 4, 5]
+    assert subscriber.get_stats()['delivered'] == 4
+
+
+def test_coalesce_keeps_the_latest_item_per_symbol():
+    dispatcher, subscriber, callback = subscribe_gated('coalesce', maxsize=2)
+    dispatcher.publish(tick('AAPL', 0))
+    assert callback.started.wait(5)
+    dispatcher.publish(tick('AAPL', 1))
+    dispatcher.publish(tick('MSFT', 1))
+    dispatcher.publish(tick('AAPL', 2))
+    assert subscriber.get_stats()['coalesced'] == 1
+    # The queue is full: the oldest key (AAPL) makes room for TSLA
+    dispatcher.publish(tick('TSLA', 1))
+
+    stats = subscriber.get_stats()
+    assert (stats['queued'], stats['coalesced'], stats['dropped']) == (2, 1, 1)
+    callback.release.set()
+    dispatcher.close(timeout=5)
+    assert callback.items == [tick('AAPL', 0), tick('MSFT', 1), tick('TSLA', 1)]
+
+
+def test_block_holds_the_publisher_until_there_is_space():
+    dispatcher, subscriber, callback = subscribe_gated('block', maxsize=2)
+    dispatcher.publish(0)
+    assert callback.started.wait(5)
+    dispatcher.publish(1)
+    dispatcher.publish(2)
+
+    publisher = threading.Thread(target=dispatcher.publish, args=(3,))
+    publisher.start()
+    publisher.join(0.2)
+    assert publisher.is_alive()
+
+    callback.release.set()
+    publisher.join(5)
+    assert not publisher.is_alive()
+    dispatcher.close(timeout=5)
+    assert callback.items == [0, 1, 2, 3]
+    stats = subscriber.get_stats()
+    assert (stats['delivered'], stats['dropped'], stats['max_queued']) == (4, 0, 2)
@@ -0,0 +1,51 @@
+"""
+FeatureStore hits, misses, key invalidation and concurrent puts of one key
+"""
+
+import os
+
+import numpy as np
+
+from model_development.feature_store import FeatureStore, feature_key
+from model_development.train_trading_model import TradingModelTrainer, synthetic_ohlcv
+
+
+def test_hit_miss_and_parameter_change(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    df = synthetic_ohlcv(300, seed=1)
+    trainer = TradingModelTrainer()
+
+    first = store.get_or_compute(trainer, df)
+    second = store.get_or_compute(trainer, df)
+    assert store.stats == {'hits': 1, 'misses': 1}
+    assert second.path == first.path
+    features, targets = trainer.prepare_features(df)
+    np.testing.assert_allclose(second.features, features.astype(np.float32))
+    np.testing.assert_array_equal(second.targets, targets)
+
+    # A different indicator period is a different feature set
+    changed = TradingModelTrainer(feature_params={'rsi_period': 10})
+    assert feature_key(df, changed.feature_params) != feature_key(df, trainer.feature_params)
+    third = store.get_or_compute(changed, df)
+    assert store.stats == {'hits': 1, 'misses': 2}
+    assert third.path != first.path
+    assert third.metadata['feature_params']['rsi_period'] == 10
+
+    # So is different data under the same parameters
+    store.get_or_compute(trainer, df.iloc[1:])
+    assert store.stats['misses'] == 3
+
+
+def test_second_put_of_a_key_keeps_the_first_entry(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    df = synthetic_ohlcv(300, seed=1)
+    trainer = TradingModelTrainer()
+    entry = store.get_or_compute(trainer, df)
+    key = os.path.basename(entry.path)
+
+    # A concurrent run that missed before the first one finished writes the same key
+    again = store.put(key, np.zeros_like(entry.features), entry.targets, entry.scaler(), trainer.feature_params)
+    assert again.path == entry.path
+    assert again.metadata['created_at'] == entry.metadata['created_at']
+    assert np.array_equal(again.features, entry.features)
+    assert os.listdir(tmp_path) == [key]
@@ -0,0 +1,51 @@
+"""
+IncrementalUpdater keeps validation labels out of training and skips when nothing is new
+"""
+
+import pytest
+
+from model_development.incremental_training import IncrementalUpdater
+from model_development.train_trading_model import TradingModelTrainer, synthetic_ohlcv
+
+SEQUENCE_LENGTH = 12
+TRAINED_BARS = 600
+NEW_BARS = 120
+
+
+@pytest.fixture
+def trainer():
+    df = synthetic_ohlcv(TRAINED_BARS, seed=3)
+    trainer = TradingModelTrainer(model_type='cnn')
+    features, _ = trainer.prepare_features(df)
+    trainer.scaler.fit(features)
+    trainer.sequence_length = SEQUENCE_LENGTH
+    trainer.model = trainer.build_model((SEQUENCE_LENGTH, features.shape[1]))
+    trainer.trained_through = df.index[-1 - trainer.feature_params['label_horizon']]
+    return trainer
+
+
+def test_validation_windows_never_overlap_training_labels(trainer):
+    df = synthetic_ohlcv(TRAINED_BARS + NEW_BARS, seed=3)
+    horizon = trainer.feature_params['label_horizon']
+    since = trainer.trained_through
+    # Promote whatever the candidate scores, so trained_through moves
+    updater = IncrementalUpdater(trainer, window_bars=200, epochs=1, min_new_windows=10, tolerance=1e9)
+
+    result = updater.update(df)
+    new_bars = int((df.index > since).sum())
+    assert result['new_bars'] == new_bars == NEW_BARS + horizon
+    # Only bars whose label horizon has passed make labelled windows
+    assert result['new_windows'] == new_bars - horizon
+    assert result['validation_windows'] == int(result['new_windows'] * updater.validation_fraction)
+    # Training windows end horizon windows before the first validation window
+    assert result['training_windows'] + horizon + result['validation_windows'] == result['windows']
+    assert result['promoted']
+    assert trainer.trained_through == df.index[-1 - horizon]
+
+    # Nothing new since the promoted model: the update is skipped
+    weights = [w.copy() for w in trainer.model.get_weights()]
+    again = updater.update(df)
+    assert again['new_windows'] == 0
+    assert not again['promoted']
+    assert 'training_windows' not in again
+    assert all((a == b).all() for a, b in zip(weights, trainer.model.get_weights()))
@@ -0,0 +1,84 @@
+"""
+Artifact round trip, section alignment, content hashing and format checks
+"""
+
+import struct
+import time
+
+import numpy as np
+import pytest
+
+from model_development.model_artifact import ARTIFACT_FORMAT_VERSION, ModelArtifact, write_artifact
+
+FEATURES = ['returns', 'rsi', 'volume_ratio']
+MODEL_BYTES = bytes(range(256)) * 3 + b'tail'
+
+
+def write(path, **overrides):
+    kwargs = dict(model_bytes=MODEL_BYTES, model_format='tflite',
+                  scaler_mean=np.array([0.1, 50.0, 1.0]), scaler_scale=np.array([0.02, 12.5, 0.3]),
+                  feature_columns=FEATURES, sequence_length=60,
+                  feature_params={'label_horizon': 5, 'label_threshold': 0.002}, extra={'quantization': 'none'})
+    kwargs.update(overrides)
+    return write_artifact(str(path), **kwargs)
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / 'model.artifact'
+    sha256 = write(path)
+
+    with ModelArtifact(str(path), verify=True) as artifact:
+        assert artifact.sha256 == sha256
+        assert artifact.version == sha256[:12]
+        assert artifact.model_format == 'tflite'
+        assert artifact.feature_columns == FEATURES
+        assert artifact.sequence_length == 60
+        assert artifact.input_shape == (60, 3)
+        assert artifact.feature_params == {'label_horizon': 5, 'label_threshold': 0.002}
+        assert artifact.metadata['label_horizon'] == 5
+        assert artifact.metadata['quantization'] == 'none'
+        np.testing.assert_array_equal(artifact.scaler_mean, np.float32([0.1, 50.0, 1.0]))
+        np.testing.assert_array_equal(artifact.scaler_scale, np.float32([0.02, 12.5, 0.3]))
+        assert bytes(artifact.model_bytes()) == MODEL_BYTES
+
+        # Every section starts on a 64-byte boundary of the file
+        for info in artifact.metadata['sections'].values():
+            assert (artifact._data_start + info['offset']) % 64 == 0
+
+
+def test_verify_rejects_a_flipped_payload_byte(tmp_path):
+    path = tmp_path / 'model.artifact'
+    write(path)
+    with ModelArtifact(str(path)) as artifact:
+        info = artifact.metadata['sections']['model']
+        position = artifact._data_start + info['offset'] + 100
+    data = bytearray(path.read_bytes())
+    data[position] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match='content hash mismatch'):
+        ModelArtifact(str(path), verify=True)
+
+
+def test_same_content_gets_the_same_version(tmp_path, monkeypatch):
+    first = write(tmp_path / 'a.artifact')
+    # A different write time must not change the hash
+    epoch = time.gmtime(0)
+    monkeypatch.setattr(time, 'gmtime', lambda: epoch)
+    second = write(tmp_path / 'b.artifact')
+    assert first == second
+    assert ModelArtifact(str(tmp_path / 'a.artifact')).version == ModelArtifact(str(tmp_path / 'b.artifact')).version
+
+    changed = write(tmp_path / 'c.artifact', model_bytes=MODEL_BYTES + b'!')
+    assert changed != first
+
+
+def test_newer_format_version_is_rejected(tmp_path):
+    path = tmp_path / 'model.artifact'
+    write(path)
+    data = bytearray(path.read_bytes())
+    struct.pack_into('<I', data, 8, ARTIFACT_FORMAT_VERSION + 1)
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match='artifact format'):
+        ModelArtifact(str(path))
@@ -0,0 +1,22 @@
+"""
+Pipeline benchmark runs every stage, TFLite inference included, for both model types
+"""
+
+import pytest
+
+from benchmarks.pipeline_benchmark import PipelineBenchmark
+
+STAGES = ['prepare_features', 'scaler_transform', 'create_sequences', 'train_epoch', 'tflite_convert',
+          'tflite_inference']
+
+
+@pytest.mark.parametrize('model_type', ['lstm', 'cnn'])
+def test_every_stage_is_recorded(model_type):
+    benchmark = PipelineBenchmark(sizes=[1500], model_type=model_type, sequence_length=12, batch_size=32,
+                                  train_windows=256, inference_windows=200, trace_memory=False)
+    report = benchmark.run()
+
+    assert [row['stage'] for row in report['results']] == STAGES
+    inference = report['results'][-1]
+    assert inference['items'] == 200
+    assert inference['seconds'] > 0
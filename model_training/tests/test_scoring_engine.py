@@ -0,0 +1,49 @@
+"""
+TFLiteScoringEngine: batch and queued scoring agree, and non-tflite artifacts are rejected
+"""
+
+import numpy as np
+import pytest
+
+from model_conversion.convert_to_tflite import ModelConverter
+from model_conversion.scoring_engine import TFLiteScoringEngine
+from model_development.model_artifact import write_artifact
+from model_development.train_trading_model import TradingModelTrainer
+
+SEQUENCE_LENGTH = 12
+NUM_FEATURES = 17
+
+
+@pytest.fixture(scope='module')
+def cnn_artifact(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp('scoring')
+    converter = ModelConverter(model_path=None)
+    converter.model = TradingModelTrainer(model_type='cnn').build_model((SEQUENCE_LENGTH, NUM_FEATURES))
+    model_bytes = converter.convert_to_tflite_basic(str(tmp / 'model.tflite'))
+    path = str(tmp / 'model.artifact')
+    write_artifact(path, model_bytes, 'tflite', np.zeros(NUM_FEATURES), np.ones(NUM_FEATURES),
+                   [f'f{i}' for i in range(NUM_FEATURES)], SEQUENCE_LENGTH)
+    return path
+
+
+def test_score_and_submit_agree(cnn_artifact):
+    windows = np.random.default_rng(0).normal(size=(37, SEQUENCE_LENGTH, NUM_FEATURES)).astype(np.float32)
+    engine = TFLiteScoringEngine(cnn_artifact, num_workers=2, batch_size=8)
+    try:
+        scored = engine.score(windows)
+        futures = [engine.submit(window) for window in windows]
+        submitted = np.stack([future.result(timeout=10) for future in futures])
+    finally:
+        engine.close()
+
+    assert scored.shape == (37, 3)
+    np.testing.assert_allclose(scored.sum(axis=1), 1.0, rtol=1e-5)
+    np.testing.assert_allclose(submitted, scored, rtol=1e-5, atol=1e-6)
+    assert engine.get_stats()['windows_scored'] == 74
+
+
+def test_keras_artifact_is_rejected(tmp_path):
+    path = str(tmp_path / 'keras.artifact')
+    write_artifact(path, b'not a tflite model', 'keras', np.zeros(2), np.ones(2), ['a', 'b'], SEQUENCE_LENGTH)
+    with pytest.raises(ValueError, match='holds a keras model'):
+        TFLiteScoringEngine(path, num_workers=1)
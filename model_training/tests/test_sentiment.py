@@ -0,0 +1,82 @@
+"""
+SentimentPipeline deduplication, refresh scheduling and bar alignment
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_collection.sentiment import (
+    SENTIMENT_COLUMNS, FakeSentimentSource, SentimentAggregator, SentimentPipeline
+)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_articles_are_deduplicated_until_their_ttl_expires(clock):
+    source = FakeSentimentSource(articles_per_fetch=5, duplicate_rate=1.0)
+    pipeline = SentimentPipeline(source, article_ttl=3600, clock=clock)
+
+    pipeline.refresh(['AAPL'])
+    assert (pipeline.stats['articles'], pipeline.stats['duplicates']) == (5, 0)
+
+    # Every earlier article comes back alongside 5 new ones
+    pipeline.refresh(['AAPL'], force=True)
+    assert (pipeline.stats['articles'], pipeline.stats['duplicates']) == (10, 5)
+
+    # Once the keys expire, repeats count as new articles again
+    clock.now += 3601
+    pipeline.refresh(['AAPL'], force=True)
+    assert (pipeline.stats['articles'], pipeline.stats['duplicates']) == (25, 5)
+    pipeline.close()
+
+
+def test_refresh_skips_fresh_symbols(clock):
+    source = FakeSentimentSource(articles_per_fetch=1)
+    pipeline = SentimentPipeline(source, refresh_interval=300, clock=clock)
+
+    assert pipeline.refresh(['AAPL', 'MSFT', 'AAPL']) == 2
+    assert pipeline.refresh(['AAPL', 'MSFT', 'TSLA']) == 1
+    assert source.fetches == 3
+
+    clock.now += 301
+    assert pipeline.refresh(['AAPL', 'TSLA']) == 2
+    assert source.fetches == 5
+    pipeline.close()
+
+
+def test_features_only_use_buckets_closed_by_each_bar():
+    source = FakeSentimentSource()
+    pipeline = SentimentPipeline(source, aggregator=SentimentAggregator(bucket_seconds=3600, window_buckets=2,
+                                                                        half_life_seconds=3600))
+    pipeline.ingest('AAPL', [
+        {'id': 'a', 'published': '2024-01-02 10:30', 'sentiment': 0.5},
+        {'id': 'b', 'published': '2024-01-02 11:15', 'sentiment': -1.0},
+    ])
+    index = pd.date_range('2024-01-02 10:00', periods=5, freq='h')
+
+    features = pipeline.features('AAPL', index, refresh=False)
+    assert source.fetches == 0
+    assert list(features.columns) == SENTIMENT_COLUMNS
+    assert features.index.equals(index)
+
+    # The 10:30 article is first visible at the 11:00 bar, the 11:15 one at 12:00,
+    # and the two-bucket window has dropped the first by 13:00
+    np.testing.assert_allclose(features['sentiment_count'], [0, 1, 2, 1, 0])
+    np.testing.assert_allclose(features['sentiment_mean'], [0, 0.5, -0.25, -1.0, 0])
+    np.testing.assert_allclose(features['sentiment_decay'], [0, 0.5, -0.75, -0.375, -0.1875])
+
+    # Timezone-aware bars give the same values
+    aware = pipeline.features('AAPL', index.tz_localize('UTC'), refresh=False)
+    np.testing.assert_allclose(aware.values, features.values)
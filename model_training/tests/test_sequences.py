@@ -0,0 +1,54 @@
+"""
+Strided create_sequences windows against the original copy-per-window loop
+"""
+
+import numpy as np
+import pytest
+
+from model_development.train_trading_model import TradingModelTrainer
+
+
+def loop_sequences(data, seq_length):
+    """The list-building loop create_sequences replaced"""
+    X, y = [], []
+    for i in range(seq_length, len(data[0])):
+        X.append(data[0][i-seq_length:i])
+        y.append(data[1][i])
+    return np.array(X), np.array(y)
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    return rng.normal(size=(500, 7)), rng.integers(0, 3, size=500)
+
+
+@pytest.mark.parametrize('seq_length', [1, 10, 60])
+def test_matches_loop(data, seq_length):
+    X, y = TradingModelTrainer().create_sequences(data, seq_length, dtype=np.float64)
+    X_loop, y_loop = loop_sequences(data, seq_length)
+    assert X.shape == X_loop.shape
+    np.testing.assert_array_equal(X, X_loop)
+    np.testing.assert_array_equal(y, y_loop)
+
+
+@pytest.mark.parametrize('stride', [2, 7, 60])
+def test_stride_keeps_every_nth_window(data, stride):
+    X, y = TradingModelTrainer().create_sequences(data, 60, stride=stride, dtype=np.float64)
+    X_loop, y_loop = loop_sequences(data, 60)
+    np.testing.assert_array_equal(X, X_loop[::stride])
+    np.testing.assert_array_equal(y, y_loop[::stride])
+
+
+def test_windows_are_read_only_views(data):
+    X, _ = TradingModelTrainer().create_sequences(data, 60)
+    assert X.dtype == np.float32
+    assert not X.flags.writeable
+    assert X.base is not None
+
+
+def test_short_series_yields_no_windows(data):
+    features, targets = data
+    X, y = TradingModelTrainer().create_sequences((features[:60], targets[:60]), 60)
+    assert X.shape == (0, 60, features.shape[1])
+    assert len(y) == 0
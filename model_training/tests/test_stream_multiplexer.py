@@ -0,0 +1,101 @@
+"""
+MultiSymbolStream reconnects and resubscribes against a local stand-in WebSocket server
+"""
+
+import asyncio
+import json
+
+import pytest
+
+websockets = pytest.importorskip('websockets')
+
+from data_collection.stream_multiplexer import MultiSymbolStream
+
+SYMBOLS = ['AAPL', 'MSFT', 'GOOGL']
+
+
+class StandInServer:
+    """Answers each subscription with one tick per symbol and drops the first drop_first connections"""
+
+    def __init__(self, drop_first: int = 1):
+        self.drop_first = drop_first
+        self.subscriptions = []
+
+    async def handler(self, ws):
+        request = json.loads(await ws.recv())
+        self.subscriptions.append(request)
+        connection = len(self.subscriptions)
+        await ws.send(json.dumps([
+            {'symbol': symbol, 'price': 100.0 + connection, 'volume': connection}
+            for symbol in request['symbols'].split(',')
+        ]))
+        if connection <= self.drop_first:
+            await ws.close()
+        else:
+            await ws.wait_closed()
+
+
+async def wait_for(condition, timeout: float = 5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise TimeoutError("condition not reached")
+        await asyncio.sleep(0.01)
+
+
+async def run_stream(server: StandInServer, stream_kwargs, until):
+    async with websockets.serve(server.handler, '127.0.0.1', 0) as serving:
+        port = serving.sockets[0].getsockname()[1]
+        stream = MultiSymbolStream(SYMBOLS, url=f'ws://127.0.0.1:{port}', reconnect_delay=0.01, **stream_kwargs)
+        runner = asyncio.ensure_future(stream.run())
+        await wait_for(lambda: until(stream))
+        stream.stop()
+        await asyncio.wait_for(runner, 5)
+    return stream
+
+
+def test_reconnects_and_resubscribes():
+    server = StandInServer(drop_first=1)
+    stream = asyncio.run(run_stream(server, {}, lambda stream: sum(stream.message_counts.values()) == 6))
+
+    assert stream.reconnects == 1
+    assert [request['action'] for request in server.subscriptions] == ['subscribe', 'subscribe']
+    assert server.subscriptions[0] == server.subscriptions[1]
+    assert sorted(server.subscriptions[1]['symbols'].split(',')) == sorted(SYMBOLS)
+    assert stream.message_counts == dict.fromkeys(SYMBOLS, 2)
+    # The tick after the reconnect landed in the same buffers
+    assert all(stream.buffers[symbol].latest()['price'] == 102.0 for symbol in SYMBOLS)
+    assert not any(stream.connected)
+
+
+def test_each_connection_resubscribes_its_own_group():
+    server = StandInServer(drop_first=2)
+    stream = asyncio.run(run_stream(server, {'connections': 2},
+                                    lambda stream: len(server.subscriptions) == 4
+                                    and sum(stream.message_counts.values()) == 6))
+
+    assert stream.reconnects == 2
+    groups = sorted(request['symbols'] for request in server.subscriptions)
+    expected = sorted(','.join(group) for group in stream.symbol_groups())
+    assert groups == sorted(expected * 2)
+
+
+def test_stop_before_run_is_not_lost():
+    server = StandInServer()
+
+    async def main():
+        async with websockets.serve(server.handler, '127.0.0.1', 0) as serving:
+            port = serving.sockets[0].getsockname()[1]
+            stream = MultiSymbolStream(SYMBOLS, url=f'ws://127.0.0.1:{port}')
+            stream.stop()
+            await asyncio.wait_for(stream.run(), 1)
+
+            # reset() re-arms a stopped stream
+            stream.reset()
+            runner = asyncio.ensure_future(stream.run())
+            await wait_for(lambda: len(server.subscriptions) == 1)
+            stream.stop()
+            await asyncio.wait_for(runner, 5)
+
+    asyncio.run(main())
+    assert len(server.subscriptions) == 1
@@ -0,0 +1,46 @@
+"""
+Streaming feature engine parity with TradingModelTrainer.prepare_features
+"""
+
+import numpy as np
+import pytest
+
+from model_development.streaming_features import StreamingFeatureEngine, compare_with_batch
+from model_development.train_trading_model import FEATURE_COLUMNS, synthetic_ohlcv
+
+ATOL = 1e-6
+
+
+def flat_stretches(seed: int):
+    df = synthetic_ohlcv(3000, seed=seed)
+    df.iloc[800:1100, :4] = 150.0      # flat OHLC: zero gains and losses for a whole RSI window
+    df.iloc[1500:1560, 3] = 151.25     # flat close only
+    return df
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_random_walk_parity(seed):
+    assert compare_with_batch(synthetic_ohlcv(3000, seed=seed), atol=ATOL) <= ATOL
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_flat_series_parity(seed):
+    assert compare_with_batch(flat_stretches(seed), atol=ATOL) <= ATOL
+
+
+def test_flat_series_rsi_in_range():
+    features = StreamingFeatureEngine().update_frame(flat_stretches(0))
+    rsi = features[:, FEATURE_COLUMNS.index('rsi')]
+    assert np.all((rsi >= 0) & (rsi <= 100))
+
+
+def test_checkpoint_resume_matches_uninterrupted_run(tmp_path):
+    df = flat_stretches(3)
+    first = StreamingFeatureEngine()
+    head = first.update_frame(df.iloc[:900])
+    first.save_checkpoint(str(tmp_path / 'engine.json'))
+
+    resumed = StreamingFeatureEngine.load_checkpoint(str(tmp_path / 'engine.json'))
+    tail = resumed.update_frame(df.iloc[900:])
+    full = StreamingFeatureEngine().update_frame(df)
+    np.testing.assert_allclose(np.vstack([head, tail]), full, atol=ATOL)
@@ -0,0 +1,30 @@
+"""
+Every quantization variant builds and runs for both model types
+"""
+
+import numpy as np
+import pytest
+
+from model_conversion.convert_to_tflite import ModelConverter
+from model_development.train_trading_model import TradingModelTrainer
+
+SEQUENCE_LENGTH = 12
+NUM_FEATURES = 17
+
+
+@pytest.mark.parametrize('model_type', ['lstm', 'cnn'])
+def test_all_variants_build_and_score(tmp_path, model_type):
+    rng = np.random.default_rng(0)
+    windows = rng.normal(size=(96, SEQUENCE_LENGTH, NUM_FEATURES)).astype(np.float32)
+    converter = ModelConverter(model_path=None)
+    converter.model = TradingModelTrainer(model_type=model_type).build_model((SEQUENCE_LENGTH, NUM_FEATURES))
+
+    variants = converter.build_variants(str(tmp_path), windows[:64], num_calibration_samples=32)
+    assert sorted(variants) == ['basic', 'dynamic', 'float16', 'int8']
+
+    results = {row['variant']: row for row in converter.benchmark_variants(variants, windows[64:], batch_size=8,
+                                                                            repeats=2)}
+    assert sorted(results) == sorted(variants)
+    assert results['basic']['max_prob_diff'] < 1e-4
+    assert results['float16']['max_prob_diff'] < 1e-2
+    assert results['int8']['max_prob_diff'] < 0.1
@@ -0,0 +1,62 @@
+"""
+TickRingBuffer wraparound: last(n) stays contiguous and ordered past capacity
+"""
+
+import numpy as np
+import pytest
+
+from data_collection.tick_buffer import TickRingBuffer
+from data_collection.tick_decoder import Tick
+
+CAPACITY = 8
+
+
+def fill(buffer: TickRingBuffer, start: int, stop: int):
+    for i in range(start, stop):
+        buffer.append(i, 100.0 + i, 10 * i)
+
+
+def assert_last(buffer: TickRingBuffer, total: int):
+    for n in range(1, min(total, CAPACITY) + 1):
+        views = buffer.last(n)
+        for name, view in views.items():
+            # One slice of the mirrored column: no copy, and read-only
+            assert np.shares_memory(view, buffer.columns[name])
+            assert view.flags.c_contiguous
+            assert not view.flags.writeable
+        np.testing.assert_array_equal(views['timestamp'], np.arange(total - n, total))
+        np.testing.assert_array_equal(views['price'], 100.0 + np.arange(total - n, total))
+
+
+@pytest.mark.parametrize('total', [CAPACITY - 3, CAPACITY, CAPACITY + 1, 2 * CAPACITY + 5, 5 * CAPACITY])
+def test_append_wraparound(total):
+    buffer = TickRingBuffer(CAPACITY)
+    fill(buffer, 0, total)
+
+    assert len(buffer) == min(total, CAPACITY)
+    assert buffer.total_appended == total
+    assert_last(buffer, total)
+    np.testing.assert_array_equal(buffer.last()['timestamp'], np.arange(max(0, total - CAPACITY), total))
+    assert buffer.latest()['timestamp'] == total - 1
+
+
+def test_batched_writes_wrap_like_appends():
+    buffer = TickRingBuffer(CAPACITY)
+    fill(buffer, 0, 5)
+    # An oversized batch keeps only its last CAPACITY ticks
+    buffer.extend([Tick('AAPL', i, 100.0 + i, 10 * i) for i in range(5, 5 + 2 * CAPACITY + 3)])
+    total = 5 + 2 * CAPACITY + 3
+    assert_last(buffer, total)
+
+    columns = {'timestamp': np.arange(total, total + 5), 'price': 100.0 + np.arange(total, total + 5),
+               'volume': 10 * np.arange(total, total + 5), 'change': np.zeros(5), 'change_percent': np.zeros(5)}
+    buffer.extend_columns(columns)
+    assert_last(buffer, total + 5)
+
+
+def test_snapshot_is_a_copy():
+    buffer = TickRingBuffer(CAPACITY)
+    fill(buffer, 0, CAPACITY + 2)
+    snapshot = buffer.snapshot(4)
+    fill(buffer, CAPACITY + 2, 3 * CAPACITY)
+    np.testing.assert_array_equal(snapshot['timestamp'], np.arange(CAPACITY - 2, CAPACITY + 2))
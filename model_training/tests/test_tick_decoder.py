@@ -0,0 +1,51 @@
+"""
+TickDecoder message framings and malformed input
+"""
+
+import json
+
+import pytest
+
+from data_collection.tick_decoder import TickDecoder
+
+NOW = 1_700_000_000_000_000_000
+
+
+@pytest.fixture
+def decoder():
+    return TickDecoder('AAPL', clock=lambda: NOW)
+
+
+def fields(tick):
+    return tick.symbol, tick.timestamp, tick.price, tick.volume, tick.change, tick.change_percent
+
+
+def test_single_object(decoder):
+    ticks = decoder.decode('{"price": "150.25", "volume": 300, "change": 0.5, "change_percent": 0.33}')
+    assert [fields(tick) for tick in ticks] == [('AAPL', NOW, 150.25, 300, 0.5, 0.33)]
+    assert decoder.errors == 0
+
+
+def test_array_of_ticks(decoder):
+    message = json.dumps([{'symbol': 'MSFT', 'price': 400, 'volume': 10}, {'price': 150.5, 'volume': 20}]).encode()
+    ticks = decoder.decode(message)
+    assert [fields(tick) for tick in ticks] == [('MSFT', NOW, 400.0, 10, 0.0, 0.0), ('AAPL', NOW, 150.5, 20, 0.0, 0.0)]
+
+
+def test_newline_delimited_frames(decoder):
+    message = '{"price": 1, "volume": 1}\n\n[{"price": 2, "volume": 2}, {"price": 3, "volume": 3}]\n{"price": 4}\n'
+    ticks = decoder.decode(message)
+    assert [tick.price for tick in ticks] == [1.0, 2.0, 3.0, 4.0]
+    assert {tick.timestamp for tick in ticks} == {NOW}
+    assert decoder.errors == 0
+
+
+def test_malformed_input_is_counted(decoder):
+    assert decoder.decode('{"price": 1') == []
+    assert decoder.decode(b'not json\n{"price": 2}') == []
+    assert decoder.errors == 2
+
+    # Bad items are skipped; the rest of the message still decodes
+    ticks = decoder.decode('[{"price": "abc"}, 7, {"price": 5, "volume": 1}, {"volume": [1]}]')
+    assert [tick.price for tick in ticks] == [5.0]
+    assert decoder.errors == 5
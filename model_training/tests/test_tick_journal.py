@@ -0,0 +1,69 @@
+"""
+TickJournal write-delay timer, live reads and collector replay
+"""
+
+import time
+
+from data_collection.market_data_collector import MarketDataCollector
+from data_collection.tick_decoder import Tick
+from data_collection.tick_journal import TickJournal, TickJournalReader
+
+
+def make_ticks(count: int, start: int = 1_700_000_000_000_000_000):
+    return [Tick('AAPL', start + i * 1_000_000, 100.0 + i, 10 + i) for i in range(count)]
+
+
+def wait_until(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_idle_feed_is_written_after_max_delay(tmp_path):
+    with TickJournal(str(tmp_path), batch_size=1024, max_delay=0.05) as journal:
+        for tick in make_ticks(3):
+            journal.append(tick)
+        assert journal.records_written == 0
+        # No further ticks arrive; the timer writes the batch
+        assert wait_until(lambda: journal.records_written == 3)
+        assert len(TickJournalReader(str(tmp_path))) == 3
+
+        journal.extend(make_ticks(2))
+        assert wait_until(lambda: journal.records_written == 5)
+
+
+def test_reader_picks_up_records_written_after_it_opened(tmp_path):
+    with TickJournal(str(tmp_path), batch_size=4, segment_records=6) as journal:
+        journal.extend(make_ticks(4))
+        journal.flush()
+        reader = TickJournalReader(str(tmp_path))
+        assert len(reader.read()) == 4
+
+        # Later batches, including a new segment and a new symbol, show up on the next read
+        journal.extend(make_ticks(5, start=1_700_000_000_100_000_000))
+        journal.append(Tick('MSFT', 1_700_000_000_200_000_000, 400.0, 1))
+        journal.flush()
+        records = reader.read()
+        assert len(records) == len(reader) == 10
+        assert reader.to_ticks(records[-1:])[0].symbol == 'MSFT'
+        assert len(reader.read(symbols=['AAPL'])) == 9
+
+
+def test_replay_is_not_journaled_again(tmp_path):
+    recorded = str(tmp_path / 'recorded')
+    with TickJournal(recorded) as journal:
+        journal.extend(make_ticks(50))
+
+    collector = MarketDataCollector('AAPL')
+    live = collector.record_ticks(str(tmp_path / 'live'), maxsize=100)
+    received = []
+    collector.add_callback(received.append, policy='block')
+
+    stats = collector.replay(recorded).run()
+    assert stats['replayed'] == 50
+    assert wait_until(lambda: len(received) == 50)
+    collector.dispatcher.close()
+    live.close()
+    assert live.records_written == 0
+    assert [tick.price for tick in received] == [tick.price for tick in make_ticks(50)]
@@ -0,0 +1,43 @@
+"""
+Walk-forward folds are chronological and training labels stay clear of the test range
+"""
+
+import numpy as np
+import pytest
+
+from model_development.walk_forward import fold_window_slices, walk_forward_folds
+
+
+def window_indices(window_slice: slice, num_windows: int) -> np.ndarray:
+    return np.arange(num_windows)[window_slice]
+
+
+def test_folds_are_chronological():
+    folds = walk_forward_folds(num_rows=1000, train_size=400, test_size=100)
+    assert len(folds) == 6
+    for previous, fold in zip(folds, folds[1:]):
+        assert fold['train_start'] > previous['train_start']
+        # Test ranges follow one another without overlapping
+        assert fold['train_end'] == previous['test_end']
+    for fold in folds:
+        assert fold['train_start'] < fold['train_end'] < fold['test_end'] <= 1000
+
+
+@pytest.mark.parametrize('sequence_length,horizon,validation_split', [(30, 5, 0.1), (60, 1, 0.2), (12, 24, 0.25)])
+def test_no_training_label_reaches_the_test_range(sequence_length, horizon, validation_split):
+    for fold in walk_forward_folds(num_rows=3000, train_size=800, test_size=200, step=150):
+        train_rows = fold['train_end'] - fold['train_start']
+        fold_rows = fold['test_end'] - fold['train_start']
+        num_windows = fold_rows - sequence_length
+        windows = fold_window_slices(train_rows, sequence_length, horizon, validation_split)
+
+        # Window i is labelled at fold row i + sequence_length, from closes up to horizon rows later
+        fit = window_indices(windows['fit'], num_windows) + sequence_length
+        validation = window_indices(windows['validation'], num_windows) + sequence_length
+        test = window_indices(windows['test'], num_windows) + sequence_length
+
+        assert len(fit) and len(validation) and len(test)
+        assert fit.max() + horizon < validation.min()
+        assert validation.max() + horizon < train_rows
+        assert test.min() == train_rows
+        assert test.max() == fold_rows - 1